@@ -1,11 +1,18 @@
+from dotenv import load_dotenv
+
+# Load .env before importing services: they read their settings at import time
+load_dotenv()
+
+import os
+import threading
+import time
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.routes import news
 from app.routes import admin
 from app.routes import checker
-from dotenv import load_dotenv
-
-load_dotenv()
+from app.utils.executors import run_io, inference_executor, io_executor
 
 app = FastAPI(
     title="Hoax Detection News App API",
@@ -28,6 +35,61 @@ app.include_router(admin.router, tags=["Admin"])       # /api/admin/*
 app.include_router(checker.router, tags=["Checker"])   # /api/checker/*
 
 
+# Readiness state, flipped by the startup warmup thread
+startup_state = {
+    "ready": False,
+    "status": "warming_up",
+    "started_at": time.time(),
+    "ready_at": None,
+    "model": None,
+    "error": None,
+}
+
+
+def _preload_and_warmup():
+    """Load the ML model and run warmup batches before reporting ready"""
+    from app.services.hoax_detector import hoax_detector
+
+    try:
+        use_ml_model = os.getenv("USE_ML_MODEL", "false").lower() == "true"
+        preload = os.getenv("PRELOAD_MODEL", "true").lower() == "true"
+
+        if use_ml_model and preload:
+            seq_lengths = [
+                int(n) for n in os.getenv("WARMUP_SEQ_LENGTHS", "16,128,512").split(",") if n.strip()
+            ]
+            startup_state["model"] = hoax_detector.warmup(seq_lengths=seq_lengths)
+
+        if use_ml_model:
+            # Follow retrains/rollbacks published by other processes
+            hoax_detector.start_model_watcher()
+    except Exception as e:
+        print(f"Warning: Model preload failed: {e}")
+        startup_state["error"] = str(e)
+        # predict() would fall back to the rule-based detector; only take
+        # traffic in that state when explicitly allowed
+        if os.getenv("READY_ON_PRELOAD_FAILURE", "false").lower() != "true":
+            startup_state["status"] = "failed"
+            return
+        startup_state["status"] = "degraded"
+    else:
+        startup_state["status"] = "ready"
+
+    startup_state["ready"] = True
+    startup_state["ready_at"] = time.time()
+
+
+@app.on_event("startup")
+async def startup_warmup():
+    from app.services.rule_based_detector import rule_based_detector
+
+    # Run in a thread so /health/live answers while the model is loading
+    threading.Thread(target=_preload_and_warmup, name="model-warmup", daemon=True).start()
+
+    # Pick up rule pack edits without a restart
+    rule_based_detector.start_rule_watcher()
+
+
 @app.get("/")
 async def root():
     return {
@@ -48,15 +110,46 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """Process is up and the event loop is responding"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Model is loaded and warmed up; keep the worker out of rotation until then"""
+    if not startup_state["ready"]:
+        content = {
+            "status": startup_state["status"],
+            "elapsed_seconds": round(time.time() - startup_state["started_at"], 1),
+        }
+        if startup_state["error"]:
+            content["error"] = startup_state["error"]
+        return JSONResponse(status_code=503, content=content)
+
+    return {
+        "status": startup_state["status"],
+        "startup_seconds": round(startup_state["ready_at"] - startup_state["started_at"], 1),
+        "model": startup_state["model"],
+        "error": startup_state["error"],
+    }
+
+
 @app.get("/api/stats")
 async def get_system_stats():
     """Get overall system statistics"""
     try:
         from app.services.news_service import news_service
         from app.services.training_service import training_service
+        from app.services.hoax_detector import hoax_detector
+        from app.services.rule_based_detector import rule_based_detector
+        from app.services.ingestion_pipeline import ingestion_pipeline
+        from app.services.page_cache import page_cache
+        from app.services.news_filter import news_filter
 
-        news_stats = news_service.get_training_stats()
-        training_status = training_service.get_training_queue_status()
+        news_stats = await run_io(news_service.get_training_stats)
+        training_status = await run_io(training_service.get_training_queue_status)
 
         return {
             "news": news_stats,
@@ -65,6 +158,16 @@ async def get_system_stats():
                 "trained": training_status.total_trained,
                 "threshold": training_status.threshold,
                 "ready_for_training": training_status.ready_for_training
+            },
+            "prediction_cache": hoax_detector.cache.get_stats(),
+            "cascade": hoax_detector.get_cascade_stats(),
+            "rule_pack": rule_based_detector.get_rules_info(),
+            "ingestion": ingestion_pipeline.get_stats(),
+            "page_cache": page_cache.get_stats(),
+            "news_filter": news_filter.get_stats(),
+            "executors": {
+                "inference": inference_executor.get_stats(),
+                "io": io_executor.get_stats()
             }
         }
     except Exception as e:
@@ -1,6 +1,7 @@
 from .news import (
     NewsItem,
     NewsResponse,
+    NewsSummary,
     NewsListResponse,
     HoaxPrediction,
     LabeledByEnum,
@@ -8,6 +9,8 @@ from .news import (
     AdminLabelResponse,
     UserCheckRequest,
     UserCheckResponse,
+    UserCheckSummary,
+    UserCheckBatchResponse,
     TrainingDataItem,
     TrainingQueueStatus,
     RetrainResponse,
@@ -16,6 +19,7 @@ from .news import (
 __all__ = [
     "NewsItem",
     "NewsResponse",
+    "NewsSummary",
     "NewsListResponse",
     "HoaxPrediction",
     "LabeledByEnum",
@@ -23,6 +27,8 @@ __all__ = [
     "AdminLabelResponse",
     "UserCheckRequest",
     "UserCheckResponse",
+    "UserCheckSummary",
+    "UserCheckBatchResponse",
     "TrainingDataItem",
     "TrainingQueueStatus",
     "RetrainResponse",
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, Literal
 from enum import Enum
@@ -19,6 +19,7 @@ class NewsItem(BaseModel):
     published_time: Optional[datetime] = None
     hoax_label: Optional[str] = None  # "hoax" or "non-hoax"
     confidence: Optional[float] = None
+    rule_pack_version: Optional[str] = None
     created_at: Optional[datetime] = Field(default_factory=datetime.now)
 
     # New fields for admin/user distinction
@@ -39,6 +40,7 @@ class NewsResponse(BaseModel):
     published_time: Optional[str] = None
     hoax_label: Optional[str] = None
     confidence: Optional[float] = None
+    rule_pack_version: Optional[str] = None
     created_at: str
 
     # New fields
@@ -50,14 +52,31 @@ class NewsResponse(BaseModel):
     labeled_at: Optional[str] = None
 
 
+class NewsSummary(BaseModel):
+    """List view of a news document: preview instead of the full content"""
+    id: str
+    title: str = ""
+    source: str = ""
+    preview: Optional[str] = None  # First characters of content, stored at write time
+    hoax_label: Optional[str] = None
+    confidence: Optional[float] = None
+    created_at: Optional[str] = None
+    labeled_by: Optional[str] = "system"
+    manual_label: Optional[str] = None
+    trained: Optional[bool] = False
+    labeled_at: Optional[str] = None
+
+
 class NewsListResponse(BaseModel):
     total: int
     news: list[NewsResponse]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
 
 
 class HoaxPrediction(BaseModel):
     label: str
     confidence: float
+    rule_pack_version: Optional[str] = None  # Set when the rule-based detector decided
 
 
 # ==========================================
@@ -99,6 +118,24 @@ class UserCheckResponse(BaseModel):
     warning: Optional[str] = None
 
 
+class UserCheckSummary(BaseModel):
+    """List view of a stored user check (no full content)"""
+    id: str
+    title: Optional[str] = None
+    preview: Optional[str] = None  # First characters of content, stored at write time
+    prediction: Optional[str] = None
+    confidence: Optional[float] = None
+    check_count: int = 1
+    created_at: Optional[str] = None
+    last_checked_at: Optional[str] = None
+
+
+class UserCheckBatchResponse(BaseModel):
+    """Response for batch user hoax check (results in input order)"""
+    total: int
+    results: list[UserCheckResponse]
+
+
 # ==========================================
 # Training Queue Models
 # ==========================================
@@ -125,8 +162,12 @@ class TrainingQueueStatus(BaseModel):
 
 class RetrainResponse(BaseModel):
     """Response after retraining"""
+    # model_version is part of the API; allow the "model_" prefix
+    model_config = ConfigDict(protected_namespaces=())
+
     success: bool
     message: str
     samples_used: int
     accuracy: Optional[float] = None
     f1_score: Optional[float] = None
+    model_version: Optional[str] = None
@@ -6,6 +6,9 @@ Features:
 - View training queue status
 - Manually trigger retraining
 - View training history
+- List, reload, and roll back model versions
+- Inspect and hot-reload the rule pack
+- Recount the stats counters
 """
 
 from fastapi import APIRouter, HTTPException
@@ -20,7 +23,14 @@ from app.models import (
     NewsResponse,
 )
 from app.utils.firebase_config import get_db
+from app.utils.executors import run_io
+from app.utils.pagination import InvalidCursorError, page_query, split_page
+from app.services.news_service import news_service
 from app.services.training_service import training_service
+from app.services.model_registry import model_registry
+from app.services.hoax_detector import hoax_detector
+from app.services.rule_based_detector import rule_based_detector
+from app.services.stats_counters import stats_counters
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
@@ -32,28 +42,9 @@ async def label_news(request: AdminLabelRequest):
     This data WILL be used for model training.
     """
     try:
-        db = get_db()
-        news_ref = db.collection("news").document(request.news_id)
-        news_doc = news_ref.get()
-
-        if not news_doc.exists:
+        if not await run_io(_apply_admin_label, request):
             raise HTTPException(status_code=404, detail="News not found")
 
-        # Update news with admin label
-        update_data = {
-            "manual_label": request.label,
-            "labeled_by": "admin",
-            "is_verified": True,
-            "can_use_for_training": True,  # Admin data CAN be used for training
-            "trained": False,  # Not yet used in training
-            "labeled_at": datetime.now().isoformat(),
-        }
-
-        if request.notes:
-            update_data["admin_notes"] = request.notes
-
-        news_ref.update(update_data)
-
         return AdminLabelResponse(
             success=True,
             message=f"News labeled as '{request.label}' by admin. Will be used for training.",
@@ -68,6 +59,35 @@ async def label_news(request: AdminLabelRequest):
         raise HTTPException(status_code=500, detail=f"Error labeling news: {str(e)}")
 
 
+def _admin_label_update(request: AdminLabelRequest, labeled_at: str) -> dict:
+    update_data = {
+        "manual_label": request.label,
+        "labeled_by": "admin",
+        "is_verified": True,
+        "can_use_for_training": True,  # Admin data CAN be used for training
+        "trained": False,  # Not yet used in training
+        "labeled_at": labeled_at,
+    }
+
+    if request.notes:
+        update_data["admin_notes"] = request.notes
+
+    return update_data
+
+
+def _apply_admin_label(request: AdminLabelRequest) -> bool:
+    """Apply admin label to a news document. Returns False if it does not exist."""
+    # Update news with admin label (stats counters are updated in the same write)
+    update_data = _admin_label_update(request, datetime.now().isoformat())
+    result = news_service.update_news_many({request.news_id: update_data})
+
+    if result.failed.get(request.news_id) == "not found":
+        return False
+    if result.failed:
+        raise Exception(result.failed[request.news_id])
+    return True
+
+
 @router.post("/label-bulk", response_model=dict)
 async def label_news_bulk(requests: List[AdminLabelRequest]):
     """
@@ -75,49 +95,45 @@ async def label_news_bulk(requests: List[AdminLabelRequest]):
     All labeled data WILL be used for model training.
     """
     try:
-        db = get_db()
-        results = {"success": 0, "failed": 0, "errors": []}
-
-        for req in requests:
-            try:
-                news_ref = db.collection("news").document(req.news_id)
-                news_doc = news_ref.get()
-
-                if not news_doc.exists:
-                    results["failed"] += 1
-                    results["errors"].append(f"News {req.news_id} not found")
-                    continue
-
-                update_data = {
-                    "manual_label": req.label,
-                    "labeled_by": "admin",
-                    "is_verified": True,
-                    "can_use_for_training": True,
-                    "trained": False,
-                    "labeled_at": datetime.now().isoformat(),
-                }
-
-                if req.notes:
-                    update_data["admin_notes"] = req.notes
-
-                news_ref.update(update_data)
-                results["success"] += 1
-
-            except Exception as e:
-                results["failed"] += 1
-                results["errors"].append(f"Error labeling {req.news_id}: {str(e)}")
-
-        return {
-            "total": len(requests),
-            "success": results["success"],
-            "failed": results["failed"],
-            "errors": results["errors"][:10]  # Limit errors shown
-        }
+        return await run_io(_label_news_bulk_sync, requests)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in bulk labeling: {str(e)}")
 
 
+def _label_news_bulk_sync(requests: List[AdminLabelRequest]) -> dict:
+    results = {"success": 0, "failed": 0, "errors": []}
+
+    # One read and one write per batch of news instead of a get() and update() per item.
+    # A news_id listed twice is written once, with its last label (as applying them in order would)
+    labeled_at = datetime.now().isoformat()
+    updates = {req.news_id: _admin_label_update(req, labeled_at) for req in requests}
+    duplicates = len(requests) - len(updates)
+    written = news_service.update_news_many(updates)
+
+    for news_id in updates:
+        error = written.failed.get(news_id)
+        if error is None:
+            results["success"] += 1
+            continue
+
+        results["failed"] += 1
+        if error == "not found":
+            results["errors"].append(f"News {news_id} not found")
+        else:
+            results["errors"].append(f"Error labeling {news_id}: {error}")
+
+    return {
+        "total": len(updates),
+        "success": results["success"],
+        "failed": results["failed"],
+        "duplicates": duplicates,
+        "errors": results["errors"][:10]  # Limit errors shown
+    }
+
+
 @router.get("/training-queue", response_model=TrainingQueueStatus)
 async def get_training_queue_status():
     """
@@ -125,23 +141,29 @@ async def get_training_queue_status():
     Shows how many admin-labeled items are pending for training.
     """
     try:
-        return training_service.get_training_queue_status()
+        return await run_io(training_service.get_training_queue_status)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting queue status: {str(e)}")
 
 
 @router.get("/pending-training", response_model=dict)
-async def get_pending_training_data():
+async def get_pending_training_data(limit: int = 100, cursor: Optional[str] = None):
     """
     Get list of news articles pending for training.
     These are admin-labeled but not yet used in model training.
+
+    Args:
+        limit: Page size
+        cursor: next_cursor from the previous page
     """
     try:
-        pending = training_service.get_pending_training_data()
-        return {
-            "total": len(pending),
-            "items": pending[:100]  # Limit to 100 items
-        }
+        return await run_io(training_service.get_pending_training_page, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting pending data: {str(e)}")
 
@@ -155,7 +177,7 @@ async def trigger_retraining(force: bool = False):
         force: If True, retrain even if threshold not met
     """
     try:
-        status = training_service.get_training_queue_status()
+        status = await run_io(training_service.get_training_queue_status)
 
         if not force and not status.ready_for_training:
             return RetrainResponse(
@@ -171,14 +193,16 @@ async def trigger_retraining(force: bool = False):
                 samples_used=0
             )
 
-        # Trigger retraining
-        result = training_service.check_and_trigger_retrain()
+        # Trigger retraining (long-running, kept off the event loop)
+        result = await run_io(training_service.check_and_trigger_retrain)
 
         # Save to history
-        training_service.save_training_history(result)
+        await run_io(training_service.save_training_history, result)
 
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error triggering retrain: {str(e)}")
 
@@ -189,60 +213,168 @@ async def get_training_history(limit: int = 10):
     Get history of model training runs.
     """
     try:
-        history = training_service.get_training_history(limit)
+        history = await run_io(training_service.get_training_history, limit)
         return {
             "total": len(history),
             "history": history
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting history: {str(e)}")
 
 
+@router.get("/models", response_model=dict)
+async def get_model_versions():
+    """
+    List model versions in the registry and the version currently served.
+    """
+    try:
+        versions = await run_io(model_registry.describe_versions)
+        return {
+            "current": model_registry.current_version(),
+            "loaded": hoax_detector.model_version,
+            "loaded_variant": hoax_detector.loaded_variant,
+            "swap_count": hoax_detector.swap_count,
+            "last_swap_at": hoax_detector.last_swap_at,
+            "versions": versions
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error listing models: {str(e)}")
+
+
+@router.post("/models/rollback", response_model=dict)
+async def rollback_model(version: Optional[str] = None):
+    """
+    Point the registry back at an earlier model version and hot swap to it.
+
+    Args:
+        version: Version to serve (default: the one before current)
+    """
+    try:
+        target = await run_io(model_registry.rollback, version)
+        return await run_io(hoax_detector.reload_model, target)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error rolling back model: {str(e)}")
+
+
+@router.post("/models/reload", response_model=dict)
+async def reload_model():
+    """
+    Hot swap to the registry's current version without restarting.
+    """
+    try:
+        return await run_io(hoax_detector.reload_model)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reloading model: {str(e)}")
+
+
+@router.get("/rules", response_model=dict)
+async def get_rule_pack():
+    """
+    Show the active rule pack (version, sizes, weights, threshold).
+    """
+    return rule_based_detector.get_rules_info()
+
+
+@router.post("/rules/reload", response_model=dict)
+async def reload_rule_pack(path: Optional[str] = None):
+    """
+    Validate, compile and atomically activate the rule pack file.
+    The current rules stay active if the file is invalid.
+
+    Args:
+        path: Rule pack file (default: RULE_PACK_PATH)
+    """
+    try:
+        return await run_io(rule_based_detector.reload_rules, path)
+
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid rule pack: {str(e)}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reloading rule pack: {str(e)}")
+
+
+@router.post("/counters/recount", response_model=dict)
+async def recount_stats_counters():
+    """
+    Recompute the stats counters from the database with aggregation queries.
+    Only needed if documents were changed outside the API.
+    """
+    try:
+        return {"success": True, "counters": await run_io(stats_counters.recount)}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error recounting counters: {str(e)}")
+
+
 @router.get("/unlabeled", response_model=dict)
-async def get_unlabeled_news(limit: int = 50):
+async def get_unlabeled_news(limit: int = 50, cursor: Optional[str] = None):
     """
     Get news articles that haven't been labeled by admin yet.
     Useful for admin to find articles to label.
+
+    Args:
+        limit: Page size
+        cursor: next_cursor from the previous page
     """
     try:
-        db = get_db()
-
-        # Get news where labeled_by is "system" (auto-labeled) or not set
-        query = (
-            db.collection("news")
-            .where("labeled_by", "==", "system")
-            .order_by("created_at", direction="DESCENDING")
-            .limit(limit)
-        )
-
-        docs = list(query.stream())
-
-        news_list = []
-        for doc in docs:
-            data = doc.to_dict()
-            news_list.append({
-                "id": doc.id,
-                "title": data.get("title", ""),
-                "content": data.get("content", "")[:500],  # Preview only
-                "source": data.get("source", ""),
-                "hoax_label": data.get("hoax_label"),  # System's prediction
-                "confidence": data.get("confidence"),
-                "created_at": data.get("created_at"),
-            })
-
-        return {
-            "total": len(news_list),
-            "news": news_list
-        }
+        return await run_io(_load_unlabeled_news, limit, cursor)
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting unlabeled news: {str(e)}")
 
 
+def _load_unlabeled_news(limit: int, cursor: Optional[str] = None) -> dict:
+    db = get_db()
+
+    # Get news where labeled_by is "system" (auto-labeled) or not set
+    query = db.collection("news").where("labeled_by", "==", "system")
+    query, page_size = page_query(query, "created_at", limit, cursor)
+    summaries = news_service.list_news_summaries(query)
+    next_cursor = _next_cursor(summaries, page_size, "created_at")
+
+    news_list = []
+    for summary in summaries[:page_size]:
+        news_list.append({
+            "id": summary.id,
+            "title": summary.title,
+            "content": summary.preview,  # Preview only
+            "source": summary.source,
+            "hoax_label": summary.hoax_label,  # System's prediction
+            "confidence": summary.confidence,
+            "created_at": summary.created_at,
+        })
+
+    return {
+        "total": len(news_list),
+        "news": news_list,
+        "next_cursor": next_cursor
+    }
+
+
 @router.get("/labeled", response_model=dict)
 async def get_admin_labeled_news(
     limit: int = 50,
-    trained: Optional[bool] = None
+    trained: Optional[bool] = None,
+    cursor: Optional[str] = None
 ):
     """
     Get news articles that have been labeled by admin.
@@ -250,36 +382,50 @@ async def get_admin_labeled_news(
     Args:
         limit: Maximum number of items to return
         trained: Filter by trained status (True/False/None for all)
+        cursor: next_cursor from the previous page
     """
     try:
-        db = get_db()
+        return await run_io(_load_admin_labeled_news, limit, trained, cursor)
+
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting labeled news: {str(e)}")
 
-        query = db.collection("news").where("labeled_by", "==", "admin")
 
-        if trained is not None:
-            query = query.where("trained", "==", trained)
+def _load_admin_labeled_news(limit: int, trained: Optional[bool], cursor: Optional[str] = None) -> dict:
+    db = get_db()
 
-        query = query.order_by("labeled_at", direction="DESCENDING").limit(limit)
+    query = db.collection("news").where("labeled_by", "==", "admin")
 
-        docs = list(query.stream())
+    if trained is not None:
+        query = query.where("trained", "==", trained)
 
-        news_list = []
-        for doc in docs:
-            data = doc.to_dict()
-            news_list.append({
-                "id": doc.id,
-                "title": data.get("title", ""),
-                "content": data.get("content", "")[:500],
-                "source": data.get("source", ""),
-                "manual_label": data.get("manual_label"),
-                "labeled_at": data.get("labeled_at"),
-                "trained": data.get("trained", False),
-            })
+    query, page_size = page_query(query, "labeled_at", limit, cursor)
+    summaries = news_service.list_news_summaries(query)
+    next_cursor = _next_cursor(summaries, page_size, "labeled_at")
 
-        return {
-            "total": len(news_list),
-            "news": news_list
-        }
+    news_list = []
+    for summary in summaries[:page_size]:
+        news_list.append({
+            "id": summary.id,
+            "title": summary.title,
+            "content": summary.preview,
+            "source": summary.source,
+            "manual_label": summary.manual_label,
+            "labeled_at": summary.labeled_at,
+            "trained": summary.trained,
+        })
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting labeled news: {str(e)}")
+    return {
+        "total": len(news_list),
+        "news": news_list,
+        "next_cursor": next_cursor
+    }
+
+
+def _next_cursor(summaries: list, page_size: int, order_field: str) -> Optional[str]:
+    rows = [summary.model_dump() for summary in summaries]
+    return split_page(rows, page_size, order_field)[1]
@@ -6,20 +6,80 @@ This is a read-only prediction service for end users.
 """
 
 from fastapi import APIRouter, HTTPException
+from google.cloud.firestore import Increment
 from datetime import datetime
 import hashlib
-from typing import Optional
+import os
+import uuid
+from typing import List, Optional
 
 from app.models import (
     UserCheckRequest,
     UserCheckResponse,
+    UserCheckBatchResponse,
+    UserCheckSummary,
     NewsItem,
 )
 from app.services.hoax_detector import hoax_detector
+from app.services.stats_counters import USER_CHECK_COUNTED_FIELDS, stats_counters
+from app.utils.bulk_writer import BulkWriter
 from app.utils.firebase_config import get_db
+from app.utils.pagination import InvalidCursorError, page_query, split_page
+from app.utils.projection import ensure_previews, stream_projected, summary_fields
+from app.utils.executors import run_inference, run_io
 
 router = APIRouter(prefix="/api/checker", tags=["User Checker"])
 
+# Maximum number of items accepted by /check-batch
+CHECK_BATCH_MAX_ITEMS = int(os.getenv("CHECK_BATCH_MAX_ITEMS", "100"))
+
+# Length of the preview stored with each user check (shown by /recent)
+CHECK_PREVIEW_CHARS = 200
+
+# Read-then-write rounds for saving user checks; a round is repeated for the
+# checks that lost a race (created or updated concurrently) in the previous one
+USER_CHECK_SAVE_ATTEMPTS = 3
+
+
+def _build_check_text(request: UserCheckRequest) -> str:
+    """Combine title and content for prediction"""
+    text_to_check = ""
+    if request.title:
+        text_to_check = f"{request.title} "
+    text_to_check += request.content
+    return text_to_check
+
+
+def _build_check_response(prediction) -> UserCheckResponse:
+    """Prepare user-facing message and warning for a prediction"""
+    if prediction.label == "hoax":
+        if prediction.confidence > 0.8:
+            message = "Berita ini SANGAT MUNGKIN adalah HOAX. Harap verifikasi dari sumber terpercaya."
+        elif prediction.confidence > 0.6:
+            message = "Berita ini KEMUNGKINAN adalah HOAX. Sebaiknya cek fakta lebih lanjut."
+        else:
+            message = "Berita ini memiliki indikasi HOAX. Tetap waspada."
+    else:
+        if prediction.confidence > 0.8:
+            message = "Berita ini KEMUNGKINAN BESAR adalah FAKTA."
+        elif prediction.confidence > 0.6:
+            message = "Berita ini MUNGKIN adalah FAKTA, namun tetap verifikasi."
+        else:
+            message = "Berita ini terlihat valid, tapi sebaiknya tetap cross-check."
+
+    # Add warning
+    warning = (
+        "Hasil ini adalah prediksi AI dan bukan jaminan kebenaran. "
+        "Selalu verifikasi informasi dari sumber resmi dan terpercaya."
+    )
+
+    return UserCheckResponse(
+        prediction=prediction.label,
+        confidence=prediction.confidence,
+        message=message,
+        warning=warning
+    )
+
 
 @router.post("/check", response_model=UserCheckResponse)
 async def check_news_hoax(request: UserCheckRequest):
@@ -42,46 +102,15 @@ async def check_news_hoax(request: UserCheckRequest):
                 detail="Content must be at least 50 characters long"
             )
 
-        # Combine title and content for prediction
-        text_to_check = ""
-        if request.title:
-            text_to_check = f"{request.title} "
-        text_to_check += request.content
-
-        # Get prediction from hoax detector
-        prediction = hoax_detector.predict(text_to_check, source="user_check")
-
-        # Prepare response message
-        if prediction.label == "hoax":
-            if prediction.confidence > 0.8:
-                message = "Berita ini SANGAT MUNGKIN adalah HOAX. Harap verifikasi dari sumber terpercaya."
-            elif prediction.confidence > 0.6:
-                message = "Berita ini KEMUNGKINAN adalah HOAX. Sebaiknya cek fakta lebih lanjut."
-            else:
-                message = "Berita ini memiliki indikasi HOAX. Tetap waspada."
-        else:
-            if prediction.confidence > 0.8:
-                message = "Berita ini KEMUNGKINAN BESAR adalah FAKTA."
-            elif prediction.confidence > 0.6:
-                message = "Berita ini MUNGKIN adalah FAKTA, namun tetap verifikasi."
-            else:
-                message = "Berita ini terlihat valid, tapi sebaiknya tetap cross-check."
+        text_to_check = _build_check_text(request)
 
-        # Add warning
-        warning = (
-            "Hasil ini adalah prediksi AI dan bukan jaminan kebenaran. "
-            "Selalu verifikasi informasi dari sumber resmi dan terpercaya."
-        )
+        # Get prediction from hoax detector (off the event loop)
+        prediction = await run_inference(hoax_detector.predict, text_to_check, source="user_check")
 
         # Optionally save to database for analytics (but NOT for training)
         await _save_user_check(request, prediction)
 
-        return UserCheckResponse(
-            prediction=prediction.label,
-            confidence=prediction.confidence,
-            message=message,
-            warning=warning
-        )
+        return _build_check_response(prediction)
 
     except HTTPException:
         raise
@@ -89,6 +118,54 @@ async def check_news_hoax(request: UserCheckRequest):
         raise HTTPException(status_code=500, detail=f"Error checking news: {str(e)}")
 
 
+@router.post("/check-batch", response_model=UserCheckBatchResponse)
+async def check_news_hoax_batch(requests: List[UserCheckRequest]):
+    """
+    Check many news articles for hoax in a single request.
+
+    Texts are scored together in length-sorted mini-batches.
+    Results are returned in the same order as the input.
+    The results are NOT used for model training.
+
+    Args:
+        requests: List of UserCheckRequest (max CHECK_BATCH_MAX_ITEMS)
+
+    Returns:
+        UserCheckBatchResponse with one result per input item
+    """
+    try:
+        if not requests:
+            raise HTTPException(status_code=400, detail="At least one item is required")
+
+        if len(requests) > CHECK_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many items: maximum is {CHECK_BATCH_MAX_ITEMS}, got {len(requests)}"
+            )
+
+        for index, request in enumerate(requests):
+            if not request.content or len(request.content.strip()) < 50:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Item {index}: content must be at least 50 characters long"
+                )
+
+        texts = [_build_check_text(request) for request in requests]
+        predictions = await run_inference(
+            hoax_detector.predict_batch, texts, sources=["user_check"] * len(texts)
+        )
+
+        await _save_user_checks(list(zip(requests, predictions)))
+
+        results = [_build_check_response(prediction) for prediction in predictions]
+        return UserCheckBatchResponse(total=len(results), results=results)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error checking news batch: {str(e)}")
+
+
 @router.post("/check-url", response_model=UserCheckResponse)
 async def check_news_by_url(url: str):
     """
@@ -104,7 +181,7 @@ async def check_news_by_url(url: str):
             raise HTTPException(status_code=400, detail="Invalid URL format")
 
         # Extract content from URL
-        content = rss_fetcher.extract_article_content(url)
+        content = await run_io(rss_fetcher.extract_article_content, url)
 
         if not content or len(content) < 50:
             raise HTTPException(
@@ -113,7 +190,7 @@ async def check_news_by_url(url: str):
             )
 
         # Get prediction
-        prediction = hoax_detector.predict(content, source=url)
+        prediction = await run_inference(hoax_detector.predict, content, source=url)
 
         # Prepare response
         if prediction.label == "hoax":
@@ -144,39 +221,95 @@ async def _save_user_check(request: UserCheckRequest, prediction):
     Save user check to database for analytics.
     This data is NEVER used for training (can_use_for_training=False).
     """
+    await _save_user_checks([(request, prediction)])
+
+
+async def _save_user_checks(checks: list):
+    """Save (request, prediction) pairs in one I/O task; never fails the request"""
     try:
-        db = get_db()
+        await run_io(_save_user_checks_sync, checks)
+    except Exception as e:
+        # Don't fail the main request if saving fails
+        print(f"Warning: Could not save user checks: {e}")
 
-        # Generate ID from content hash
-        content_hash = hashlib.md5(request.content.encode()).hexdigest()
-        doc_id = f"user_check_{content_hash[:16]}"
-
-        # Check if already exists
-        existing = db.collection("user_checks").document(doc_id).get()
-        if existing.exists:
-            # Increment check count
-            db.collection("user_checks").document(doc_id).update({
-                "check_count": existing.to_dict().get("check_count", 0) + 1,
-                "last_checked_at": datetime.now().isoformat()
-            })
-        else:
-            # Create new record
-            db.collection("user_checks").document(doc_id).set({
-                "title": request.title,
-                "content": request.content[:2000],  # Limit stored content
-                "url": request.url,
-                "prediction": prediction.label,
-                "confidence": prediction.confidence,
-                "labeled_by": "user",  # Mark as user-generated
-                "can_use_for_training": False,  # NEVER use for training
-                "check_count": 1,
-                "created_at": datetime.now().isoformat(),
-                "last_checked_at": datetime.now().isoformat(),
-            })
+
+def _save_user_checks_sync(checks: list):
+    try:
+        db = get_db()
+        writer = BulkWriter(db)
+        now = datetime.now().isoformat()
+        # Written with every create/update of this call, so a retried round can
+        # tell that an earlier (reported failed) write did land and not count twice
+        save_id = uuid.uuid4().hex
+
+        # Generate ID from content hash; the same text checked twice is one record
+        grouped = {}
+        for request, prediction in checks:
+            content_hash = hashlib.md5(request.content.encode()).hexdigest()
+            doc_id = f"user_check_{content_hash[:16]}"
+            if doc_id in grouped:
+                grouped[doc_id][2] += 1
+            else:
+                grouped[doc_id] = [request, prediction, 1]
+
+        pending = list(grouped)
+        failed = {}
+        for _ in range(USER_CHECK_SAVE_ATTEMPTS):
+            # Check which already exist, in one multi-get
+            refs = [db.collection("user_checks").document(doc_id) for doc_id in pending]
+            for doc in db.get_all(refs, field_paths=USER_CHECK_COUNTED_FIELDS + ["save_id"]):
+                request, prediction, count = grouped[doc.id]
+                if doc.exists:
+                    before = doc.to_dict()
+                    if before.get("save_id") == save_id:
+                        # Already written by this call
+                        continue
+                    # Increment check count, only if nobody wrote since the read
+                    after = {**before, "check_count": before.get("check_count", 0) + count}
+                    writer.update("user_checks", doc.id, {
+                        "check_count": Increment(count),
+                        "last_checked_at": now,
+                        "save_id": save_id,
+                    }, increments=stats_counters.user_check_delta(before, after),
+                        last_update_time=doc.update_time)
+                else:
+                    # Create new record
+                    record = {
+                        "title": request.title,
+                        "content": request.content[:2000],  # Limit stored content
+                        "preview": request.content[:CHECK_PREVIEW_CHARS],  # For /recent
+                        "url": request.url,
+                        "prediction": prediction.label,
+                        "confidence": prediction.confidence,
+                        "rule_pack_version": prediction.rule_pack_version,
+                        "labeled_by": "user",  # Mark as user-generated
+                        "can_use_for_training": False,  # NEVER use for training
+                        "check_count": count,
+                        "created_at": now,
+                        "last_checked_at": now,
+                        "save_id": save_id,
+                    }
+                    writer.create(
+                        "user_checks", doc.id, record,
+                        increments=stats_counters.user_check_delta(None, record),
+                    )
+
+            result = writer.commit()
+            # Created concurrently (existing) or changed since the read (failed):
+            # read again and go through the update path
+            failed = result.failed
+            pending = result.existing + list(result.failed)
+            if not pending:
+                break
+
+        for doc_id, error in failed.items():
+            print(f"Warning: Could not save user check {doc_id}: {error}")
+        for doc_id in set(pending) - set(failed):
+            print(f"Warning: Could not save user check {doc_id}: created concurrently")
 
     except Exception as e:
         # Don't fail the main request if saving fails
-        print(f"Warning: Could not save user check: {e}")
+        print(f"Warning: Could not save user checks: {e}")
 
 
 @router.get("/stats", response_model=dict)
@@ -185,70 +318,80 @@ async def get_checker_stats():
     Get statistics of user hoax checks.
     """
     try:
-        db = get_db()
-
-        # Get all user checks
-        docs = list(db.collection("user_checks").stream())
+        return await run_io(_compute_checker_stats)
 
-        total_checks = 0
-        hoax_predictions = 0
-        non_hoax_predictions = 0
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting stats: {str(e)}")
 
-        for doc in docs:
-            data = doc.to_dict()
-            count = data.get("check_count", 1)
-            total_checks += count
 
-            if data.get("prediction") == "hoax":
-                hoax_predictions += count
-            else:
-                non_hoax_predictions += count
+def _compute_checker_stats() -> dict:
+    # Maintained on every save; reading them does not scan user_checks
+    counts = stats_counters.get_user_check_counts()
 
-        return {
-            "total_unique_articles": len(docs),
-            "total_checks": total_checks,
-            "hoax_predictions": hoax_predictions,
-            "non_hoax_predictions": non_hoax_predictions,
-            "hoax_ratio": hoax_predictions / total_checks if total_checks > 0 else 0
-        }
+    total_checks = counts["user_checks_total"]
+    hoax_predictions = counts["user_checks_hoax"]
+    non_hoax_predictions = total_checks - hoax_predictions
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting stats: {str(e)}")
+    return {
+        "total_unique_articles": counts["user_checks_unique"],
+        "total_checks": total_checks,
+        "hoax_predictions": hoax_predictions,
+        "non_hoax_predictions": non_hoax_predictions,
+        "hoax_ratio": hoax_predictions / total_checks if total_checks > 0 else 0
+    }
 
 
 @router.get("/recent", response_model=dict)
-async def get_recent_checks(limit: int = 20):
+async def get_recent_checks(limit: int = 20, cursor: Optional[str] = None):
     """
     Get recent user hoax checks (for display purposes).
     Personal data is anonymized.
-    """
-    try:
-        db = get_db()
 
-        query = (
-            db.collection("user_checks")
-            .order_by("last_checked_at", direction="DESCENDING")
-            .limit(limit)
-        )
+    Newest first by first check (created_at): last_checked_at changes on
+    every re-check, so paging on it would skip or repeat documents that are
+    checked again while a client pages through.
 
-        docs = list(query.stream())
-
-        checks = []
-        for doc in docs:
-            data = doc.to_dict()
-            checks.append({
-                "title": data.get("title", "")[:100] if data.get("title") else None,
-                "content_preview": data.get("content", "")[:200],
-                "prediction": data.get("prediction"),
-                "confidence": data.get("confidence"),
-                "check_count": data.get("check_count", 1),
-                "last_checked_at": data.get("last_checked_at"),
-            })
-
-        return {
-            "total": len(checks),
-            "checks": checks
-        }
+    Args:
+        limit: Page size
+        cursor: next_cursor from the previous page
+    """
+    try:
+        return await run_io(_load_recent_checks, limit, cursor)
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting recent checks: {str(e)}")
+
+
+def _load_recent_checks(limit: int, cursor: Optional[str] = None) -> dict:
+    db = get_db()
+
+    query, page_size = page_query(db.collection("user_checks"), "created_at", limit, cursor)
+
+    # Only the summary fields are read; the stored content never leaves the database
+    rows = stream_projected(query, summary_fields(UserCheckSummary))
+    rows, next_cursor = split_page(rows, page_size, "created_at")
+    rows = ensure_previews(db, "user_checks", rows, CHECK_PREVIEW_CHARS)
+
+    checks = []
+    for summary in (UserCheckSummary(**row) for row in rows):
+        checks.append({
+            "title": summary.title[:100] if summary.title else None,
+            "content_preview": summary.preview,
+            "prediction": summary.prediction,
+            "confidence": summary.confidence,
+            "check_count": summary.check_count,
+            "created_at": summary.created_at,
+            "last_checked_at": summary.last_checked_at,
+        })
+
+    return {
+        "total": len(checks),
+        "checks": checks,
+        "next_cursor": next_cursor
+    }
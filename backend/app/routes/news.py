@@ -1,22 +1,28 @@
 from fastapi import APIRouter, HTTPException
 from app.models import NewsResponse, NewsListResponse
 from app.services.news_service import news_service
+from app.utils.executors import run_io
+from app.utils.pagination import InvalidCursorError
 from typing import Optional
 
 router = APIRouter()
 
 @router.get("/", response_model=NewsListResponse)
-async def get_all_news(limit: int = 50):
+async def get_all_news(limit: int = 50, cursor: Optional[str] = None):
     try:
-        news_list = news_service.get_all_news(limit=limit)
-        return NewsListResponse(total=len(news_list), news=news_list)
+        news_list, next_cursor = await run_io(news_service.get_news_page, limit=limit, cursor=cursor)
+        return NewsListResponse(total=len(news_list), news=news_list, next_cursor=next_cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching news: {str(e)}")
 
 @router.get("/{news_id}", response_model=NewsResponse)
 async def get_news_by_id(news_id: str):
     try:
-        news = news_service.get_news_by_id(news_id)
+        news = await run_io(news_service.get_news_by_id, news_id)
         if not news:
             raise HTTPException(status_code=404, detail="News not found")
         return news
@@ -28,7 +34,9 @@ async def get_news_by_id(news_id: str):
 @router.post("/fetch-rss")
 async def fetch_rss():
     try:
-        result = news_service.fetch_and_process_rss()
+        result = await run_io(news_service.fetch_and_process_rss)
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching RSS: {str(e)}")
@@ -1,13 +1,4 @@
-from .hoax_detector import hoax_detector
-from .news_service import news_service
-from .rss_fetcher import rss_fetcher
-from .rule_based_detector import rule_based_detector
-from .training_service import training_service
-
-__all__ = [
-    "hoax_detector",
-    "news_service",
-    "rss_fetcher",
-    "rule_based_detector",
-    "training_service",
-]
+# Import services from their modules (app.services.news_service, ...).
+# This file runs whenever any service module is imported, so it must not
+# create the service singletons: the standalone scripts (dataset_collector,
+# auto_labeling_pipeline) use the extractor and fetcher without Firebase.
@@ -0,0 +1,448 @@
+"""
+Article Extractor - Fast article text extraction with lxml
+
+Parses the page once with lxml.html and looks the content container up with
+precompiled XPath expressions, in this order:
+
+1. the built-in profile of the site (detik, kompas, antaranews, tempo, ...)
+2. for sites without a profile, the generic selector that worked last time
+   (learned; only remembered when it yielded at least MIN_LEARNED_LENGTH
+   characters, so a short related-links box is never learned)
+3. generic selectors (article, .article-content, ..., main)
+4. all <p> elements of the page
+
+The text is the stripped text of every <p> in the container, joined by a
+space, after dropping script/style/navigation elements.
+
+Benchmark against the old BeautifulSoup path on saved pages:
+
+    python -m app.services.article_extractor --fixtures ./html_fixtures
+    python -m app.services.article_extractor --fixtures ./html_fixtures --fetch URL [URL ...]
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+
+from app.services.domain_index import registrable_domain, source_host
+
+REMOVED_TAGS = ("script", "style", "noscript", "nav", "footer", "header", "aside", "iframe")
+
+
+def _class_xpath(tag: str, class_name: str) -> str:
+    """XPath untuk selector CSS `tag.class_name` (cocok per token class, seperti CSS)"""
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+# Content containers of the sites we ingest; checked before the generic selectors.
+# A profile may match several containers (split article bodies); all are used.
+DOMAIN_PROFILES: Dict[str, List[str]] = {
+    "detik.com": [_class_xpath("div", "detail__body-text")],
+    "kompas.com": [_class_xpath("div", "read__content")],
+    "antaranews.com": [
+        _class_xpath("div", "wrap__article-detail-content"),
+        _class_xpath("div", "post-content"),
+    ],
+    "tempo.co": ["//div[@id='isi']", _class_xpath("div", "detail-konten")],
+    "cnnindonesia.com": [_class_xpath("div", "detail-text")],
+    "liputan6.com": [_class_xpath("div", "article-content-body__item-content")],
+    "tribunnews.com": [_class_xpath("div", "txt-article")],
+    "okezone.com": ["//div[@id='contentx']"],
+    "republika.co.id": [_class_xpath("div", "article-content")],
+}
+
+# Same order as the CSS selectors used before (first match wins)
+GENERIC_SELECTORS: List[str] = [
+    "//article",
+    _class_xpath("*", "article-content"),
+    _class_xpath("*", "post-content"),
+    _class_xpath("*", "entry-content"),
+    _class_xpath("*", "content"),
+    "//main",
+    _class_xpath("*", "detail-text"),
+]
+
+# A generic match shorter than this is used for the page but not remembered
+MIN_LEARNED_LENGTH = 200
+
+# Identifies the extraction rules; cached text from other rules is re-extracted
+EXTRACTOR_VERSION = hashlib.sha1(
+    json.dumps([REMOVED_TAGS, DOMAIN_PROFILES, GENERIC_SELECTORS, MIN_LEARNED_LENGTH], sort_keys=True).encode()
+).hexdigest()[:12]
+
+_PARAGRAPHS = etree.XPath(".//p")
+_ALL_PARAGRAPHS = etree.XPath("//p")
+
+
+class ArticleExtractor:
+    def __init__(self, max_learned_domains: int = 1000):
+        """
+        Args:
+            max_learned_domains: Jumlah domain yang selector-nya diingat
+        """
+        self._compiled: Dict[str, etree.XPath] = {}
+        for expressions in [GENERIC_SELECTORS, *DOMAIN_PROFILES.values()]:
+            for expression in expressions:
+                self._compiled.setdefault(expression, etree.XPath(expression))
+
+        self.max_learned_domains = max_learned_domains
+        # domain -> (xpath, use all matches) that produced content last time
+        self._learned: "OrderedDict[str, Tuple[str, bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"learned_hits": 0, "profile_hits": 0, "generic_hits": 0, "fallback": 0, "failed": 0}
+
+    def extract(
+        self,
+        html: bytes,
+        url: Optional[str] = None,
+        max_chars: int = 5000,
+        min_length: int = 1,
+    ) -> str:
+        """
+        Ambil teks artikel dari HTML yang sudah di-download.
+
+        Args:
+            html: Isi halaman (bytes atau str)
+            url: URL halaman, untuk memilih profile domain
+            max_chars: Panjang maksimum teks yang dikembalikan
+            min_length: Container dianggap cocok jika teksnya minimal sepanjang ini
+
+        Returns:
+            Teks artikel, "" jika halaman tidak bisa di-parse
+        """
+        try:
+            doc = lxml_html.document_fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            self._parse_failed(e)
+            return ""
+
+        return self._extract_doc(doc, url, max_chars, min_length)
+
+    def incremental(self, url: Optional[str] = None, max_chars: int = 5000, min_length: int = 1) -> "IncrementalExtraction":
+        """Ekstraksi yang menerima HTML per chunk selama download (lihat IncrementalExtraction)"""
+        return IncrementalExtraction(self, url, max_chars, min_length)
+
+    def _parse_failed(self, error: Exception):
+        print(f"Error parsing HTML: {error}")
+        with self._lock:
+            self.stats["failed"] += 1
+
+    def _extract_doc(
+        self,
+        doc,
+        url: Optional[str],
+        max_chars: int,
+        min_length: int,
+        partial: bool = False,
+    ) -> Optional[str]:
+        """
+        Ekstrak teks dari tree yang sudah di-parse (tree diubah).
+
+        Dengan partial=True (halaman belum selesai di-download), hanya
+        mengembalikan teks jika selector khusus situs (learned/profile)
+        sudah menghasilkan max_chars karakter; selain itu None.
+        """
+        etree.strip_elements(doc, *REMOVED_TAGS, with_tail=False)
+
+        domain = self._domain(url)
+        content, selector, kind = self._find_content(doc, domain, min_length)
+
+        if partial and (kind not in ("learned_hits", "profile_hits") or len(content) < max_chars):
+            # A generic or shorter match may still be beaten by content further down the page
+            return None
+
+        with self._lock:
+            self.stats[kind] += 1
+            if domain and kind == "generic_hits" and len(content) >= MIN_LEARNED_LENGTH:
+                self._learned[domain] = selector
+                self._learned.move_to_end(domain)
+                while len(self._learned) > self.max_learned_domains:
+                    self._learned.popitem(last=False)
+
+        return content[:max_chars]
+
+    def _find_content(self, doc, domain: str, min_length: int) -> Tuple[str, Optional[Tuple[str, bool]], str]:
+        """(teks, selector yang cocok, jenis match)"""
+        profile = DOMAIN_PROFILES.get(domain, [])
+        for expression in profile:
+            text = _paragraph_text(self._compiled[expression](doc), all_matches=True)
+            if len(text) >= min_length:
+                return text, (expression, True), "profile_hits"
+
+        # Profiled sites never use a learned selector: a page without the
+        # profiled container must not teach a generic one for the whole site
+        learned = self._learned.get(domain) if domain and not profile else None
+        if learned:
+            text = _paragraph_text(self._compiled[learned[0]](doc), all_matches=learned[1])
+            if len(text) >= max(min_length, MIN_LEARNED_LENGTH):
+                return text, learned, "learned_hits"
+
+        for expression in GENERIC_SELECTORS:
+            text = _paragraph_text(self._compiled[expression](doc), all_matches=False)
+            if len(text) >= min_length:
+                return text, (expression, False), "generic_hits"
+
+        # Fallback: get all paragraphs
+        return _join_paragraphs(_ALL_PARAGRAPHS(doc)), None, "fallback"
+
+    def has_site_selector(self, url: Optional[str]) -> bool:
+        """True jika situs punya profile atau selector yang dipelajari"""
+        domain = self._domain(url)
+        return bool(domain) and (domain in DOMAIN_PROFILES or domain in self._learned)
+
+    def _domain(self, url: Optional[str]) -> str:
+        host = source_host(url) if url else ""
+        return registrable_domain(host) if host else ""
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.stats,
+                "learned_domains": {domain: xpath for domain, (xpath, _) in self._learned.items()},
+            }
+
+
+class IncrementalExtraction:
+    """
+    Parse HTML per chunk selama download, supaya download bisa dihentikan
+    begitu teks artikel sudah cukup:
+
+        extraction = article_extractor.incremental(url)
+        for chunk in response.iter_content(16384):
+            if extraction.feed(chunk):
+                break  # enough text, stop downloading
+        text = extraction.close()
+
+    Download hanya dihentikan lebih awal jika selector khusus situs
+    (learned/profile) sudah menemukan max_chars karakter, sehingga hasilnya
+    sama dengan membaca halaman sampai habis. Untuk situs tanpa selector
+    khusus feed() hanya mem-parse (early stop tidak mungkin berhasil).
+
+    Di event loop, pisahkan parsing yang murah dari pengecekan snapshot:
+
+        if extraction.receive(chunk) and await asyncio.to_thread(extraction.check):
+            break
+    """
+
+    # Bytes before the first check of the partial tree (each check copies the
+    # tree); the interval doubles after every check that finds too little text
+    CHECK_INTERVAL = 32 * 1024
+
+    def __init__(self, extractor: ArticleExtractor, url: Optional[str], max_chars: int, min_length: int):
+        self.extractor = extractor
+        self.url = url
+        self.max_chars = max_chars
+        self.min_length = min_length
+        self.received = 0
+        self.text: Optional[str] = None
+        self.checks = 0
+
+        self._parser = etree.HTMLPullParser(events=("end",), tag="p")
+        self._parser.set_element_class_lookup(lxml_html.HtmlElementClassLookup())
+        self._root = None
+        self._paragraph_chars = 0
+        self._unchecked = 0
+        self._check_interval = self.CHECK_INTERVAL
+        # Only a site-specific match can end the download early
+        self._can_stop_early = extractor.has_site_selector(url)
+
+    @property
+    def done(self) -> bool:
+        return self.text is not None
+
+    def feed(self, chunk: bytes) -> bool:
+        """Tambahkan chunk HTML. True jika teks sudah cukup (download boleh dihentikan)."""
+        if self.done:
+            return True
+        return self.check() if self.receive(chunk) else False
+
+    def receive(self, chunk: bytes) -> bool:
+        """Parse chunk HTML (murah). True jika snapshot sebaiknya dicek dengan check()."""
+        if self.done:
+            return False
+
+        self.received += len(chunk)
+        self._unchecked += len(chunk)
+        try:
+            self._parser.feed(chunk)
+        except etree.LxmlError:
+            # Let close() report it; the full-document path handles broken pages
+            return False
+
+        for _, paragraph in self._parser.read_events():
+            self._paragraph_chars += len(paragraph.text_content().strip())
+            if self._root is None:
+                self._root = paragraph.getroottree().getroot()
+
+        # Only worth checking once the page has at least max_chars of paragraph text
+        return (
+            self._can_stop_early
+            and self._root is not None
+            and self._paragraph_chars >= self.max_chars
+            and self._unchecked >= self._check_interval
+        )
+
+    def check(self) -> bool:
+        """Ekstrak dari snapshot tree parsial. True jika teks sudah cukup."""
+        if self.done:
+            return True
+
+        self._unchecked = 0
+        self.checks += 1
+        # The parser keeps building the live tree; extract from a snapshot
+        self.text = self.extractor._extract_doc(
+            copy.deepcopy(self._root), self.url, self.max_chars, self.min_length, partial=True
+        )
+        if not self.done:
+            self._check_interval *= 2
+        return self.done
+
+    def close(self) -> str:
+        """Teks artikel dari semua chunk yang sudah diterima"""
+        if self.done:
+            return self.text
+
+        try:
+            doc = self._parser.close()
+        except (etree.LxmlError, ValueError) as e:
+            self.extractor._parse_failed(e)
+            self.text = ""
+            return self.text
+
+        self.text = self.extractor._extract_doc(doc, self.url, self.max_chars, self.min_length)
+        return self.text
+
+
+def _paragraph_text(containers: List, all_matches: bool) -> str:
+    if not containers:
+        return ""
+    if not all_matches:
+        containers = containers[:1]
+    paragraphs = [p for container in containers for p in _PARAGRAPHS(container)]
+    return _join_paragraphs(paragraphs)
+
+
+def _join_paragraphs(paragraphs: List) -> str:
+    texts = (p.text_content().strip() for p in paragraphs)
+    return " ".join(text for text in texts if text)
+
+
+def _legacy_extract(html: bytes) -> str:
+    """Jalur BeautifulSoup lama (hanya untuk benchmark)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+
+    article_content = ""
+    for selector in ["article", ".article-content", ".post-content", ".entry-content", ".content", "main"]:
+        content_div = soup.select_one(selector)
+        if content_div:
+            paragraphs = content_div.find_all("p")
+            article_content = " ".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+            if article_content:
+                break
+
+    if not article_content:
+        paragraphs = soup.find_all("p")
+        article_content = " ".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+
+    return article_content[:5000]
+
+
+def benchmark(fixtures_dir: str, repeat: int = 5) -> Dict:
+    """
+    Bandingkan BeautifulSoup lama vs lxml pada file HTML tersimpan: waktu
+    ekstraksi, dan ketepatan teks jika ada teks yang diharapkan.
+
+    Nama file: `<domain>__<apa saja>.html`, mis. `detik.com__berita-1.html`;
+    domain dipakai untuk memilih profile. Teks artikel yang benar (opsional)
+    disimpan di file `.txt` dengan nama yang sama. Halaman dibaca urut nama
+    oleh satu extractor, jadi selector yang dipelajari ikut teruji.
+    """
+    import time
+
+    fixtures = []
+    for name in sorted(os.listdir(fixtures_dir)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(fixtures_dir, name), "rb") as f:
+                page = f.read()
+            expected = None
+            expected_path = os.path.join(fixtures_dir, os.path.splitext(name)[0] + ".txt")
+            if os.path.exists(expected_path):
+                with open(expected_path, encoding="utf-8") as f:
+                    expected = f.read().strip()
+            fixtures.append((name, f"https://{name.split('__')[0]}/", page, expected))
+    if not fixtures:
+        raise ValueError(f"No .html fixtures in {fixtures_dir}")
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        legacy = [_legacy_extract(page) for _, _, page, _ in fixtures]
+    legacy_seconds = (time.perf_counter() - started) / repeat
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        # Fresh extractor per pass, so every pass learns selectors the same way
+        extractor = ArticleExtractor()
+        current = [extractor.extract(page, url) for _, url, page, _ in fixtures]
+    lxml_seconds = (time.perf_counter() - started) / repeat
+
+    scored = [(name, expected, old, new) for (name, _, _, expected), old, new in zip(fixtures, legacy, current) if expected is not None]
+
+    return {
+        "pages": len(fixtures),
+        "bs4_ms_per_page": round(legacy_seconds / len(fixtures) * 1000, 3),
+        "lxml_ms_per_page": round(lxml_seconds / len(fixtures) * 1000, 3),
+        "speedup": round(legacy_seconds / lxml_seconds, 2),
+        "same_text": sum(a == b for a, b in zip(legacy, current)),
+        "empty_bs4": sum(not text for text in legacy),
+        "empty_lxml": sum(not text for text in current),
+        "scored_pages": len(scored),
+        "correct_bs4": sum(old == expected for _, expected, old, _ in scored),
+        "correct_lxml": sum(new == expected for _, expected, _, new in scored),
+        "wrong_lxml": [name for name, expected, _, new in scored if new != expected],
+        "stats": extractor.get_stats(),
+    }
+
+
+def save_fixtures(urls: List[str], fixtures_dir: str):
+    """Download halaman ke fixtures_dir dengan nama yang dipahami benchmark()"""
+    import requests
+
+    from app.services.rss_fetcher import HEADERS
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for url in urls:
+        response = requests.get(url, headers=HEADERS, timeout=15)
+        response.raise_for_status()
+        name = f"{registrable_domain(source_host(url))}__{hashlib.md5(url.encode()).hexdigest()[:10]}.html"
+        with open(os.path.join(fixtures_dir, name), "wb") as f:
+            f.write(response.content)
+        print(f"Saved {url} -> {name}")
+
+
+# Global instance
+article_extractor = ArticleExtractor()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark lxml article extraction against BeautifulSoup")
+    parser.add_argument("--fixtures", required=True, help="Directory of saved .html pages")
+    parser.add_argument("--fetch", nargs="*", default=[], help="Download these URLs into --fixtures first")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the fixtures per extractor")
+
+    args = parser.parse_args()
+
+    if args.fetch:
+        save_fixtures(args.fetch, args.fixtures)
+    print(json.dumps(benchmark(args.fixtures, repeat=args.repeat), indent=2))
@@ -0,0 +1,127 @@
+"""
+Micro-Batching Inference Engine
+
+Mengumpulkan request prediksi yang datang hampir bersamaan menjadi satu batch,
+sehingga model cukup menjalankan satu forward pass (dengan padding) untuk
+banyak caller sekaligus. Hasil dikembalikan ke masing-masing caller lewat Future.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        process_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        name: str = "micro-batcher",
+    ):
+        """
+        Args:
+            process_fn: Fungsi yang menerima list input dan mengembalikan list
+                        hasil dengan urutan yang sama
+            max_batch_size: Jumlah maksimum item dalam satu batch
+            max_wait_ms: Waktu tunggu maksimum (ms) sejak item pertama masuk
+                         sebelum batch dijalankan
+        """
+        self.process_fn = process_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue[Optional[Tuple[Any, Future]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # Simple counters for monitoring
+        self.batches_run = 0
+        self.items_processed = 0
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """Masukkan satu item ke antrian, kembalikan Future untuk hasilnya"""
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future
+
+    def process(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Submit satu item dan tunggu hasilnya (blocking)"""
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect_batch(self, first: Tuple[Any, Future]) -> List[Tuple[Any, Future]]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                # Shutdown sentinel: finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(entry)
+
+        return batch
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                break
+
+            batch = self._collect_batch(entry)
+            # Skip callers that gave up (cancelled) before the batch started
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"{self.name}: process_fn returned {len(results)} results for {len(items)} items"
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+            self.batches_run += 1
+            self.items_processed += len(items)
+
+    def shutdown(self):
+        """Hentikan worker thread setelah antrian yang ada selesai diproses"""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+
+    def get_stats(self) -> dict:
+        return {
+            "batches_run": self.batches_run,
+            "items_processed": self.items_processed,
+            "avg_batch_size": round(self.items_processed / self.batches_run, 2) if self.batches_run else 0.0,
+            "queue_size": self._queue.qsize(),
+        }
@@ -0,0 +1,105 @@
+"""
+Domain Index - Hash-based source reputation lookup
+
+Sources are parsed once into a hostname, then looked up by walking its
+suffixes up to the registrable domain (e.g. news.detik.com -> detik.com).
+Each step is one dict lookup, so the cost depends on the number of labels
+in the hostname, not on the size of the reputation list.
+
+Unlike substring matching, look-alike hosts such as
+notkompas.com.evil.net do not match kompas.com.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# Reputation at or above this counts as a trusted source
+TRUSTED_REPUTATION = 0.8
+
+# Second-level suffixes under which registrations happen (subset of the
+# Public Suffix List that matters for Indonesian and common foreign media)
+MULTI_PART_SUFFIXES = {
+    "co.id", "ac.id", "go.id", "or.id", "web.id", "sch.id", "my.id",
+    "net.id", "biz.id", "mil.id", "desa.id", "ponpes.id",
+    "co.uk", "org.uk", "ac.uk", "gov.uk",
+    "com.au", "net.au", "org.au",
+    "com.sg", "com.my", "co.jp", "co.in", "com.br",
+    # Blog hosting: every subdomain is a separate site (PSL private section)
+    "blogspot.com", "wordpress.com",
+}
+
+
+@lru_cache(maxsize=10000)
+def source_host(source: str) -> str:
+    """
+    Hostname dari source (URL lengkap, 'domain/path', atau nama domain saja).
+    Lowercase, tanpa port, tanpa 'www.' dan titik di akhir.
+    """
+    source = source.strip().lower()
+    if not source:
+        return ""
+
+    try:
+        host = urlsplit(source if "://" in source else f"//{source}").hostname or ""
+    except ValueError:
+        return ""
+    host = host.rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+def registrable_domain(host: str) -> str:
+    """
+    Domain yang bisa didaftarkan, mis. berita.kompas.com -> kompas.com,
+    a.detik.co.id -> detik.co.id, blogberita.blogspot.com -> blogberita.blogspot.com
+    """
+    labels = host.split(".")
+    if len(labels) >= 3 and ".".join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+class DomainIndex:
+    def __init__(self, reputations: Dict[str, float]):
+        """
+        Args:
+            reputations: domain -> reputation (0.0 = tidak terpercaya, 1.0 = terpercaya).
+                         Subdomain boleh punya nilai sendiri (mis. cekfakta.tempo.co).
+        """
+        self.reputations = {}
+        for domain, reputation in reputations.items():
+            host = source_host(domain)
+            if host:
+                self.reputations[host] = float(reputation)
+
+    def __len__(self) -> int:
+        return len(self.reputations)
+
+    def reputation(self, source: str) -> Optional[float]:
+        """
+        Reputation untuk source, dari entry paling spesifik yang cocok.
+        Entry untuk suffix multi-part (mis. blogspot.com) berlaku untuk semua
+        situs di bawahnya yang tidak punya entry sendiri.
+        None jika domain tidak ada di index.
+        """
+        host = source_host(source) if source else ""
+        if not host:
+            return None
+
+        stop = registrable_domain(host)
+        suffix = stop.partition(".")[2]
+        if suffix in MULTI_PART_SUFFIXES:
+            stop = suffix
+        while True:
+            reputation = self.reputations.get(host)
+            if reputation is not None:
+                return reputation
+            if host == stop or "." not in host:
+                return None
+            host = host.split(".", 1)[1]
+
+    def is_trusted(self, source: str) -> bool:
+        reputation = self.reputation(source)
+        return reputation is not None and reputation >= TRUSTED_REPUTATION
@@ -0,0 +1,122 @@
+"""
+Download Limits - Caps for fetching pages from arbitrary URLs
+
+Pages are streamed instead of read in full:
+
+- a Content-Type that is not HTML is rejected before reading the body
+- reading stops after DOWNLOAD_MAX_BYTES, counted after decompression (so
+  a small gzip bomb is cut off at the same limit); article pages keep the
+  part received so far, feeds are rejected
+- the whole download is aborted after DOWNLOAD_DEADLINE seconds (the
+  per-read timeout alone lets a slow server trickle forever)
+
+This bounds memory and time per request, which matters for
+/api/checker/check-url where the URL comes from the user.
+"""
+
+import os
+import time
+from typing import List, Mapping, Optional
+
+
+class DownloadLimitError(ValueError):
+    """Download dihentikan karena melewati salah satu batas"""
+
+
+class DownloadLimits:
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        deadline_seconds: Optional[float] = None,
+        content_types: Optional[List[str]] = None,
+        truncate: bool = False,
+    ):
+        """
+        Args:
+            max_bytes: Ukuran maksimum body (setelah dekompresi)
+            deadline_seconds: Waktu maksimum untuk seluruh download
+            content_types: Content-Type yang diterima; None = semua
+            truncate: True = berhenti membaca di max_bytes dan pakai yang sudah
+                      diterima; False = tolak response yang lebih besar
+        """
+        self.max_bytes = max_bytes or int(os.getenv("DOWNLOAD_MAX_BYTES", str(2 * 1024 * 1024)))
+        self.deadline_seconds = deadline_seconds or float(os.getenv("DOWNLOAD_DEADLINE", "20"))
+        self.content_types = content_types
+        self.truncate = truncate
+
+    def check_headers(self, url: str, headers: Mapping[str, str]):
+        """
+        Raises:
+            DownloadLimitError: Jika Content-Type atau Content-Length tidak diterima
+        """
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        # Servers that send no Content-Type at all are let through
+        if self.content_types is not None and content_type and content_type not in self.content_types:
+            raise DownloadLimitError(f"Unsupported content type {content_type!r} for {url}")
+
+        length = headers.get("content-length", "")
+        if not self.truncate and length.isdigit() and int(length) > self.max_bytes:
+            raise DownloadLimitError(f"Response too large ({length} bytes, limit {self.max_bytes}) for {url}")
+
+    def start(self, url: str) -> "DownloadBudget":
+        return DownloadBudget(self, url)
+
+
+class DownloadBudget:
+    def __init__(self, limits: DownloadLimits, url: str):
+        self.limits = limits
+        self.url = url
+        self.received = 0
+        self.deadline = time.monotonic() + limits.deadline_seconds
+
+    def add(self, chunk: bytes) -> bytes:
+        """
+        Catat chunk yang diterima.
+
+        Returns:
+            Bagian chunk yang masih dalam batas ukuran (mode truncate);
+            b"" berarti batas sudah tercapai dan download harus berhenti
+
+        Raises:
+            DownloadLimitError: Jika waktu habis, atau ukuran melewati batas (tanpa truncate)
+        """
+        if self.expired:
+            raise self.deadline_error()
+
+        allowed = self.limits.max_bytes - self.received
+        self.received += len(chunk)
+        if len(chunk) <= allowed:
+            return chunk
+        if not self.limits.truncate:
+            raise DownloadLimitError(f"Response exceeded {self.limits.max_bytes} bytes for {self.url}")
+        return chunk[:max(0, allowed)]
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() > self.deadline
+
+    @property
+    def exhausted(self) -> bool:
+        return self.received >= self.limits.max_bytes
+
+    def remaining_seconds(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def deadline_error(self) -> DownloadLimitError:
+        return DownloadLimitError(f"Download exceeded {self.limits.deadline_seconds}s deadline for {self.url}")
+
+
+HTML_CONTENT_TYPES = ["text/html", "application/xhtml+xml"]
+
+# Global instances: article pages must be HTML and the article text is near
+# the top, so oversized pages are cut off; feeds come with many XML types and
+# a truncated feed is useless
+page_limits = DownloadLimits(
+    content_types=[
+        t.strip().lower()
+        for t in os.getenv("DOWNLOAD_CONTENT_TYPES", ",".join(HTML_CONTENT_TYPES)).split(",")
+        if t.strip()
+    ],
+    truncate=True,
+)
+feed_limits = DownloadLimits(max_bytes=int(os.getenv("FEED_MAX_BYTES", str(5 * 1024 * 1024))))
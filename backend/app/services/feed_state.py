@@ -0,0 +1,152 @@
+"""
+Feed State - Persisted per-feed change detection state
+
+For every feed we remember the validators of the last response (ETag /
+Last-Modified, sent back as If-None-Match / If-Modified-Since) and which
+entries were already ingested (recent GUIDs and the newest published
+time). An unchanged feed costs one 304 response; a changed feed only
+pays database lookups for entries we have not seen before.
+
+State is written atomically (temp file + rename) and only after the
+articles of a run were saved, so a crash mid-run re-processes entries
+instead of losing them.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class FeedStateStore:
+    def __init__(self, path: Optional[str] = None, max_guids: Optional[int] = None):
+        """
+        Args:
+            path: File JSON untuk menyimpan state
+            max_guids: Jumlah GUID terakhir yang diingat per feed
+        """
+        self.path = path or os.getenv("FEED_STATE_PATH", "./feed_state.json")
+        self.max_guids = max_guids or int(os.getenv("FEED_STATE_MAX_GUIDS", "1000"))
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("feeds", {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError) as e:
+            # Losing the state only costs one full fetch per feed
+            print(f"Warning: Could not read feed state {self.path}: {e}")
+            return {}
+
+    def get(self, feed_url: str) -> Dict:
+        with self._lock:
+            return dict(self._feeds.get(feed_url, {}))
+
+    def request_headers(self, feed_url: str) -> Dict[str, str]:
+        """Header conditional GET dari response terakhir feed ini"""
+        state = self.get(feed_url)
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("modified"):
+            headers["If-Modified-Since"] = state["modified"]
+        return headers
+
+    def filter_unseen(self, feed_url: str, articles: List[Dict]) -> List[Dict]:
+        """
+        Buang entry yang sudah pernah di-ingest: GUID sudah tercatat, atau
+        published time tidak lebih baru dari entry terbaru yang pernah dilihat.
+        """
+        state = self.get(feed_url)
+        seen_guids = set(state.get("guids", []))
+        last_published = state.get("last_published_ts")
+
+        unseen = []
+        for article in articles:
+            if article.get("guid") in seen_guids:
+                continue
+            published = _timestamp(article.get("published"))
+            if last_published is not None and published is not None and published <= last_published:
+                continue
+            unseen.append(article)
+        return unseen
+
+    def next_state(
+        self,
+        feed_url: str,
+        articles: List[Dict],
+        etag: Optional[str] = None,
+        modified: Optional[str] = None,
+    ) -> Dict:
+        """
+        State baru untuk feed setelah semua `articles` diproses. Belum
+        disimpan; panggil commit() setelah artikelnya tersimpan.
+        """
+        state = self.get(feed_url)
+        # Newest first, matching the usual feed order
+        guids = list(dict.fromkeys(a["guid"] for a in articles if a.get("guid")))
+        known = set(guids)
+        guids += [g for g in state.get("guids", []) if g not in known]
+
+        published = [_timestamp(a.get("published")) for a in articles]
+        published = [ts for ts in published if ts is not None]
+        if state.get("last_published_ts") is not None:
+            published.append(state["last_published_ts"])
+
+        return {
+            "etag": etag,
+            "modified": modified,
+            "guids": guids[:self.max_guids],
+            "last_published_ts": max(published) if published else None,
+            "checked_at": time.time(),
+        }
+
+    def commit(self, updates: Dict[str, Dict]):
+        """Simpan state beberapa feed sekaligus (atomic write)"""
+        if not updates:
+            return
+
+        with self._lock:
+            self._feeds.update(updates)
+            data = {"feeds": self._feeds}
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def describe(self) -> Dict:
+        with self._lock:
+            return {
+                "path": self.path,
+                "feeds": {
+                    url: {
+                        "etag": state.get("etag"),
+                        "modified": state.get("modified"),
+                        "known_entries": len(state.get("guids", [])),
+                        "checked_at": state.get("checked_at"),
+                    }
+                    for url, state in self._feeds.items()
+                },
+            }
+
+
+def _timestamp(published) -> Optional[float]:
+    if isinstance(published, datetime):
+        try:
+            return published.timestamp()
+        except (OverflowError, OSError, ValueError):
+            return None
+    return None
+
+
+# Global instance
+feed_state = FeedStateStore()
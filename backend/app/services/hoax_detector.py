@@ -1,92 +1,611 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
+from transformers import AutoTokenizer
+import numpy as np
 import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from app.models import HoaxPrediction
 from app.services.rule_based_detector import rule_based_detector
+from app.services.batch_inference import MicroBatcher
+from app.services.prediction_cache import PredictionCache
+from app.services.model_registry import model_registry
+
+
+class ModelBundle:
+    """
+    Tokenizer + model + metadata yang di-load bersama. Bundle tidak pernah
+    diubah setelah dibuat; hot swap cukup mengganti referensi ke bundle baru,
+    sehingga request yang sedang berjalan tetap memakai bundle lamanya.
+    """
+
+    def __init__(self, tokenizer, model, device: str, version: str, path: str, variant: str = "fp32"):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.device = device
+        self.version = version
+        self.path = path
+        # Weights actually loaded ("fp32" or "int8"), which may differ from MODEL_VARIANT
+        self.variant = variant
+
 
 class HoaxDetector:
     def __init__(self):
         self.model_name = os.getenv("MODEL_NAME", "indobenchmark/indobert-base-p1")
         self.model_path = os.getenv("MODEL_PATH", None)
-        self.tokenizer = None
-        self.model = None
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._bundle: Optional[ModelBundle] = None
+        self._load_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self.swap_count = 0
+        self.last_swap_at: Optional[str] = None
+
+        # "torch" (default) or "onnx" (onnxruntime on CPU, no torch import)
+        self.backend = os.getenv("INFERENCE_BACKEND", "torch").lower()
+        self.onnx_path = os.getenv("ONNX_MODEL_PATH", "")
+        self.onnx_threads = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+        # Long articles: "truncate" (first 512 tokens) or "chunked" (sliding windows)
+        self.long_text_mode = os.getenv("LONG_TEXT_MODE", "truncate").lower()
+        self.chunk_stride = int(os.getenv("CHUNK_STRIDE", "128"))
+        self.max_chunks = max(1, int(os.getenv("MAX_CHUNKS_PER_ARTICLE", "8")))
+        self.chunk_aggregation = os.getenv("CHUNK_AGGREGATION", "mean").lower()
+        self.chunk_batch_size = max(1, int(os.getenv("CHUNK_BATCH_SIZE", "32")))
+
+        # "fp32" (default) or "int8" (dynamic-quantized artifact, torch backend only)
+        self.model_variant = os.getenv("MODEL_VARIANT", "fp32").lower()
+        if self.model_variant == "int8" and self.backend == "onnx":
+            print(
+                "WARNING: MODEL_VARIANT=int8 is not supported with INFERENCE_BACKEND=onnx; "
+                "serving the fp32 ONNX model"
+            )
+        self.batch_size = int(os.getenv("PREDICT_BATCH_SIZE", "16"))
+
+        # Cascade: rule-based scores settle confident cases, only texts whose
+        # hoax probability falls inside [CASCADE_LOW, CASCADE_HIGH) reach the model
+        self.cascade_enabled = os.getenv("CASCADE_MODE", "false").lower() == "true"
+        self.cascade_low = float(os.getenv("CASCADE_LOW", "0.1"))
+        self.cascade_high = float(os.getenv("CASCADE_HIGH", "0.5"))
+        self._cascade_lock = threading.Lock()
+        self.cascade_counts = {"rules_hoax": 0, "rules_non_hoax": 0, "model": 0}
+
+        # Dynamic micro-batching: concurrent predict() calls share one forward pass
+        self.batcher = MicroBatcher(
+            self._predict_probabilities,
+            max_batch_size=int(os.getenv("BATCH_MAX_SIZE", "16")),
+            max_wait_ms=float(os.getenv("BATCH_MAX_WAIT_MS", "10")),
+            name="hoax-detector-batcher",
+        )
+
+        # Prediction cache keyed on (normalized text, source domain, model version)
+        self.cache = PredictionCache(
+            max_entries=int(os.getenv("PREDICTION_CACHE_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL", "3600")),
+        )
+
+    @property
+    def model(self):
+        bundle = self._bundle
+        return bundle.model if bundle else None
+
+    @property
+    def tokenizer(self):
+        bundle = self._bundle
+        return bundle.tokenizer if bundle else None
+
+    @property
+    def device(self) -> Optional[str]:
+        bundle = self._bundle
+        return bundle.device if bundle else None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        bundle = self._bundle
+        return bundle.version if bundle else None
+
+    @property
+    def loaded_variant(self) -> Optional[str]:
+        bundle = self._bundle
+        return bundle.variant if bundle else None
+
+    def _resolve_model_source(self, version: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Tentukan model yang harus di-load: versi di model registry (CURRENT atau
+        `version`), lalu MODEL_PATH, lalu base model MODEL_NAME.
+
+        Returns:
+            (path, version)
+        """
+        version = version or model_registry.current_version()
+        if version:
+            return model_registry.version_path(version), version
+
+        # Use trained model if MODEL_PATH is set, otherwise use base model
+        model_to_load = self.model_path if self.model_path else self.model_name
+        return model_to_load, self._compute_model_version(model_to_load)
 
     def load_model(self):
-        if self.model is None:
-            # Use trained model if MODEL_PATH is set, otherwise use base model
-            model_to_load = self.model_path if self.model_path else self.model_name
+        if self._bundle is None:
+            with self._load_lock:
+                if self._bundle is None:
+                    self._bundle = self._load_bundle(*self._resolve_model_source())
+
+    def _load_bundle(self, model_to_load: str, version: str) -> ModelBundle:
+        if self.backend == "onnx":
+            return self._load_onnx_model(model_to_load, version)
+        return self._load_torch_model(model_to_load, version)
+
+    def _load_torch_model(self, model_to_load: str, version: str) -> ModelBundle:
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+        print(f"Loading model from: {model_to_load}")
+        print(f"Device: {device}")
 
-            print(f"Loading model from: {model_to_load}")
-            print(f"Device: {self.device}")
+        tokenizer = AutoTokenizer.from_pretrained(model_to_load)
 
-            self.tokenizer = AutoTokenizer.from_pretrained(model_to_load)
+        if self.model_variant == "int8" and self.backend != "onnx":
+            from app.services.model_quantizer import default_quantized_path, load_quantized_model
 
+            quantized_dir = default_quantized_path(model_to_load)
             try:
-                self.model = AutoModelForSequenceClassification.from_pretrained(
-                    model_to_load,
-                    num_labels=2  # binary classification: hoax or non-hoax
-                )
-                print(f"Fine-tuned model loaded successfully!")
+                model = load_quantized_model(quantized_dir)
+                print(f"INT8 quantized model loaded from {quantized_dir}")
+                print("Model ready on cpu")
+                # Dynamic quantization runs on CPU only
+                return ModelBundle(tokenizer, model, "cpu", version, model_to_load, variant="int8")
             except Exception as e:
-                print(f"Error loading model: {e}")
-                print("Warning: Using base model. You need a fine-tuned model for actual hoax detection.")
-                from transformers import AutoModel
-                self.model = AutoModel.from_pretrained(self.model_name)
+                print(f"Error loading quantized model: {e}")
+                print("WARNING: MODEL_VARIANT=int8 requested, falling back to the fp32 model.")
 
-            self.model.to(self.device)
-            self.model.eval()
-            print(f"Model ready on {self.device}")
+        try:
+            model = AutoModelForSequenceClassification.from_pretrained(
+                model_to_load,
+                num_labels=2  # binary classification: hoax or non-hoax
+            )
+            print(f"Fine-tuned model loaded successfully!")
+        except Exception as e:
+            print(f"Error loading model: {e}")
+            print("Warning: Using base model. You need a fine-tuned model for actual hoax detection.")
+            from transformers import AutoModel
+            model = AutoModel.from_pretrained(self.model_name)
 
-    def predict(self, text: str, source: str = "") -> HoaxPrediction:
+        model.to(device)
+        model.eval()
+        print(f"Model ready on {device}")
+        return ModelBundle(tokenizer, model, device, version, model_to_load)
+
+    def _load_onnx_model(self, model_to_load: str, version: str) -> ModelBundle:
+        from app.services.onnx_exporter import create_session, default_onnx_path
+
+        onnx_path = self.onnx_path or default_onnx_path(model_to_load)
+        if not os.path.exists(onnx_path):
+            raise FileNotFoundError(
+                f"ONNX model not found at {onnx_path}. "
+                "Export it with: python app/services/onnx_exporter.py --model <MODEL_PATH>"
+            )
+
+        print(f"Loading ONNX model from: {onnx_path}")
+        tokenizer = AutoTokenizer.from_pretrained(model_to_load)
+        session = create_session(onnx_path, intra_op_threads=self.onnx_threads)
+        print(f"ONNX model ready (intra-op threads: {self.onnx_threads or 'default'})")
+        return ModelBundle(tokenizer, session, "cpu", version, model_to_load)
+
+    def reload_model(self, version: Optional[str] = None) -> dict:
         """
-        Predict hoax dengan fallback ke rule-based detector
+        Hot swap: load versi model baru di background, warm up, lalu ganti
+        bundle yang dipakai secara atomik. Request yang sedang berjalan selesai
+        dengan model lama; tidak ada request yang gagal atau menunggu load.
 
         Args:
-            text: Konten berita
-            source: Sumber berita (URL atau nama media)
+            version: Versi registry yang di-load (default: CURRENT)
+
+        Returns:
+            Dict berisi versi sebelum dan sesudah swap
         """
-        # Try ML model first
-        use_ml_model = os.getenv("USE_ML_MODEL", "false").lower() == "true"
+        with self._load_lock:
+            previous = self.model_version
+            model_to_load, new_version = self._resolve_model_source(version)
+
+            if self._bundle is not None and new_version == previous:
+                return {"swapped": False, "previous": previous, "current": previous}
+
+            start = time.perf_counter()
+            bundle = self._load_bundle(model_to_load, new_version)
+
+            # Pay first-run overhead before the bundle receives traffic
+            self._predict_probabilities(["berita " * 16], bundle=bundle)
+
+            self._bundle = bundle
+            self.swap_count += 1
+            self.last_swap_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+        elapsed = round(time.perf_counter() - start, 3)
+        print(f"Model swapped: {previous} -> {new_version} ({elapsed}s)")
+        return {"swapped": True, "previous": previous, "current": new_version, "load_seconds": elapsed}
+
+    def start_model_watcher(self, interval: Optional[float] = None):
+        """
+        Poll CURRENT di model registry dan hot swap ketika versinya berubah.
+        Dengan begitu setiap worker process ikut pindah ke model baru setelah
+        retrain atau rollback, tanpa restart.
+        """
+        interval = interval if interval is not None else float(os.getenv("MODEL_WATCH_INTERVAL", "30"))
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                current = model_registry.current_version()
+                if current is None or self._bundle is None or current == self.model_version:
+                    continue
+                try:
+                    self.reload_model(current)
+                except Exception as e:
+                    print(f"Error hot-swapping model to {current}: {e}. Keeping {self.model_version}.")
+
+        self._watcher = threading.Thread(target=watch, name="model-watcher", daemon=True)
+        self._watcher.start()
 
-        if use_ml_model:
-            if self.model is None:
+    def warmup(self, seq_lengths: Optional[List[int]] = None, batch_size: Optional[int] = None) -> dict:
+        """
+        Load model lalu jalankan beberapa batch dummy dengan panjang sequence
+        berbeda, supaya overhead first-run (alokasi memori, kernel selection,
+        graph optimization) tidak dibayar oleh user pertama.
+
+        Returns:
+            Dict berisi waktu load dan waktu warmup per panjang sequence
+        """
+        seq_lengths = seq_lengths or [16, 128, 512]
+        batch_size = batch_size or self.batch_size
+
+        start = time.perf_counter()
+        self.load_model()
+        timings = {"load_seconds": round(time.perf_counter() - start, 3), "warmup_seconds": {}}
+
+        for length in seq_lengths:
+            text = " ".join(["berita"] * length)
+            start = time.perf_counter()
+            for size in sorted({1, batch_size}):
+                self._predict_probabilities([text] * size)
+            timings["warmup_seconds"][length] = round(time.perf_counter() - start, 3)
+
+        print(f"Model warmup done: {timings}")
+        return timings
+
+    def _predict_probabilities(self, texts: List[str], bundle: Optional[ModelBundle] = None) -> List[List[float]]:
+        """
+        Jalankan satu forward pass untuk sekumpulan teks (padding ke teks terpanjang).
+
+        Returns:
+            List probabilitas [p_non_hoax, p_hoax] per teks, urutan sama dengan input
+        """
+        if bundle is None:
+            if self._bundle is None:
                 self.load_model()
+            # One bundle for the whole call, even if a swap happens meanwhile
+            bundle = self._bundle
 
-            # Tokenize input
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
+        if self.long_text_mode == "chunked":
+            logits = self._chunked_logits(bundle, texts)
+        else:
+            inputs = bundle.tokenizer(
+                texts,
+                return_tensors="np",
                 truncation=True,
                 max_length=512,
                 padding=True
             )
+            logits = self._forward(bundle, dict(inputs))
 
-            # Move to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        # Softmax (numerically stable)
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probabilities = exp / exp.sum(axis=-1, keepdims=True)
+        return probabilities.tolist()
 
-            # Make prediction
-            with torch.no_grad():
-                try:
-                    outputs = self.model(**inputs)
-
-                    # Check if model has classification head
-                    if hasattr(outputs, 'logits'):
-                        logits = outputs.logits
-                        probabilities = torch.softmax(logits, dim=-1)
-                        prediction = torch.argmax(probabilities, dim=-1).item()
-                        confidence = probabilities[0][prediction].item()
-
-                        label = "hoax" if prediction == 1 else "non-hoax"
-                        return HoaxPrediction(label=label, confidence=round(confidence, 4))
-                    else:
-                        print("Warning: Model doesn't have classification head. Falling back to rule-based.")
-                except Exception as e:
-                    print(f"Error during ML prediction: {e}. Falling back to rule-based.")
+    def _forward(self, bundle: ModelBundle, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Forward pass untuk input hasil tokenizer (numpy), kembalikan logits"""
+        if self.backend == "onnx":
+            from app.services.onnx_exporter import run_session
+            return run_session(bundle.model, inputs)
+
+        import torch
+
+        # Move to device
+        tensors = {k: torch.from_numpy(v).to(bundle.device) for k, v in inputs.items()}
+
+        # Make prediction
+        with torch.no_grad():
+            outputs = bundle.model(**tensors)
+
+        # Check if model has classification head
+        if not hasattr(outputs, 'logits'):
+            raise ValueError("Model doesn't have classification head")
+
+        return outputs.logits.float().cpu().numpy()
+
+    def _chunked_logits(self, bundle: ModelBundle, texts: List[str]) -> np.ndarray:
+        """
+        Sliding-window inference untuk artikel panjang.
+
+        Setiap teks dipecah menjadi window 512 token yang saling overlap
+        (CHUNK_STRIDE token), maksimal MAX_CHUNKS_PER_ARTICLE window per artikel.
+        Window dari semua artikel dijalankan bersama dalam batch, lalu logits
+        per artikel digabung dengan CHUNK_AGGREGATION (mean, max, attention).
+
+        Returns:
+            Logits per artikel, shape (len(texts), num_labels)
+        """
+        encoded = bundle.tokenizer(
+            texts,
+            return_tensors="np",
+            truncation=True,
+            max_length=512,
+            stride=self.chunk_stride,
+            return_overflowing_tokens=True,
+            padding=True
+        )
+        sample_mapping = np.asarray(encoded.pop("overflow_to_sample_mapping"))
+
+        # Keep at most max_chunks windows per article to bound wasted compute
+        window_index = np.zeros(len(sample_mapping), dtype=np.int64)
+        for i in range(1, len(sample_mapping)):
+            if sample_mapping[i] == sample_mapping[i - 1]:
+                window_index[i] = window_index[i - 1] + 1
+        keep = window_index < self.max_chunks
+        sample_mapping = sample_mapping[keep]
+        inputs = {k: np.asarray(v)[keep] for k, v in encoded.items()}
+
+        # Windows of all articles share forward passes (bounded by CHUNK_BATCH_SIZE)
+        chunk_logits = np.concatenate([
+            self._forward(bundle, {k: v[start:start + self.chunk_batch_size] for k, v in inputs.items()})
+            for start in range(0, len(sample_mapping), self.chunk_batch_size)
+        ])
+
+        aggregated = np.zeros((len(texts), chunk_logits.shape[-1]), dtype=np.float32)
+        for sample in range(len(texts)):
+            aggregated[sample] = self._aggregate_chunks(chunk_logits[sample_mapping == sample])
+        return aggregated
+
+    def _aggregate_chunks(self, logits: np.ndarray) -> np.ndarray:
+        """Gabungkan logits beberapa window menjadi logits satu artikel"""
+        if len(logits) == 1:
+            return logits[0]
+
+        if self.chunk_aggregation == "max":
+            # The article is as suspicious as its most hoax-like window
+            hoax_margin = logits[:, 1] - logits[:, 0]
+            return logits[int(np.argmax(hoax_margin))]
+
+        if self.chunk_aggregation == "attention":
+            # Confident windows (large logit margin) get more weight
+            margin = np.abs(logits[:, 1] - logits[:, 0])
+            weights = np.exp(margin - margin.max())
+            weights /= weights.sum()
+            return (weights[:, None] * logits).sum(axis=0)
+
+        return logits.mean(axis=0)
+
+    @staticmethod
+    def _to_prediction(probabilities: List[float]) -> HoaxPrediction:
+        prediction = max(range(len(probabilities)), key=lambda i: probabilities[i])
+        confidence = probabilities[prediction]
+
+        label = "hoax" if prediction == 1 else "non-hoax"
+        return HoaxPrediction(label=label, confidence=round(confidence, 4))
+
+    def _use_ml_model(self) -> bool:
+        return os.getenv("USE_ML_MODEL", "false").lower() == "true"
+
+    @staticmethod
+    def _compute_model_version(model_to_load: str) -> str:
+        """Fingerprint checkpoint di disk (mtime terbaru), atau nama model di HuggingFace Hub"""
+        if not os.path.isdir(model_to_load):
+            return model_to_load
+
+        latest = 0.0
+        for root, _, files in os.walk(model_to_load):
+            for filename in files:
+                latest = max(latest, os.path.getmtime(os.path.join(root, filename)))
+        return f"{os.path.abspath(model_to_load)}@{latest:.0f}"
+
+    def get_model_version(self) -> Optional[str]:
+        """
+        Versi model yang sedang dipakai untuk prediksi (dipakai sebagai key cache).
+        None jika mode ML aktif tapi model belum di-load.
+        """
+        if not self._use_ml_model():
+            return f"rules/{rule_based_detector.rule_pack_version}"
+        bundle = self._bundle
+        if bundle is None:
+            return None
+        version = (
+            f"{self.backend}/{bundle.variant}/"
+            f"{self.long_text_mode}-{self.chunk_aggregation}/{bundle.version}"
+        )
+        if self.cascade_enabled:
+            version += (
+                f"/cascade-{self.cascade_low}-{self.cascade_high}"
+                f"/rules-{rule_based_detector.rule_pack_version}"
+            )
+        return version
+
+    def _cascade_screen(self, text: str, source: str) -> Optional[HoaxPrediction]:
+        """
+        Pre-screen murah dengan rule-based scores.
+
+        Returns:
+            HoaxPrediction jika rule-based sudah yakin, None jika teks harus
+            diteruskan ke model
+        """
+        rules = rule_based_detector.rules
+        scores = rule_based_detector.analyze_text(text, source, rules)
+        hoax_probability = rule_based_detector.hoax_probability(scores, rules)
+
+        if hoax_probability >= self.cascade_high:
+            decision = "rules_hoax"
+        elif hoax_probability < self.cascade_low and rule_based_detector.is_trusted_source(source, rules):
+            # A low score only means "no red flags found"; trust it for known
+            # media, but user-submitted text still goes to the model
+            decision = "rules_non_hoax"
+        else:
+            decision = "model"
+
+        with self._cascade_lock:
+            self.cascade_counts[decision] += 1
+
+        if decision == "model":
+            return None
+        return rule_based_detector.predict_from_scores(scores, rules)
+
+    def get_cascade_stats(self) -> dict:
+        with self._cascade_lock:
+            counts = dict(self.cascade_counts)
+
+        total = sum(counts.values())
+        skipped = counts["rules_hoax"] + counts["rules_non_hoax"]
+        return {
+            "enabled": self.cascade_enabled,
+            "band": [self.cascade_low, self.cascade_high],
+            "screened": total,
+            **counts,
+            "skip_ratio": round(skipped / total, 4) if total else 0.0,
+        }
+
+    def _cache_get(self, text: str, source: str, version: Optional[str]) -> Optional[HoaxPrediction]:
+        if version is None or not self.cache.enabled:
+            return None
+        return self.cache.get(self.cache.make_key(text, source, version), version)
+
+    def _cache_put(
+        self,
+        texts: List[str],
+        sources: List[str],
+        predictions: List[HoaxPrediction],
+        version: Optional[str]
+    ):
+        # `version` is captured before computing; if a model swap happened in
+        # between, these predictions may come from either model, so skip them
+        if version is None or not self.cache.enabled or version != self.get_model_version():
+            return
+        for text, source, prediction in zip(texts, sources, predictions):
+            self.cache.put(self.cache.make_key(text, source, version), version, prediction)
+
+    def predict(self, text: str, source: str = "") -> HoaxPrediction:
+        """
+        Predict hoax dengan fallback ke rule-based detector
+
+        Args:
+            text: Konten berita
+            source: Sumber berita (URL atau nama media)
+        """
+        # Repeat checks of the same text are answered from the cache
+        version = self.get_model_version()
+        cached = self._cache_get(text, source, version)
+        if cached is not None:
+            return cached
+
+        # Try ML model first
+        if self._use_ml_model():
+            if self.cascade_enabled:
+                prediction = self._cascade_screen(text, source)
+                if prediction is not None:
+                    self._cache_put([text], [source], [prediction], version)
+                    return prediction
+
+            try:
+                # Requests arriving within the batching window share one forward pass
+                probabilities = self.batcher.process(text)
+                prediction = self._to_prediction(probabilities)
+                self._cache_put([text], [source], [prediction], version)
+                return prediction
+            except ValueError as e:
+                print(f"Warning: {e}. Falling back to rule-based.")
+            except Exception as e:
+                print(f"Error during ML prediction: {e}. Falling back to rule-based.")
 
         # Use rule-based detector (default)
         print("Using rule-based hoax detection")
-        return rule_based_detector.predict(text, source)
+        prediction = rule_based_detector.predict(text, source)
+
+        # Fallback results are not cached under the ML model version
+        if not self._use_ml_model():
+            self._cache_put([text], [source], [prediction], version)
+        return prediction
+
+    def predict_batch(self, texts: List[str], sources: Optional[List[str]] = None) -> List[HoaxPrediction]:
+        """
+        Predict banyak teks sekaligus. Teks diurutkan berdasarkan panjang lalu
+        dibagi menjadi mini-batch, sehingga padding di tiap batch minimal.
+
+        Args:
+            texts: List konten berita
+            sources: List sumber berita (opsional, sejajar dengan texts)
+
+        Returns:
+            List HoaxPrediction dengan urutan sama seperti input
+        """
+        if not texts:
+            return []
+        if sources is None:
+            sources = [""] * len(texts)
+        if len(sources) != len(texts):
+            raise ValueError("texts and sources must have the same length")
+
+        version = self.get_model_version()
+        results: List[Optional[HoaxPrediction]] = [
+            self._cache_get(text, source, version) for text, source in zip(texts, sources)
+        ]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        computed = self._predict_batch_uncached(
+            [texts[i] for i in missing],
+            [sources[i] for i in missing],
+            version
+        )
+        for i, prediction in zip(missing, computed):
+            results[i] = prediction
+
+        return results
+
+    def _predict_batch_uncached(
+        self,
+        texts: List[str],
+        sources: List[str],
+        version: Optional[str]
+    ) -> List[HoaxPrediction]:
+        if self._use_ml_model():
+            results: List[Optional[HoaxPrediction]] = [None] * len(texts)
+            if self.cascade_enabled:
+                results = [self._cascade_screen(text, source) for text, source in zip(texts, sources)]
+
+            try:
+                # Length-sorted mini-batches keep padding waste low
+                pending = [i for i, result in enumerate(results) if result is None]
+                order = sorted(pending, key=lambda i: len(texts[i]))
+
+                for start in range(0, len(order), self.batch_size):
+                    indices = order[start:start + self.batch_size]
+                    probabilities = self._predict_probabilities([texts[i] for i in indices])
+                    for i, probs in zip(indices, probabilities):
+                        results[i] = self._to_prediction(probs)
+
+                self._cache_put(texts, sources, results, version)
+                return results
+            except ValueError as e:
+                print(f"Warning: {e}. Falling back to rule-based.")
+            except Exception as e:
+                print(f"Error during ML batch prediction: {e}. Falling back to rule-based.")
+
+        print(f"Using rule-based hoax detection for {len(texts)} texts")
+        results = rule_based_detector.predict_batch(texts, sources)
+
+        if not self._use_ml_model():
+            self._cache_put(texts, sources, results, version)
+        return results
 
 # Global instance
 hoax_detector = HoaxDetector()
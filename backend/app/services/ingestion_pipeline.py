@@ -0,0 +1,305 @@
+"""
+Ingestion Pipeline - Staged streaming RSS ingestion
+
+    feeds -> [fetch] -> queue -> [extract] -> queue -> [classify] -> queue -> [persist]
+
+Each stage has its own worker pool and the stages are connected by bounded
+queues, so articles flow through as soon as they are ready:
+
+- fetch:    download + parse feeds, drop known entries (I/O workers)
+- extract:  download article pages and pull out the text (I/O workers)
+- classify: gather articles into batches for predict_batch (CPU)
+- persist:  save classified articles in batches
+
+A full queue blocks the stage in front of it (backpressure), so a slow
+classifier or database never lets downloaded pages pile up in memory, and
+a slow site only occupies one extract worker instead of stalling the run.
+Per-stage throughput and latency of the last run are kept for /api/stats.
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.services.feed_ingestor import FeedIngestor, feed_ingestor
+
+# Tells a worker that its input stage has finished
+_DONE = object()
+
+
+class StageMetrics:
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.batches = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_batch_seconds = 0.0
+        self.queue_peak = 0
+        self.first_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+
+    def record(self, started: float, items: int, error: bool = False):
+        finished = time.perf_counter()
+        elapsed = finished - started
+        self.items += items
+        self.batches += 1
+        self.errors += int(error)
+        self.busy_seconds += elapsed
+        self.max_batch_seconds = max(self.max_batch_seconds, elapsed)
+        if self.first_started is None or started < self.first_started:
+            self.first_started = started
+        self.last_finished = finished if self.last_finished is None else max(self.last_finished, finished)
+
+    def observe_queue(self, queue: asyncio.Queue):
+        self.queue_peak = max(self.queue_peak, queue.qsize())
+
+    def describe(self) -> Dict:
+        active = (
+            self.last_finished - self.first_started
+            if self.first_started is not None and self.last_finished is not None else 0.0
+        )
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "batches": self.batches,
+            "errors": self.errors,
+            "active_seconds": round(active, 3),
+            "items_per_second": round(self.items / active, 2) if active > 0 else None,
+            "avg_batch_seconds": round(self.busy_seconds / self.batches, 4) if self.batches else None,
+            "max_batch_seconds": round(self.max_batch_seconds, 4),
+            # Fraction of the stage's worker time spent working (vs. waiting for input)
+            "utilization": round(self.busy_seconds / (active * self.workers), 3) if active > 0 else None,
+            "input_queue_peak": self.queue_peak,
+        }
+
+
+class IngestionPipeline:
+    def __init__(self, ingestor: Optional[FeedIngestor] = None):
+        self.ingestor = ingestor or feed_ingestor
+        self.feed_workers = max(1, int(os.getenv("PIPELINE_FEED_WORKERS", "8")))
+        self.extract_workers = max(1, int(os.getenv("PIPELINE_EXTRACT_WORKERS", "32")))
+        self.classify_batch_size = max(1, int(os.getenv("PIPELINE_CLASSIFY_BATCH", "32")))
+        self.classify_wait = float(os.getenv("PIPELINE_CLASSIFY_WAIT", "0.5"))
+        self.persist_batch_size = max(1, int(os.getenv("PIPELINE_PERSIST_BATCH", "50")))
+        self.persist_wait = float(os.getenv("PIPELINE_PERSIST_WAIT", "1.0"))
+        self.queue_size = max(1, int(os.getenv("PIPELINE_QUEUE_SIZE", "256")))
+        self.last_run: Optional[Dict] = None
+
+    def run(
+        self,
+        feed_urls: List[str],
+        filter_new: Callable[[List[Dict]], List[Dict]],
+        classify: Callable[[List[str], List[str]], List],
+        persist: Callable[[List[Tuple[Dict, str, object]]], int],
+    ) -> Dict:
+        """
+        Jalankan satu run ingestion untuk semua feed.
+        Dipanggil dari konteks sync (thread run_io atau scheduler).
+
+        Args:
+            feed_urls: URL feed RSS
+            filter_new: Artikel -> artikel yang belum ada di database (blocking)
+            classify: (texts, sources) -> prediksi, mis. hoax_detector.predict_batch (blocking)
+            persist: List (article, content, prediction) -> jumlah tersimpan (blocking)
+
+        Returns:
+            Dict berisi processed, skipped, total, not_modified, errors,
+            feeds (status per feed), stages (metrics per stage), elapsed_seconds
+        """
+        return asyncio.run(self._run(feed_urls, filter_new, classify, persist))
+
+    async def _run(self, feed_urls, filter_new, classify, persist) -> Dict:
+        started = time.perf_counter()
+        metrics = {
+            "fetch": StageMetrics("fetch", self.feed_workers),
+            "extract": StageMetrics("extract", self.extract_workers),
+            "classify": StageMetrics("classify", 1),
+            "persist": StageMetrics("persist", 1),
+        }
+
+        feed_queue: asyncio.Queue = asyncio.Queue()
+        for feed_url in feed_urls:
+            feed_queue.put_nowait(feed_url)
+        extract_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        classify_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        persist_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        feeds: Dict[str, Dict] = {}
+        state_updates: Dict[str, Dict] = {}
+        seen_links = set()
+        totals = {"processed": 0, "item_latency_total": 0.0, "item_latency_max": 0.0}
+
+        async with self.ingestor.create_client() as client:
+            limiter = self.ingestor.create_limiter()
+
+            async def fetch_worker():
+                while not feed_queue.empty():
+                    feed_url = feed_queue.get_nowait()
+                    stage_started = time.perf_counter()
+                    articles, stats, state_update = await self.ingestor.fetch_feed(
+                        client, limiter, feed_url, filter_new, seen_links
+                    )
+                    metrics["fetch"].record(stage_started, 1, error=stats["error"] is not None)
+                    feeds[feed_url] = stats
+                    if state_update is not None:
+                        state_updates[feed_url] = state_update
+
+                    for article in articles:
+                        # Blocks while extraction is behind (backpressure)
+                        await extract_queue.put((article, time.perf_counter()))
+                        metrics["extract"].observe_queue(extract_queue)
+
+            async def extract_worker():
+                while True:
+                    item = await extract_queue.get()
+                    if item is _DONE:
+                        return
+                    article, enqueued_at = item
+                    stage_started = time.perf_counter()
+                    content = await self.ingestor.extract(client, limiter, article["link"])
+                    metrics["extract"].record(stage_started, 1, error=not content)
+
+                    await classify_queue.put((article, content or article.get("summary", ""), enqueued_at))
+                    metrics["classify"].observe_queue(classify_queue)
+
+            async def classify_worker():
+                done = False
+                while not done:
+                    batch, done = await self._collect(
+                        classify_queue, self.classify_batch_size, self.classify_wait
+                    )
+                    if not batch:
+                        continue
+
+                    stage_started = time.perf_counter()
+                    try:
+                        predictions = await asyncio.to_thread(
+                            classify,
+                            [content for _, content, _ in batch],
+                            [article["link"] for article, _, _ in batch],
+                        )
+                    except Exception as e:
+                        print(f"Error classifying batch of {len(batch)} articles: {e}")
+                        metrics["classify"].record(stage_started, 0, error=True)
+                        continue
+                    metrics["classify"].record(stage_started, len(batch))
+
+                    for (article, content, enqueued_at), prediction in zip(batch, predictions):
+                        await persist_queue.put((article, content, prediction, enqueued_at))
+                        metrics["persist"].observe_queue(persist_queue)
+
+            async def persist_worker():
+                done = False
+                while not done:
+                    batch, done = await self._collect(
+                        persist_queue, self.persist_batch_size, self.persist_wait
+                    )
+                    if not batch:
+                        continue
+
+                    stage_started = time.perf_counter()
+                    try:
+                        saved = await asyncio.to_thread(
+                            persist, [(article, content, prediction) for article, content, prediction, _ in batch]
+                        )
+                    except Exception as e:
+                        print(f"Error saving batch of {len(batch)} articles: {e}")
+                        metrics["persist"].record(stage_started, 0, error=True)
+                        continue
+                    # Items the writer could not save stay unseen in the feed state
+                    metrics["persist"].record(stage_started, saved, error=saved < len(batch))
+
+                    finished = time.perf_counter()
+                    totals["processed"] += saved
+                    for *_, enqueued_at in batch:
+                        latency = finished - enqueued_at
+                        totals["item_latency_total"] += latency
+                        totals["item_latency_max"] = max(totals["item_latency_max"], latency)
+
+            fetch_tasks = [asyncio.create_task(fetch_worker()) for _ in range(self.feed_workers)]
+            extract_tasks = [asyncio.create_task(extract_worker()) for _ in range(self.extract_workers)]
+            classify_task = asyncio.create_task(classify_worker())
+            persist_task = asyncio.create_task(persist_worker())
+
+            # Shut the stages down in order once their input is exhausted
+            await asyncio.gather(*fetch_tasks)
+            for _ in extract_tasks:
+                await extract_queue.put(_DONE)
+            await asyncio.gather(*extract_tasks)
+            await classify_queue.put(_DONE)
+            await classify_task
+            await persist_queue.put(_DONE)
+            await persist_task
+
+        errors = metrics["classify"].errors + metrics["persist"].errors
+        if errors:
+            # Keep the old feed state: the next run retries these entries
+            print(f"Ingestion finished with {errors} failed batches; feed state not updated")
+        else:
+            self.ingestor.commit_state(state_updates)
+
+        elapsed = round(time.perf_counter() - started, 3)
+        processed = totals["processed"]
+        result = {
+            "processed": processed,
+            "skipped": sum(stats["skipped"] for stats in feeds.values()),
+            "total": sum(stats["entries"] for stats in feeds.values()),
+            "not_modified": sum(stats["not_modified"] for stats in feeds.values()),
+            "errors": errors,
+            "feeds": feeds,
+            "stages": {name: stage.describe() for name, stage in metrics.items()},
+            "item_latency": {
+                "avg_seconds": round(totals["item_latency_total"] / processed, 3) if processed else None,
+                "max_seconds": round(totals["item_latency_max"], 3),
+            },
+            "elapsed_seconds": elapsed,
+        }
+        print(f"Ingested {processed} new articles from {len(feed_urls)} feeds in {elapsed}s")
+
+        self.last_run = {"finished_at": time.time(), **result}
+        return result
+
+    async def _collect(self, queue: asyncio.Queue, max_items: int, max_wait: float):
+        """
+        Ambil sampai max_items item dari queue: tunggu item pertama, lalu
+        paling lama max_wait detik untuk mengisi batch.
+
+        Returns:
+            (batch, done) - done=True jika stage sebelumnya sudah selesai
+        """
+        first = await queue.get()
+        if first is _DONE:
+            return [], True
+
+        batch = [first]
+        deadline = time.perf_counter() + max_wait
+        while len(batch) < max_items:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = queue.get_nowait() if remaining <= 0 else await asyncio.wait_for(queue.get(), remaining)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def get_stats(self) -> Dict:
+        return {
+            "workers": {
+                "fetch": self.feed_workers,
+                "extract": self.extract_workers,
+            },
+            "classify_batch_size": self.classify_batch_size,
+            "persist_batch_size": self.persist_batch_size,
+            "queue_size": self.queue_size,
+            "http": self.ingestor.get_stats(),
+            "last_run": self.last_run,
+        }
+
+
+# Global instance
+ingestion_pipeline = IngestionPipeline()
@@ -0,0 +1,266 @@
+"""
+Model Quantizer - Dynamic INT8 quantization with an accuracy gate
+
+Linear layers of the fine-tuned model are quantized to int8 (weights) with
+PyTorch dynamic quantization and saved as a separate artifact next to the
+fp32 model. The artifact is only marked servable when its F1 on a held-out
+labeled set does not drop more than `max_f1_drop` below the fp32 model.
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+QUANTIZED_DIRNAME = "quantized_int8"
+QUANTIZED_WEIGHTS = "pytorch_model_int8.bin"
+QUANTIZATION_METADATA = "quantization_metadata.json"
+
+
+def default_quantized_path(model_dir: str) -> str:
+    return os.path.join(model_dir, QUANTIZED_DIRNAME)
+
+
+def quantize_model(model):
+    """Apply dynamic int8 quantization to all nn.Linear layers"""
+    import torch
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_quantized_model(quantized_dir: str, require_servable: bool = True):
+    """
+    Load model int8 yang sudah disimpan oleh ModelQuantizer
+
+    Raises:
+        ValueError: Jika artifact belum lolos accuracy gate (require_servable=True)
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+
+    metadata = read_quantization_metadata(quantized_dir)
+    if require_servable and not metadata.get("servable"):
+        raise ValueError(f"Quantized model at {quantized_dir} did not pass the accuracy gate")
+
+    config = AutoConfig.from_pretrained(quantized_dir)
+    model = AutoModelForSequenceClassification.from_config(config)
+    model.eval()
+    model = quantize_model(model)
+    state_dict = torch.load(os.path.join(quantized_dir, QUANTIZED_WEIGHTS), map_location="cpu")
+    model.load_state_dict(state_dict)
+    model.eval()
+    return model
+
+
+def read_quantization_metadata(quantized_dir: str) -> Dict:
+    path = os.path.join(quantized_dir, QUANTIZATION_METADATA)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_eval_dataset(dataset_path: str, split: str = "validation") -> pd.DataFrame:
+    """
+    Load labeled evaluation data
+
+    Accepts either a training CSV (text, label) or the raw Data_latih.csv
+    format (judul, narasi, label).
+
+    Args:
+        dataset_path: Path ke CSV
+        split: "validation" = 10% split yang sama dengan IncrementalTrainer,
+               "full" = seluruh dataset (untuk file yang memang held-out)
+    """
+    from sklearn.model_selection import train_test_split
+
+    df = pd.read_csv(dataset_path)
+
+    if "label" not in df.columns:
+        raise ValueError(f"{dataset_path} has no 'label' column; it cannot be used to gate quantization")
+
+    if "text" not in df.columns:
+        if "judul" in df.columns and "narasi" in df.columns:
+            df["text"] = df["judul"].fillna("").astype(str) + " " + df["narasi"].fillna("").astype(str)
+        else:
+            raise ValueError(f"{dataset_path} needs a 'text' column or 'judul'/'narasi' columns")
+
+    df = df.dropna(subset=["text", "label"])
+    df = df[df["text"].str.strip() != ""]
+    df["label"] = df["label"].astype(int)
+
+    if split == "validation":
+        _, df = train_test_split(
+            df,
+            test_size=0.1,
+            random_state=42,
+            stratify=df["label"] if len(df) > 10 else None
+        )
+
+    return df
+
+
+class ModelQuantizer:
+    def __init__(
+        self,
+        model_path: str,
+        output_path: Optional[str] = None,
+        max_f1_drop: float = 0.01,
+        batch_size: int = 16,
+    ):
+        """
+        Args:
+            model_path: Folder model fp32 (hasil train_model.py / IncrementalTrainer)
+            output_path: Folder artifact int8 (default: <model_path>/quantized_int8)
+            max_f1_drop: Penurunan F1 maksimum (absolut) agar artifact servable
+            batch_size: Batch size saat evaluasi
+        """
+        self.model_path = model_path
+        self.output_path = output_path or default_quantized_path(model_path)
+        self.max_f1_drop = max_f1_drop
+        self.batch_size = batch_size
+
+    def _evaluate(self, model, tokenizer, df: pd.DataFrame) -> Tuple[float, float, float]:
+        """Returns (f1, accuracy, ms_per_sample)"""
+        import torch
+        from sklearn.metrics import accuracy_score, f1_score
+
+        texts = df["text"].tolist()
+        predictions = []
+
+        with torch.no_grad():
+            # Warm-up pass so the first-call overhead is not counted as latency
+            model(**tokenizer(texts[:1], return_tensors="pt", truncation=True, max_length=512))
+
+            start = time.perf_counter()
+            for i in range(0, len(texts), self.batch_size):
+                inputs = tokenizer(
+                    texts[i:i + self.batch_size],
+                    return_tensors="pt",
+                    truncation=True,
+                    max_length=512,
+                    padding=True
+                )
+                logits = model(**inputs).logits
+                predictions.extend(torch.argmax(logits, dim=-1).tolist())
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        labels = df["label"].tolist()
+
+        return (
+            float(f1_score(labels, predictions, average="binary", zero_division=0)),
+            float(accuracy_score(labels, predictions)),
+            elapsed_ms / max(len(texts), 1),
+        )
+
+    @staticmethod
+    def _state_dict_size_mb(model, path: str) -> float:
+        import torch
+
+        torch.save(model.state_dict(), path)
+        return os.path.getsize(path) / (1024 * 1024)
+
+    def run(self, eval_dataset: str, split: str = "validation") -> Dict:
+        """
+        Quantize, evaluasi, dan simpan artifact int8
+
+        Returns:
+            Dict metadata (servable, f1_fp32, f1_int8, f1_drop, size, latency)
+        """
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        print(f"Quantizing model: {self.model_path}")
+        tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
+        model.to("cpu")
+        model.eval()
+
+        quantized = quantize_model(model)
+
+        df = load_eval_dataset(eval_dataset, split=split)
+        print(f"Evaluating on {len(df)} samples from {eval_dataset} ({split})")
+
+        f1_fp32, acc_fp32, ms_fp32 = self._evaluate(model, tokenizer, df)
+        f1_int8, acc_int8, ms_int8 = self._evaluate(quantized, tokenizer, df)
+        f1_drop = f1_fp32 - f1_int8
+        servable = f1_drop <= self.max_f1_drop
+
+        # Write to a temp dir first so a half-written artifact is never picked up
+        tmp_path = f"{self.output_path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        size_int8 = self._state_dict_size_mb(quantized, os.path.join(tmp_path, QUANTIZED_WEIGHTS))
+        fp32_tmp = os.path.join(tmp_path, "fp32_size_probe.bin")
+        size_fp32 = self._state_dict_size_mb(model, fp32_tmp)
+        os.remove(fp32_tmp)
+
+        model.config.save_pretrained(tmp_path)
+        tokenizer.save_pretrained(tmp_path)
+
+        metadata = {
+            "created_at": datetime.now().isoformat(),
+            "source_model": self.model_path,
+            "dtype": "qint8",
+            "eval_dataset": eval_dataset,
+            "eval_split": split,
+            "eval_samples": len(df),
+            "f1_fp32": round(f1_fp32, 4),
+            "f1_int8": round(f1_int8, 4),
+            "accuracy_fp32": round(acc_fp32, 4),
+            "accuracy_int8": round(acc_int8, 4),
+            "f1_drop": round(f1_drop, 4),
+            "max_f1_drop": self.max_f1_drop,
+            "ms_per_sample_fp32": round(ms_fp32, 2),
+            "ms_per_sample_int8": round(ms_int8, 2),
+            "size_mb_fp32": round(size_fp32, 1),
+            "size_mb_int8": round(size_int8, 1),
+            "servable": servable,
+        }
+        with open(os.path.join(tmp_path, QUANTIZATION_METADATA), "w") as f:
+            json.dump(metadata, f, indent=2)
+
+        shutil.rmtree(self.output_path, ignore_errors=True)
+        os.replace(tmp_path, self.output_path)
+
+        print(f"F1 fp32={f1_fp32:.4f} int8={f1_int8:.4f} (drop {f1_drop:.4f}, max {self.max_f1_drop})")
+        print(f"Size fp32={size_fp32:.1f}MB int8={size_int8:.1f}MB")
+        print(f"Latency fp32={ms_fp32:.1f}ms int8={ms_int8:.1f}ms per sample")
+        if servable:
+            print(f"Quantized model is SERVABLE: {self.output_path}")
+        else:
+            print(f"Quantized model REJECTED by accuracy gate: {self.output_path}")
+
+        return metadata
+
+
+# Standalone execution
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dynamic INT8 quantization with accuracy gate")
+    parser.add_argument("--model", default=os.getenv("MODEL_PATH", "./hoax_model"), help="fp32 model path")
+    parser.add_argument("--output", default=None, help="Output dir (default: <model>/quantized_int8)")
+    parser.add_argument("--eval-dataset", default="../Data_latih.csv", help="Labeled CSV for the accuracy gate")
+    parser.add_argument(
+        "--split",
+        choices=["validation", "full"],
+        default="validation",
+        help="'validation' = 10%% held-out split, 'full' = whole file (already held-out)"
+    )
+    parser.add_argument(
+        "--max-f1-drop",
+        type=float,
+        default=float(os.getenv("QUANTIZATION_MAX_F1_DROP", "0.01")),
+        help="Maximum allowed F1 drop versus fp32"
+    )
+
+    args = parser.parse_args()
+
+    quantizer = ModelQuantizer(args.model, args.output, max_f1_drop=args.max_f1_drop)
+    result = quantizer.run(args.eval_dataset, split=args.split)
+    print(f"\nResult: {result}")
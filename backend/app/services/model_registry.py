@@ -0,0 +1,189 @@
+"""
+Model Registry - Versioned model directories with an atomic "current" pointer
+
+Layout:
+    <MODEL_REGISTRY_PATH>/
+        versions/
+            v20250101_120000/     # one complete model per version
+            .staging-v2025.../    # being written, never served
+        CURRENT                   # name of the version being served
+
+A new version is written into a staging directory, renamed into versions/
+once complete, and only then published by atomically replacing CURRENT.
+Readers therefore never see a half-written model.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+STAGING_PREFIX = ".staging-"
+
+
+class ModelRegistry:
+    def __init__(self, root: Optional[str] = None, keep_versions: Optional[int] = None):
+        """
+        Args:
+            root: Folder registry (default: MODEL_REGISTRY_PATH atau ./model_registry)
+            keep_versions: Jumlah versi yang disimpan (versi lama dihapus, current tidak pernah)
+        """
+        self.root = root or os.getenv("MODEL_REGISTRY_PATH", "./model_registry")
+        self.keep_versions = keep_versions or int(os.getenv("MODEL_REGISTRY_KEEP", "5"))
+        self.versions_dir = os.path.join(self.root, "versions")
+        self.pointer_path = os.path.join(self.root, "CURRENT")
+        self._lock = threading.Lock()
+
+    def version_path(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def list_versions(self) -> List[str]:
+        """Semua versi yang sudah lengkap, urut dari yang terlama"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if not name.startswith(".") and os.path.isdir(self.version_path(name))
+        )
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(self.pointer_path) as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+
+        if version and os.path.isdir(self.version_path(version)):
+            return version
+        return None
+
+    def current_path(self) -> Optional[str]:
+        version = self.current_version()
+        return self.version_path(version) if version else None
+
+    def describe_versions(self) -> List[Dict]:
+        current = self.current_version()
+        versions = []
+
+        for version in self.list_versions():
+            metadata = {}
+            metadata_path = os.path.join(self.version_path(version), "training_metadata.json")
+            if os.path.exists(metadata_path):
+                with open(metadata_path) as f:
+                    metadata = json.load(f)
+
+            versions.append({
+                "version": version,
+                "current": version == current,
+                "trained_at": metadata.get("trained_at"),
+                "samples_used": metadata.get("samples_used"),
+                "eval_accuracy": metadata.get("eval_accuracy"),
+                "eval_f1": metadata.get("eval_f1"),
+            })
+
+        return versions
+
+    def create_staging(self) -> Tuple[str, str]:
+        """
+        Siapkan folder staging untuk versi baru
+
+        Returns:
+            (version, staging_path)
+        """
+        os.makedirs(self.versions_dir, exist_ok=True)
+        version = datetime.now().strftime("v%Y%m%d_%H%M%S")
+
+        # Two runs within the same second get distinct names
+        suffix = 1
+        base = version
+        while os.path.exists(self.version_path(version)) or os.path.exists(self._staging_path(version)):
+            version = f"{base}_{suffix}"
+            suffix += 1
+
+        staging_path = self._staging_path(version)
+        os.makedirs(staging_path)
+        return version, staging_path
+
+    def _staging_path(self, version: str) -> str:
+        return os.path.join(self.versions_dir, f"{STAGING_PREFIX}{version}")
+
+    def discard_staging(self, version: str):
+        shutil.rmtree(self._staging_path(version), ignore_errors=True)
+
+    def publish(self, version: str) -> str:
+        """Pindahkan staging ke versions/<version> lalu jadikan current"""
+        staging_path = self._staging_path(version)
+        if not os.path.isdir(staging_path):
+            raise FileNotFoundError(f"No staged model for version {version}")
+
+        os.replace(staging_path, self.version_path(version))
+        self.promote(version)
+        self._prune()
+        return self.version_path(version)
+
+    def promote(self, version: str):
+        """Atomically point CURRENT at an existing version"""
+        if not os.path.isdir(self.version_path(version)):
+            raise ValueError(f"Unknown model version: {version}")
+
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".CURRENT-")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(version)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.pointer_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        print(f"Model registry: current version is now {version}")
+
+    def rollback(self, version: Optional[str] = None) -> str:
+        """
+        Kembali ke versi tertentu, atau ke versi sebelum current jika tidak diberikan
+
+        Returns:
+            Versi yang sekarang menjadi current
+        """
+        if version is None:
+            versions = self.list_versions()
+            current = self.current_version()
+            if current not in versions or versions.index(current) == 0:
+                raise ValueError("No previous model version to roll back to")
+            version = versions[versions.index(current) - 1]
+
+        self.promote(version)
+        return version
+
+    def import_model(self, model_path: str) -> str:
+        """
+        Copy model yang sudah ada (mis. MODEL_PATH lama) sebagai versi baru,
+        tanpa menjadikannya current (model yang sama sudah di-serve)
+        """
+        version, staging_path = self.create_staging()
+        shutil.rmtree(staging_path)
+        shutil.copytree(model_path, staging_path, ignore=shutil.ignore_patterns("checkpoints", "logs"))
+        os.replace(staging_path, self.version_path(version))
+        print(f"Model registry: imported {model_path} as version {version}")
+        return version
+
+    def _prune(self):
+        versions = self.list_versions()
+        current = self.current_version()
+        removable = [v for v in versions if v != current]
+
+        while len(removable) + 1 > self.keep_versions and removable:
+            old = removable.pop(0)
+            shutil.rmtree(self.version_path(old), ignore_errors=True)
+            print(f"Model registry: removed old version {old}")
+
+
+# Global instance
+model_registry = ModelRegistry()
@@ -0,0 +1,234 @@
+"""
+News Filter - Local Bloom filter of news IDs already in the database
+
+News IDs are md5(link), so whether an RSS entry is new can be answered
+from its link alone. The filter holds every saved news ID:
+
+- "not in filter" is certain (a Bloom filter has no false negatives): the
+  entry is new and no database read is needed
+- "maybe in filter" is wrong at most NEWS_FILTER_ERROR_RATE of the time;
+  these IDs are confirmed with one batched multi-get per feed, unless
+  NEWS_FILTER_VERIFY=false, in which case they are skipped as known
+  without any read (and that fraction of new articles is lost)
+
+The filter is kept in NEWS_FILTER_PATH and only ever gains IDs, so
+processes sharing the file merge by OR-ing their bits. It is rebuilt from
+the database (document IDs only) when the file is missing, or once more
+than NEWS_FILTER_CAPACITY IDs were added and the error rate degrades:
+
+    python -m app.services.news_filter --stats
+    python -m app.services.news_filter --rebuild
+"""
+
+import hashlib
+import math
+import os
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from app.utils.firebase_config import get_db
+
+# magic, bit count, hash count, capacity, item count, error rate
+_HEADER = struct.Struct("<4sQIQQd")
+_MAGIC = b"NBF1"
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        # Optimal sizing for `capacity` items at `error_rate`
+        self.num_bits = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> bool:
+        """Tambahkan item; True jika item belum ada sebelumnya"""
+        added = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        self.count += int(added)
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def merge(self, other: "BloomFilter"):
+        """OR bit dari filter lain dengan ukuran yang sama"""
+        merged = int.from_bytes(self.bits, "little") | int.from_bytes(other.bits, "little")
+        self.bits = bytearray(merged.to_bytes(len(self.bits), "little"))
+        self.count = max(self.count, other.count)
+
+    def same_shape(self, other: "BloomFilter") -> bool:
+        return self.num_bits == other.num_bits and self.num_hashes == other.num_hashes
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.capacity, self.count, self.error_rate)
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        magic, num_bits, num_hashes, capacity, count, error_rate = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a news filter file")
+
+        bloom = cls(capacity, error_rate)
+        bloom.num_bits, bloom.num_hashes, bloom.count = num_bits, num_hashes, count
+        bloom.bits = bytearray(data[_HEADER.size:])
+        if len(bloom.bits) != (num_bits + 7) // 8:
+            raise ValueError("Truncated news filter file")
+        return bloom
+
+
+class NewsFilter:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        collection_name: str = "news",
+    ):
+        """
+        Args:
+            path: File tempat filter disimpan
+            capacity: Jumlah ID yang direncanakan sebelum filter dibangun ulang
+            error_rate: Peluang false positive pada kapasitas penuh
+        """
+        self.path = path or os.getenv("NEWS_FILTER_PATH", "./news_filter.bin")
+        self.capacity = capacity or int(os.getenv("NEWS_FILTER_CAPACITY", "1000000"))
+        self.error_rate = error_rate or float(os.getenv("NEWS_FILTER_ERROR_RATE", "0.001"))
+        self.verify = os.getenv("NEWS_FILTER_VERIFY", "true").lower() == "true"
+        self.collection_name = collection_name
+
+        self._lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        self._loaded_mtime: Optional[float] = None
+        self.lookups = 0
+        self.negatives = 0
+
+    def _ensure_loaded(self) -> BloomFilter:
+        """Muat filter dari file, atau bangun dari database (dipanggil dengan lock)"""
+        if self._bloom is None:
+            try:
+                with open(self.path, "rb") as f:
+                    self._bloom = BloomFilter.from_bytes(f.read())
+                self._loaded_mtime = os.path.getmtime(self.path)
+            except FileNotFoundError:
+                self._rebuild(self.capacity)
+            except Exception as e:
+                print(f"Error loading news filter {self.path}: {e}; rebuilding")
+                self._rebuild(self.capacity)
+
+        if self._bloom.count > self._bloom.capacity:
+            # Over capacity the false positive rate climbs quickly
+            self._rebuild(max(self.capacity, self._bloom.count * 2))
+        return self._bloom
+
+    def _rebuild(self, capacity: int):
+        print(f"Rebuilding news filter (capacity {capacity})...")
+        bloom = BloomFilter(capacity, self.error_rate)
+        # Empty projection: document IDs only, no article bodies
+        for doc in get_db().collection(self.collection_name).select([]).stream():
+            bloom.add(doc.id)
+        self._bloom = bloom
+        # The rebuilt filter replaces the file instead of merging with it
+        self._loaded_mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        self._save()
+        print(f"News filter rebuilt with {bloom.count} IDs")
+
+    def _save(self, new_ids: Iterable[str] = ()):
+        """Tulis filter secara atomik, digabung dengan perubahan proses lain (dipanggil dengan lock)"""
+        try:
+            if os.path.exists(self.path) and os.path.getmtime(self.path) != self._loaded_mtime:
+                with open(self.path, "rb") as f:
+                    on_disk = BloomFilter.from_bytes(f.read())
+                if on_disk.same_shape(self._bloom):
+                    self._bloom.merge(on_disk)
+                else:
+                    # Another process rebuilt the filter: adopt it and re-add our IDs
+                    for news_id in new_ids:
+                        on_disk.add(news_id)
+                    self._bloom = on_disk
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self._bloom.to_bytes())
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = os.path.getmtime(self.path)
+        except Exception as e:
+            # The in-memory filter stays valid; the next save retries
+            print(f"Error saving news filter {self.path}: {e}")
+
+    def might_contain(self, news_ids: List[str]) -> List[bool]:
+        """
+        Per ID: False = pasti belum ada di database, True = mungkin sudah ada
+        """
+        with self._lock:
+            bloom = self._ensure_loaded()
+            result = [news_id in bloom for news_id in news_ids]
+        self.lookups += len(result)
+        self.negatives += result.count(False)
+        return result
+
+    def add(self, news_ids: Iterable[str]):
+        """Catat ID yang baru tersimpan di database"""
+        with self._lock:
+            bloom = self._ensure_loaded()
+            news_ids = list(news_ids)
+            added = sum(bloom.add(news_id) for news_id in news_ids)
+            if added:
+                self._save(news_ids)
+
+    def rebuild(self):
+        with self._lock:
+            self._rebuild(max(self.capacity, (self._bloom.count * 2) if self._bloom else 0))
+
+    def get_stats(self) -> Dict:
+        stats = {
+            "path": self.path,
+            "verify": self.verify,
+            "lookups": self.lookups,
+            "skipped_reads": self.negatives,
+        }
+        if self._bloom is not None:
+            stats.update({
+                "ids": self._bloom.count,
+                "capacity": self._bloom.capacity,
+                "error_rate": self._bloom.error_rate,
+                "bytes": len(self._bloom.bits),
+            })
+        return stats
+
+
+# Global instance
+news_filter = NewsFilter()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the known-news Bloom filter")
+    parser.add_argument("--stats", action="store_true", help="Print filter statistics")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the filter from the news collection")
+
+    args = parser.parse_args()
+
+    if args.rebuild:
+        news_filter.rebuild()
+    else:
+        news_filter.might_contain([])
+    print(json.dumps(news_filter.get_stats(), indent=2))
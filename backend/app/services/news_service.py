@@ -1,10 +1,21 @@
 from app.utils.firebase_config import get_db
-from app.models import NewsItem, NewsResponse
+from app.utils.bulk_writer import BulkWriter, BulkWriteResult
+from app.utils.pagination import page_query, split_page
+from app.utils.projection import ensure_previews, stream_projected, summary_fields
+from app.models import NewsItem, NewsResponse, NewsSummary
 from app.services.hoax_detector import hoax_detector
 from app.services.rss_fetcher import rss_fetcher
+from app.services.ingestion_pipeline import ingestion_pipeline
+from app.services.news_filter import news_filter
+from app.services.stats_counters import NEWS_COUNTED_FIELDS, stats_counters
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 import hashlib
+import os
+
+EXISTS_BATCH_SIZE = int(os.getenv("NEWS_EXISTS_BATCH_SIZE", "300"))
+# Length of the content preview stored with each article (admin lists)
+NEWS_PREVIEW_CHARS = 500
 
 
 class NewsService:
@@ -14,9 +25,7 @@ class NewsService:
     def _generate_id(self, link: str) -> str:
         return hashlib.md5(link.encode()).hexdigest()
 
-    def save_news(self, news_item: NewsItem) -> str:
-        db = get_db()
-
+    def _to_document(self, news_item: NewsItem) -> dict:
         # Generate ID from link if not provided
         if not news_item.id:
             news_item.id = self._generate_id(news_item.link)
@@ -32,12 +41,91 @@ class NewsService:
         if news_dict.get("labeled_at"):
             news_dict["labeled_at"] = news_dict["labeled_at"].isoformat()
 
-        # Save to Firestore
-        db.collection(self.collection_name).document(news_item.id).set(news_dict)
-        print(f"News saved: {news_item.id}")
+        # Stored so list endpoints can skip reading the full content
+        news_dict["preview"] = news_dict["content"][:NEWS_PREVIEW_CHARS]
+
+        return news_dict
+
+    def save_news(self, news_item: NewsItem) -> str:
+        """Simpan satu berita baru; berita yang sudah ada dibiarkan"""
+        result = self.save_news_many([news_item])
+        if result.failed:
+            raise Exception(result.failed[news_item.id])
 
         return news_item.id
 
+    def save_news_many(self, news_items: List[NewsItem]) -> BulkWriteResult:
+        """
+        Simpan banyak berita sekaligus dengan batched write.
+
+        Returns:
+            BulkWriteResult; key = ID berita
+        """
+        writer = BulkWriter(get_db())
+        for news_item in news_items:
+            news_dict = self._to_document(news_item)
+            # create() never overwrites, so the counter increment is exact
+            writer.create(
+                self.collection_name, news_item.id, news_dict,
+                increments=stats_counters.news_delta(None, news_dict),
+            )
+
+        result = writer.commit()
+        self._remember(result.succeeded + result.existing)
+        print(f"News saved: {len(result.succeeded)} in {result.commits} batch commits")
+        for news_id in result.existing:
+            print(f"News already exists: {news_id}")
+        for news_id, error in result.failed.items():
+            print(f"Error saving news {news_id}: {error}")
+        return result
+
+    def update_news_many(self, updates: Dict[str, dict]) -> BulkWriteResult:
+        """
+        Update banyak berita sekaligus, dengan counter stats ikut diperbarui.
+
+        Field yang dihitung counter dibaca dulu (satu multi-get per batch);
+        update gagal jika dokumen berubah di antara baca dan tulis.
+
+        Args:
+            updates: news_id -> field yang diubah
+
+        Returns:
+            BulkWriteResult; berita yang tidak ada masuk failed
+        """
+        db = get_db()
+        writer = BulkWriter(db)
+        news_ids = list(updates)
+        missing = {}
+
+        for start in range(0, len(news_ids), writer.batch_size):
+            refs = [
+                db.collection(self.collection_name).document(news_id)
+                for news_id in news_ids[start:start + writer.batch_size]
+            ]
+            for doc in db.get_all(refs, field_paths=NEWS_COUNTED_FIELDS):
+                if not doc.exists:
+                    missing[doc.id] = "not found"
+                    continue
+
+                before = doc.to_dict()
+                after = {**before, **{k: v for k, v in updates[doc.id].items() if k in NEWS_COUNTED_FIELDS}}
+                writer.update(
+                    self.collection_name, doc.id, updates[doc.id],
+                    increments=stats_counters.news_delta(before, after),
+                    last_update_time=doc.update_time,
+                )
+
+        result = writer.commit()
+        result.failed.update(missing)
+        return result
+
+    def _remember(self, news_ids: List[str]):
+        """Catat ID yang tersimpan di news_filter agar RSS berikutnya tidak perlu cek database"""
+        try:
+            news_filter.add(news_ids)
+        except Exception as e:
+            print(f"Error updating news filter: {e}")
+
     def get_news_by_id(self, news_id: str) -> Optional[NewsResponse]:
         db = get_db()
         doc = db.collection(self.collection_name).document(news_id).get()
@@ -57,13 +145,31 @@ class NewsService:
         return None
 
     def get_all_news(self, limit: int = 50) -> List[NewsResponse]:
+        news_list, _ = self.get_news_page(limit)
+        return news_list
+
+    def get_news_page(self, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[NewsResponse], Optional[str]]:
+        """
+        Satu halaman berita terbaru.
+
+        Returns:
+            (berita, cursor halaman berikutnya atau None)
+
+        Raises:
+            InvalidCursorError: Jika cursor tidak valid
+        """
         db = get_db()
-        docs = db.collection(self.collection_name).order_by("created_at", direction="DESCENDING").limit(limit).stream()
+        query, page_size = page_query(db.collection(self.collection_name), "created_at", limit, cursor)
 
-        news_list = []
-        for doc in docs:
+        rows = []
+        for doc in query.stream():
             data = doc.to_dict()
             data["id"] = doc.id
+            rows.append(data)
+        rows, next_cursor = split_page(rows, page_size, "created_at")
+
+        news_list = []
+        for data in rows:
             # Handle missing new fields for backward compatibility
             data.setdefault("labeled_by", "system")
             data.setdefault("manual_label", None)
@@ -73,41 +179,70 @@ class NewsService:
             data.setdefault("labeled_at", None)
             news_list.append(NewsResponse(**data))
 
-        return news_list
+        return news_list, next_cursor
+
+    def list_news_summaries(self, query) -> List[NewsSummary]:
+        """Ringkasan berita hasil `query`, hanya membaca field NewsSummary"""
+        rows = stream_projected(query, summary_fields(NewsSummary))
+        rows = ensure_previews(get_db(), self.collection_name, rows, NEWS_PREVIEW_CHARS)
+        return [NewsSummary(**row) for row in rows]
 
     def check_news_exists(self, link: str) -> bool:
         news_id = self._generate_id(link)
-        db = get_db()
-        doc = db.collection(self.collection_name).document(news_id).get()
-        return doc.exists
+        return bool(self.find_existing_ids([news_id]))
 
-    def fetch_and_process_rss(self) -> dict:
-        articles = rss_fetcher.fetch_rss()
+    def find_existing_ids(self, news_ids: List[str]) -> Set[str]:
+        """
+        ID yang sudah ada di database.
 
-        if not articles:
-            return {"status": "error", "message": "No articles fetched", "processed": 0, "skipped": 0}
+        ID yang tidak ada di news_filter pasti baru dan tidak dibaca sama
+        sekali; sisanya dicek dengan satu multi-get per EXISTS_BATCH_SIZE ID.
+        """
+        try:
+            maybe_known = news_filter.might_contain(news_ids)
+        except Exception as e:
+            print(f"News filter unavailable ({e}), checking database")
+            maybe_known = [True] * len(news_ids)
 
-        processed = 0
-        skipped = 0
+        candidates = [news_id for news_id, known in zip(news_ids, maybe_known) if known]
+        if not candidates or not news_filter.verify:
+            return set(candidates)
 
-        for article in articles:
-            # Check if article already exists
-            if self.check_news_exists(article["link"]):
+        db = get_db()
+        existing = set()
+        for start in range(0, len(candidates), EXISTS_BATCH_SIZE):
+            refs = [
+                db.collection(self.collection_name).document(news_id)
+                for news_id in candidates[start:start + EXISTS_BATCH_SIZE]
+            ]
+            # Empty field mask: only existence comes back, not the article bodies
+            existing.update(doc.id for doc in db.get_all(refs, field_paths=[]) if doc.exists)
+        return existing
+
+    def filter_new_articles(self, articles: List[dict]) -> List[dict]:
+        """Artikel yang belum tersimpan di database (satu lookup batch untuk semua artikel)"""
+        news_ids = [self._generate_id(article["link"]) for article in articles]
+        existing = self.find_existing_ids(news_ids)
+
+        new_articles = []
+        for article, news_id in zip(articles, news_ids):
+            if news_id in existing:
                 print(f"Article already exists: {article['title']}")
-                skipped += 1
                 continue
+            new_articles.append(article)
+        return new_articles
 
-            # Extract full content
-            content = rss_fetcher.extract_article_content(article["link"])
-
-            if not content:
-                content = article.get("summary", "")
-
-            # Perform hoax detection with source info
-            prediction = hoax_detector.predict(content, source=article["link"])
+    def save_classified_articles(self, items: List[tuple]) -> int:
+        """
+        Simpan artikel RSS yang sudah diklasifikasi.
 
+        Args:
+            items: List (article, content, prediction)
+        """
+        news_items = []
+        for article, content, prediction in items:
             # Create news item with new fields
-            news_item = NewsItem(
+            news_items.append(NewsItem(
                 title=article["title"],
                 link=article["link"],
                 content=content,
@@ -115,6 +250,7 @@ class NewsService:
                 published_time=article.get("published"),
                 hoax_label=prediction.label,
                 confidence=prediction.confidence,
+                rule_pack_version=prediction.rule_pack_version,
                 # New fields - system auto-labeled
                 labeled_by="system",
                 manual_label=None,
@@ -122,18 +258,41 @@ class NewsService:
                 can_use_for_training=False,  # System labels NOT for training
                 trained=False,
                 labeled_at=datetime.now()
-            )
+            ))
+
+        # Save to database, one batched write for the whole pipeline batch
+        result = self.save_news_many(news_items)
+        return len(result.succeeded) + len(result.existing)
+
+    def fetch_and_process_rss(self) -> dict:
+        feed_urls = rss_fetcher.get_feed_urls()
+        if not feed_urls:
+            print("No RSS feed URL configured")
+            return {"status": "error", "message": "No articles fetched", "processed": 0, "skipped": 0}
 
-            # Save to database
-            self.save_news(news_item)
-            processed += 1
+        # Feeds flow through fetch -> extract -> classify -> persist stages concurrently
+        run = ingestion_pipeline.run(
+            feed_urls,
+            filter_new=self.filter_new_articles,
+            classify=hoax_detector.predict_batch,
+            persist=self.save_classified_articles,
+        )
+
+        if not run["total"] and not run["not_modified"]:
+            return {"status": "error", "message": "No articles fetched", "processed": 0, "skipped": 0}
+
+        processed = run["processed"]
+        skipped = run["skipped"]
 
         return {
-            "status": "success",
+            "status": "success" if not run["errors"] else "partial",
             "message": f"Processed {processed} articles, skipped {skipped} existing articles",
             "processed": processed,
             "skipped": skipped,
-            "total": len(articles)
+            "total": run["total"],
+            "feeds": len(feed_urls),
+            "not_modified": run["not_modified"],
+            "elapsed_seconds": run["elapsed_seconds"]
         }
 
     def get_news_by_label_source(
@@ -197,12 +356,6 @@ class NewsService:
             notes: Optional notes
         """
         try:
-            db = get_db()
-            news_ref = db.collection(self.collection_name).document(news_id)
-
-            if not news_ref.get().exists:
-                return False
-
             update_data = {
                 "manual_label": label,
                 "labeled_by": labeled_by,
@@ -222,37 +375,24 @@ class NewsService:
             if notes:
                 update_data["label_notes"] = notes
 
-            news_ref.update(update_data)
-            return True
+            result = self.update_news_many({news_id: update_data})
+            return news_id in result.succeeded
 
         except Exception as e:
             print(f"Error updating news label: {e}")
             return False
 
     def get_training_stats(self) -> dict:
-        """Get statistics about training data."""
-        db = get_db()
-
-        # Count by labeled_by
-        system_count = len(list(db.collection(self.collection_name)
-            .where("labeled_by", "==", "system").stream()))
-        admin_count = len(list(db.collection(self.collection_name)
-            .where("labeled_by", "==", "admin").stream()))
-
-        # Count pending training
-        pending_count = len(list(db.collection(self.collection_name)
-            .where("can_use_for_training", "==", True)
-            .where("trained", "==", False).stream()))
-
-        # Count already trained
-        trained_count = len(list(db.collection(self.collection_name)
-            .where("trained", "==", True).stream()))
+        """Get statistics about training data (from the stats counters)."""
+        counts = stats_counters.get_news_counts()
+        system_count = counts["news_labeled_by_system"]
+        admin_count = counts["news_labeled_by_admin"]
 
         return {
             "system_labeled": system_count,
             "admin_labeled": admin_count,
-            "pending_training": pending_count,
-            "already_trained": trained_count,
+            "pending_training": counts["news_pending_training"],
+            "already_trained": counts["news_trained"],
             "total": system_count + admin_count
         }
 
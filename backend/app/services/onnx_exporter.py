@@ -0,0 +1,185 @@
+"""
+ONNX Exporter - Convert the fine-tuned IndoBERT checkpoint to ONNX
+
+The exported graph is optimized offline with onnxruntime so the API can serve
+it on CPU without loading PyTorch. Every export is checked against the
+PyTorch model: logits must match within a tolerance, otherwise the export is
+rejected.
+"""
+
+import inspect
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+ONNX_FILENAME = "model.onnx"
+
+# Sample texts used for the PyTorch vs ONNX parity check
+PARITY_TEXTS = [
+    "Pemerintah mengumumkan kebijakan baru terkait subsidi energi untuk tahun depan.",
+    "WAJIB SHARE!!! Minum air hangat dengan lemon 100% terbukti ampuh sembuhkan semua penyakit!!!",
+    "Presiden meresmikan jalan tol baru",
+    "Beredar kabar bahwa vaksin mengandung chip pelacak. Menurut penelitian yang tidak disebutkan "
+    "sumbernya, chip tersebut dapat mengirim data lokasi. Fakta mengejutkan ini disembunyikan media. " * 8,
+]
+
+
+def default_onnx_path(model_dir: str) -> str:
+    return os.path.join(model_dir, ONNX_FILENAME)
+
+
+def export_onnx(
+    model_dir: str,
+    output_path: Optional[str] = None,
+    opset: int = 14,
+    optimize: bool = True,
+) -> str:
+    """
+    Export model di model_dir ke ONNX (dengan dynamic batch & sequence axes)
+
+    Args:
+        model_dir: Folder checkpoint hasil train_model.py / IncrementalTrainer
+        output_path: Path file .onnx (default: <model_dir>/model.onnx)
+        opset: ONNX opset version
+        optimize: Jalankan graph optimization onnxruntime dan simpan hasilnya
+
+    Returns:
+        Path file ONNX yang dihasilkan
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    output_path = output_path or default_onnx_path(model_dir)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+
+    print(f"Exporting {model_dir} to ONNX: {output_path}")
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    sample = tokenizer(
+        PARITY_TEXTS[:2],
+        return_tensors="pt",
+        truncation=True,
+        max_length=512,
+        padding=True
+    )
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    export_kwargs = {}
+    # Newer torch versions default to the dynamo exporter; keep the TorchScript one
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False
+
+    raw_path = f"{output_path}.raw" if optimize else output_path
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            raw_path,
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+            **export_kwargs,
+        )
+
+    if optimize:
+        import onnxruntime as ort
+
+        # Offline graph optimization: fused attention/layernorm/gelu nodes are
+        # written to disk so serving does not pay for it at startup
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        options.optimized_model_filepath = output_path
+        ort.InferenceSession(raw_path, options, providers=["CPUExecutionProvider"])
+        os.remove(raw_path)
+
+    print(f"ONNX model saved to {output_path}")
+    return output_path
+
+
+def create_session(onnx_path: str, intra_op_threads: int = 0):
+    """
+    Buat onnxruntime InferenceSession untuk CPU
+
+    Args:
+        onnx_path: Path file .onnx
+        intra_op_threads: Jumlah thread intra-op (0 = default onnxruntime)
+    """
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if intra_op_threads > 0:
+        options.intra_op_num_threads = intra_op_threads
+    return ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+
+
+def run_session(session, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+    """Jalankan session dengan input hasil tokenizer (return_tensors="np")"""
+    feed_names = {i.name for i in session.get_inputs()}
+    feed = {name: value.astype(np.int64) for name, value in encoded.items() if name in feed_names}
+    return session.run(["logits"], feed)[0]
+
+
+def verify_parity(
+    model_dir: str,
+    onnx_path: Optional[str] = None,
+    texts: Optional[List[str]] = None,
+    atol: float = 1e-3,
+) -> float:
+    """
+    Bandingkan logits ONNX dengan logits PyTorch
+
+    Returns:
+        Selisih absolut maksimum antar logits
+
+    Raises:
+        ValueError: Jika selisih melebihi atol
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    onnx_path = onnx_path or default_onnx_path(model_dir)
+    texts = texts or PARITY_TEXTS
+
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    model.eval()
+
+    encoded = tokenizer(texts, return_tensors="np", truncation=True, max_length=512, padding=True)
+
+    with torch.no_grad():
+        torch_logits = model(**{k: torch.from_numpy(v) for k, v in encoded.items()}).logits.numpy()
+
+    onnx_logits = run_session(create_session(onnx_path), encoded)
+
+    max_diff = float(np.max(np.abs(torch_logits - onnx_logits)))
+    print(f"ONNX parity check: max |logit diff| = {max_diff:.6f} (tolerance {atol})")
+
+    if max_diff > atol:
+        raise ValueError(f"ONNX logits differ from PyTorch by {max_diff:.6f} (tolerance {atol})")
+
+    return max_diff
+
+
+# Standalone execution
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export fine-tuned model to ONNX")
+    parser.add_argument("--model", default=os.getenv("MODEL_PATH", "./hoax_model"), help="Fine-tuned model path")
+    parser.add_argument("--output", default=None, help="Output .onnx path (default: <model>/model.onnx)")
+    parser.add_argument("--opset", type=int, default=14, help="ONNX opset version")
+    parser.add_argument("--no-optimize", action="store_true", help="Skip onnxruntime graph optimization")
+    parser.add_argument("--atol", type=float, default=1e-3, help="Parity tolerance for logits")
+
+    args = parser.parse_args()
+
+    path = export_onnx(args.model, args.output, opset=args.opset, optimize=not args.no_optimize)
+    verify_parity(args.model, path, atol=args.atol)
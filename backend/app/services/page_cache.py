@@ -0,0 +1,255 @@
+"""
+Page Cache - On-disk cache of downloaded article pages
+
+Every article page we download is stored once, keyed by the SHA-256 of its
+URL, in a single SQLite file:
+
+- raw HTML (zlib-compressed) and the fetch time
+- the extracted text, tagged with the extractor version that produced it
+
+Entries expire after PAGE_CACHE_TTL seconds, and the least recently used
+pages are evicted once the stored (compressed) size exceeds
+PAGE_CACHE_MAX_MB. When the extractor changes (new selectors/profiles),
+the cached text no longer matches EXTRACTOR_VERSION and is re-extracted
+from the cached HTML, without going back to the network:
+
+    python -m app.services.page_cache --stats
+    python -m app.services.page_cache --reextract
+    python -m app.services.page_cache --clear
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    html BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    text TEXT,
+    text_version TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+
+class CachedPage:
+    def __init__(self, url: str, html: bytes, fetched_at: float, text: Optional[str], text_version: Optional[str]):
+        self.url = url
+        self.html = html
+        self.fetched_at = fetched_at
+        self.text = text
+        self.text_version = text_version
+
+
+class PageCache:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            path: File SQLite cache
+            max_bytes: Batas total ukuran HTML terkompresi (0 = cache nonaktif)
+            ttl_seconds: Umur maksimum halaman sebelum di-download ulang
+        """
+        self.path = path or os.getenv("PAGE_CACHE_PATH", "./page_cache/pages.db")
+        self.max_bytes = (
+            max_bytes if max_bytes is not None
+            else int(float(os.getenv("PAGE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        )
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("PAGE_CACHE_TTL", "604800"))
+        self.enabled = self.max_bytes > 0
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._size_estimate = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Buka database saat pertama dipakai (dipanggil dengan lock)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            # WAL lets the API server, the scheduler and the scripts share the file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._size_estimate = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Halaman dari cache, None jika tidak ada atau sudah kedaluwarsa"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT html, fetched_at, text, text_version FROM pages WHERE key = ?",
+                (self._key(url),),
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, self._key(url)))
+            conn.commit()
+            self.hits += 1
+
+        return CachedPage(url, zlib.decompress(row[0]), row[1], row[2], row[3])
+
+    def put(
+        self,
+        url: str,
+        html: bytes,
+        text: Optional[str] = None,
+        text_version: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ):
+        if not self.enabled:
+            return
+
+        compressed = zlib.compress(html, 6)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(key, url, html, size, content_type, fetched_at, accessed_at, text, text_version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(url), url, compressed, len(compressed), content_type, now, now, text, text_version),
+            )
+            conn.commit()
+            self._size_estimate += len(compressed)
+
+            if self._size_estimate > self.max_bytes:
+                self._evict(conn)
+
+    def update_text(self, url: str, text: str, text_version: str):
+        """Simpan hasil ekstraksi ulang dari HTML yang sudah ada di cache"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE pages SET text = ?, text_version = ? WHERE key = ?",
+                (text, text_version, self._key(url)),
+            )
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Hapus halaman kedaluwarsa, lalu yang paling lama tidak dipakai sampai di bawah 90% batas"""
+        conn.execute("DELETE FROM pages WHERE fetched_at < ?", (time.time() - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+
+        if total > target:
+            removed = 0
+            keys = []
+            for key, size in conn.execute("SELECT key, size FROM pages ORDER BY accessed_at"):
+                if total - removed <= target:
+                    break
+                keys.append((key,))
+                removed += size
+            conn.executemany("DELETE FROM pages WHERE key = ?", keys)
+            self.evictions += len(keys)
+            total -= removed
+
+        conn.commit()
+        self._size_estimate = total
+
+    def iter_pages(self) -> Iterator[CachedPage]:
+        """Semua halaman yang belum kedaluwarsa (untuk ekstraksi ulang)"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            urls = [row[0] for row in self._connect().execute(
+                "SELECT url FROM pages WHERE fetched_at >= ?", (time.time() - self.ttl_seconds,)
+            )]
+
+        for url in urls:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT html, fetched_at, text, text_version FROM pages WHERE key = ?", (self._key(url),)
+                ).fetchone()
+            if row is not None:
+                yield CachedPage(url, zlib.decompress(row[0]), row[1], row[2], row[3])
+
+    def clear(self):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM pages")
+            conn.commit()
+            conn.execute("VACUUM")
+            self._size_estimate = 0
+
+    def get_stats(self) -> Dict:
+        stats = {
+            "enabled": self.enabled,
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+        if self.enabled:
+            with self._lock:
+                pages, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+                ).fetchone()
+            stats.update({"pages": pages, "bytes": size})
+        return stats
+
+
+# Global instance
+page_cache = PageCache()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from app.services.rss_fetcher import rss_fetcher
+
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the article page cache")
+    parser.add_argument("--stats", action="store_true", help="Print cache statistics")
+    parser.add_argument("--reextract", action="store_true", help="Re-run the extractor over all cached HTML")
+    parser.add_argument("--clear", action="store_true", help="Delete all cached pages")
+
+    args = parser.parse_args()
+
+    if args.clear:
+        page_cache.clear()
+        print("Page cache cleared")
+    if args.reextract:
+        started = time.time()
+        count = sum(1 for page in page_cache.iter_pages() if rss_fetcher.extract_cached(page, force=True) is not None)
+        print(f"Re-extracted {count} pages in {time.time() - started:.1f}s")
+    if args.stats or not (args.clear or args.reextract):
+        print(json.dumps(page_cache.get_stats(), indent=2))
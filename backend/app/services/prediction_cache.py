@@ -0,0 +1,124 @@
+"""
+Prediction Cache - In-memory LRU + TTL cache for hoax predictions
+
+Key = (hash teks yang dinormalisasi, domain sumber, versi model). Saat versi
+model berubah (misalnya setelah retrain), semua entry lama otomatis dibuang.
+"""
+
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+from app.models import HoaxPrediction
+
+
+class PredictionCache:
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 3600):
+        """
+        Args:
+            max_entries: Jumlah entry maksimum (0 = cache dimatikan)
+            ttl_seconds: Umur maksimum entry dalam detik (0 = tanpa TTL)
+        """
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = max(0.0, ttl_seconds)
+
+        self._entries: "OrderedDict[str, Tuple[float, HoaxPrediction]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Unicode NFC + collapse whitespace (case is kept, caps matter for scoring)"""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @staticmethod
+    def source_domain(source: str) -> str:
+        if not source:
+            return ""
+        source = source.strip().lower()
+        if "://" in source:
+            return urlparse(source).netloc
+        return source
+
+    def make_key(self, text: str, source: str, version: str) -> str:
+        text_hash = hashlib.sha256(self.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{version}|{self.source_domain(source)}|{text_hash}"
+
+    def _check_version(self, version: str):
+        # Caller holds the lock. A new model version invalidates every entry.
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._version = version
+
+    def get(self, key: str, version: str) -> Optional[HoaxPrediction]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, prediction = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return prediction.model_copy()
+
+    def put(self, key: str, version: str, prediction: HoaxPrediction):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic(), prediction.model_copy())
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "model_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -1,44 +1,47 @@
-import feedparser
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import os
+import socket
+import threading
+
+from app.services.article_extractor import EXTRACTOR_VERSION, IncrementalExtraction, article_extractor
+from app.services.download_limits import page_limits
+from app.services.page_cache import CachedPage, page_cache
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
 
 class RSSFetcher:
     def __init__(self, rss_url: Optional[str] = None):
         self.rss_url = rss_url or os.getenv("RSS_FEED_URL", "")
 
-    def fetch_rss(self) -> List[Dict]:
+    def get_feed_urls(self) -> List[str]:
+        """
+        Semua feed yang dikonfigurasi: RSS_FEED_URLS (dipisah koma atau baris
+        baru) ditambah RSS_FEED_URL, tanpa duplikat.
+        """
+        urls = os.getenv("RSS_FEED_URLS", "").replace("\n", ",").split(",")
         # Re-read from environment in case it changed
-        if not self.rss_url:
-            self.rss_url = os.getenv("RSS_FEED_URL", "")
-
-        if not self.rss_url:
-            print("No RSS feed URL configured")
-            print(f"Environment variables: {os.environ.get('RSS_FEED_URL', 'NOT SET')}")
-            return []
-
-        try:
-            print(f"Fetching RSS from: {self.rss_url}")
-            feed = feedparser.parse(self.rss_url)
-
-            articles = []
-            for entry in feed.entries:
-                article = {
-                    "title": entry.get("title", ""),
-                    "link": entry.get("link", ""),
-                    "published": self._parse_date(entry.get("published", "")),
-                    "summary": entry.get("summary", ""),
-                }
-                articles.append(article)
-
-            print(f"Fetched {len(articles)} articles from RSS")
-            return articles
-
-        except Exception as e:
-            print(f"Error fetching RSS: {e}")
-            return []
+        urls.append(self.rss_url or os.getenv("RSS_FEED_URL", ""))
+        return list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+
+    def parse_feed(self, feed, feed_url: str) -> List[Dict]:
+        """Ubah hasil feedparser.parse menjadi list artikel"""
+        articles = []
+        for entry in feed.entries:
+            article = {
+                "title": entry.get("title", ""),
+                "link": entry.get("link", ""),
+                "published": self._parse_date(entry.get("published", "")),
+                "summary": entry.get("summary", ""),
+                "guid": entry.get("id") or entry.get("link", ""),
+                "feed": feed_url,
+            }
+            articles.append(article)
+        return articles
 
     def _parse_date(self, date_string: str) -> Optional[datetime]:
         if not date_string:
@@ -56,51 +59,115 @@ class RSSFetcher:
 
     def extract_article_content(self, url: str) -> str:
         try:
-            print(f"Extracting content from: {url}")
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "lxml")
-
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
-
-            # Try to find article content
-            # This is a generic approach - you may need to customize for specific news sites
-            article_content = ""
-
-            # Common article content selectors
-            content_selectors = [
-                "article",
-                ".article-content",
-                ".post-content",
-                ".entry-content",
-                ".content",
-                "main"
-            ]
-
-            for selector in content_selectors:
-                content_div = soup.select_one(selector)
-                if content_div:
-                    paragraphs = content_div.find_all("p")
-                    article_content = " ".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
-                    if article_content:
-                        break
+            cached = self.cached_article_text(url)
+            if cached is not None:
+                return cached
 
-            # Fallback: get all paragraphs
-            if not article_content:
-                paragraphs = soup.find_all("p")
-                article_content = " ".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+            print(f"Extracting content from: {url}")
+            # Extracted while downloading; stops reading once the article text is complete
+            extraction = article_extractor.incremental(url)
+            html, content_type = self._download(url, timeout=10, extraction=extraction)
+            text = extraction.close()
 
-            return article_content[:5000]  # Limit to 5000 characters
+            self.cache_page(url, html, text, content_type)
+            return text
 
         except Exception as e:
             print(f"Error extracting content: {e}")
             return ""
 
+    def extract_from_html(self, html: bytes, url: Optional[str] = None) -> str:
+        """Ambil teks artikel dari HTML yang sudah di-download"""
+        return article_extractor.extract(html, url)
+
+    def cache_page(self, url: str, html: bytes, text: str, content_type: Optional[str] = None):
+        """Simpan halaman yang baru di-download beserta teks hasil ekstraksinya di page cache"""
+        page_cache.put(url, html, text, EXTRACTOR_VERSION, content_type)
+
+    def cached_article_text(self, url: str) -> Optional[str]:
+        """Teks artikel dari page cache, None jika halaman belum di-cache"""
+        page = page_cache.get(url)
+        return self.extract_cached(page) if page else None
+
+    def extract_cached(self, page: CachedPage, force: bool = False) -> str:
+        """Teks dari halaman cache; diekstrak ulang dari HTML-nya jika extractor sudah berubah"""
+        if not force and page.text is not None and page.text_version == EXTRACTOR_VERSION:
+            return page.text
+
+        text = self.extract_from_html(page.html, page.url)
+        page_cache.update_text(page.url, text, EXTRACTOR_VERSION)
+        return text
+
+    def fetch_html(self, url: str, timeout: float = 10) -> bytes:
+        """HTML halaman, dari page cache jika ada"""
+        page = page_cache.get(url)
+        if page:
+            return page.html
+
+        html, content_type = self._download(url, timeout=timeout)
+        page_cache.put(url, html, content_type=content_type)
+        return html
+
+    def _download(
+        self,
+        url: str,
+        timeout: float = 10,
+        extraction: Optional[IncrementalExtraction] = None,
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Download halaman secara streaming dalam batas page_limits.
+
+        Args:
+            extraction: Jika diberikan, setiap chunk diteruskan ke sini dan
+                        download berhenti begitu teks artikel sudah cukup
+
+        Returns:
+            (html, content_type)
+
+        Raises:
+            DownloadLimitError: Jika halaman melewati batas ukuran/waktu/tipe
+        """
+        budget = page_limits.start(url)
+        chunks = []
+        with requests.get(url, headers=HEADERS, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            page_limits.check_headers(url, response.headers)
+
+            # A read only returns once a whole chunk arrived; closing the
+            # response from a timer enforces the deadline on trickling servers
+            watchdog = threading.Timer(budget.remaining_seconds(), _abort_download, (response,))
+            watchdog.start()
+            try:
+                # iter_content yields decompressed bytes, so the budget also caps gzip bombs
+                for chunk in response.iter_content(chunk_size=16384):
+                    chunk = budget.add(chunk)
+                    chunks.append(chunk)
+                    if budget.exhausted or (extraction is not None and extraction.feed(chunk)):
+                        break
+            except Exception:
+                if budget.expired:
+                    raise budget.deadline_error()
+                raise
+            finally:
+                watchdog.cancel()
+
+            return b"".join(chunks), response.headers.get("content-type")
+
+
+def _abort_download(response: requests.Response):
+    """Hentikan read yang sedang berjalan dengan mematikan socket-nya"""
+    # response.close() alone does not wake a read blocked in another thread;
+    # shutting the socket down does. Only public attributes are used:
+    # urllib3 HTTPResponse.connection and http.client HTTPConnection.sock
+    connection = getattr(response.raw, "connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    response.close()
+
+
 # Global instance
 rss_fetcher = RSSFetcher()
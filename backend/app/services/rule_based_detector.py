@@ -4,15 +4,21 @@ Menggunakan pattern matching dan keyword analysis untuk deteksi hoax sementara
 sambil menunggu model ML di-train.
 """
 
-import re
-from typing import Dict, Tuple
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
 from app.models import HoaxPrediction
+from app.services.rule_pack import RulePack, load_rule_pack
 
 
 class RuleBasedHoaxDetector:
     def __init__(self):
+        # Built-in rule pack, used when RULE_PACK_PATH is not set or invalid
         # Keywords yang sering muncul di hoax
-        self.hoax_keywords = [
+        hoax_keywords = [
             # Sensasional
             "wajib share", "wajib tahu", "viral", "breaking news",
             "segera sebarkan", "harus dibaca", "jangan sampai",
@@ -35,7 +41,7 @@ class RuleBasedHoaxDetector:
         ]
 
         # Trusted media sources (media terpercaya)
-        self.trusted_sources = [
+        trusted_sources = [
             "kompas.com", "tempo.co", "detik.com", "antaranews.com",
             "cnn.com", "bbc.com", "liputan6.com", "tribunnews.com",
             "republika.co.id", "mediaindonesia.com", "suara.com",
@@ -43,7 +49,7 @@ class RuleBasedHoaxDetector:
         ]
 
         # Hoax indicators patterns
-        self.hoax_patterns = [
+        hoax_patterns = [
             r'\b(WAJIB|HARUS|SEGERA)\s+(SHARE|TAHU|BACA|SEBARKAN)\b',
             r'\b\d+%\s+(terbukti|ampuh|efektif)\b',
             r'\b(rahasia|fakta)\s+(tersembunyi|mengejutkan|mencengangkan)\b',
@@ -52,14 +58,145 @@ class RuleBasedHoaxDetector:
             r'\bDIBANNED\b|\bDICENSOR\b|\bDISEMBUNYIKAN\b',
         ]
 
-    def analyze_text(self, text: str, source: str = "") -> Dict[str, float]:
+        # Bobot tiap kategori score untuk hoax_probability
+        weights = {
+            "keyword_score": 0.3,
+            "pattern_score": 0.25,
+            "source_score": 0.25,
+            "caps_score": 0.1,
+            "punctuation_score": 0.1
+        }
+
+        self.builtin_rules = RulePack(
+            version="builtin",
+            hoax_keywords=hoax_keywords,
+            trusted_sources=trusted_sources,
+            hoax_patterns=hoax_patterns,
+            weights=weights,
+            threshold=0.4,
+            max_confidence=0.95,  # Max 95% confidence for rule-based
+        )
+        self.rules = self.builtin_rules
+
+        # Optional rule pack file (JSON/YAML), hot-reloaded when it changes
+        self.rule_pack_path = os.getenv("RULE_PACK_PATH", "")
+        self._rules_lock = threading.Lock()
+        self._rules_mtime: Optional[float] = None
+        self._watcher: Optional[threading.Thread] = None
+        self.last_reload_error: Optional[str] = None
+
+        if self.rule_pack_path:
+            try:
+                self.reload_rules()
+            except Exception as e:
+                print(f"Warning: Could not load rule pack {self.rule_pack_path}: {e}. Using built-in rules.")
+
+    # Read-only views of the active pack (kept for existing callers)
+    @property
+    def hoax_keywords(self) -> List[str]:
+        return self.rules.hoax_keywords
+
+    @property
+    def trusted_sources(self) -> List[str]:
+        return self.rules.trusted_sources
+
+    @property
+    def hoax_patterns(self) -> List[str]:
+        return self.rules.hoax_patterns
+
+    @property
+    def weights(self) -> Dict[str, float]:
+        return self.rules.weights
+
+    @property
+    def rule_pack_version(self) -> str:
+        return self.rules.version
+
+    def reload_rules(self, path: Optional[str] = None) -> Dict:
+        """
+        Load, validasi, dan compile rule pack lalu swap secara atomik.
+        Jika pack tidak valid, rules lama tetap dipakai.
+
+        Raises:
+            ValueError: Jika pack tidak valid
+            FileNotFoundError: Jika file tidak ada
+        """
+        path = path or self.rule_pack_path
+        if not path:
+            raise ValueError("No rule pack path configured (set RULE_PACK_PATH)")
+
+        with self._rules_lock:
+            previous = self.rules.version
+            try:
+                mtime = os.path.getmtime(path)
+                pack = load_rule_pack(path)
+            except Exception as e:
+                self.last_reload_error = str(e)
+                raise
+
+            self.rules = pack
+            self.rule_pack_path = path
+            self._rules_mtime = mtime
+            self.last_reload_error = None
+
+        print(f"Rule pack loaded: {previous} -> {pack.version} ({path})")
+        return {"previous": previous, **pack.describe()}
+
+    def start_rule_watcher(self, interval: Optional[float] = None):
+        """Poll mtime file rule pack dan reload otomatis ketika berubah"""
+        interval = interval if interval is not None else float(os.getenv("RULE_PACK_WATCH_INTERVAL", "10"))
+        if not self.rule_pack_path or interval <= 0 or self._watcher is not None:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    mtime = os.path.getmtime(self.rule_pack_path)
+                except OSError:
+                    continue
+                if mtime == self._rules_mtime:
+                    continue
+                try:
+                    self.reload_rules()
+                except Exception as e:
+                    # Remember the bad file so it is not re-parsed every tick
+                    self._rules_mtime = mtime
+                    print(f"Error reloading rule pack: {e}. Keeping {self.rules.version}.")
+
+        self._watcher = threading.Thread(target=watch, name="rule-pack-watcher", daemon=True)
+        self._watcher.start()
+
+    def get_rules_info(self) -> Dict:
+        return {
+            **self.rules.describe(),
+            "watching": self._watcher is not None,
+            "last_reload_error": self.last_reload_error,
+        }
+
+    def is_trusted_source(self, source: str, rules: Optional[RulePack] = None) -> bool:
+        """True jika domain source punya reputation tinggi (lihat DomainIndex)"""
+        return (rules or self.rules).domain_index.is_trusted(source)
+
+    def source_score(self, source: str, rules: Optional[RulePack] = None) -> float:
+        """0.0 untuk domain dengan reputation 1.0, naik sampai 0.3 untuk domain tak dikenal"""
+        reputation = (rules or self.rules).domain_index.reputation(source)
+        if reputation is None:
+            return 0.3
+        return 0.3 * (1.0 - reputation)
+
+    def analyze_text(self, text: str, source: str = "", rules: Optional[RulePack] = None) -> Dict[str, float]:
         """
         Analyze text untuk berbagai indikator hoax
 
+        Args:
+            rules: Rule pack yang dipakai (default: pack aktif)
+
         Returns:
             Dict dengan score untuk setiap kategori
         """
-        text_lower = text.lower()
+        rules = rules or self.rules
+        matches = rules.matcher.scan(text)
 
         scores = {
             "keyword_score": 0.0,
@@ -70,32 +207,33 @@ class RuleBasedHoaxDetector:
         }
 
         # 1. Keyword matching
-        keyword_matches = sum(1 for keyword in self.hoax_keywords if keyword in text_lower)
-        scores["keyword_score"] = min(keyword_matches * 0.1, 1.0)
+        scores["keyword_score"] = min(matches["keyword_matches"] * 0.1, 1.0)
 
         # 2. Pattern matching
-        pattern_matches = sum(1 for pattern in self.hoax_patterns if re.search(pattern, text, re.IGNORECASE))
-        scores["pattern_score"] = min(pattern_matches * 0.15, 1.0)
+        scores["pattern_score"] = min(matches["pattern_matches"] * 0.15, 1.0)
 
         # 3. Source credibility
         if source:
-            source_lower = source.lower()
-            is_trusted = any(trusted in source_lower for trusted in self.trusted_sources)
-            scores["source_score"] = 0.0 if is_trusted else 0.3
+            scores["source_score"] = self.source_score(source, rules)
 
         # 4. Excessive capitalization
         if len(text) > 0:
-            caps_ratio = sum(1 for c in text if c.isupper()) / len(text)
+            caps_ratio = matches["upper_count"] / len(text)
             if caps_ratio > 0.3:  # More than 30% uppercase
                 scores["caps_score"] = min(caps_ratio, 1.0)
 
         # 5. Excessive punctuation
-        exclamation_count = text.count('!')
+        exclamation_count = matches["exclamation_count"]
         if exclamation_count > 3:
             scores["punctuation_score"] = min(exclamation_count * 0.1, 1.0)
 
         return scores
 
+    def hoax_probability(self, scores: Dict[str, float], rules: Optional[RulePack] = None) -> float:
+        """Weighted sum of the analyze_text scores (0.0 - 1.0)"""
+        weights = (rules or self.rules).weights
+        return sum(scores[key] * weights[key] for key in weights)
+
     def predict(self, text: str, source: str = "") -> HoaxPrediction:
         """
         Predict apakah text adalah hoax atau non-hoax
@@ -107,42 +245,141 @@ class RuleBasedHoaxDetector:
         Returns:
             HoaxPrediction object
         """
-        # Analyze text
-        scores = self.analyze_text(text, source)
+        # One pack for the whole prediction, even if a reload happens meanwhile
+        rules = self.rules
 
-        # Calculate weighted score
-        weights = {
-            "keyword_score": 0.3,
-            "pattern_score": 0.25,
-            "source_score": 0.25,
-            "caps_score": 0.1,
-            "punctuation_score": 0.1
-        }
+        # Analyze text
+        scores = self.analyze_text(text, source, rules)
+        return self.predict_from_scores(scores, rules)
 
-        hoax_probability = sum(scores[key] * weights[key] for key in weights)
+    def predict_from_scores(self, scores: Dict[str, float], rules: Optional[RulePack] = None) -> HoaxPrediction:
+        """Label + confidence dari hasil analyze_text"""
+        rules = rules or self.rules
+        hoax_probability = self.hoax_probability(scores, rules)
 
-        # Threshold: 0.4
-        # Jika hoax_probability > 0.4, maka dianggap hoax
-        if hoax_probability > 0.4:
+        # Threshold default 0.4
+        # Jika hoax_probability > threshold, maka dianggap hoax
+        if hoax_probability > rules.threshold:
             label = "hoax"
-            confidence = min(hoax_probability, 0.95)  # Max 95% confidence for rule-based
+            confidence = min(hoax_probability, rules.max_confidence)
         else:
             label = "non-hoax"
-            confidence = min(1.0 - hoax_probability, 0.95)
+            confidence = min(1.0 - hoax_probability, rules.max_confidence)
 
         return HoaxPrediction(
             label=label,
-            confidence=round(confidence, 4)
+            confidence=round(confidence, 4),
+            rule_pack_version=rules.version
+        )
+
+    def predict_batch(self, texts: List[str], sources: Optional[List[str]] = None) -> List[HoaxPrediction]:
+        """
+        Predict banyak teks sekaligus (interface sama dengan HoaxDetector.predict_batch)
+
+        Args:
+            texts: List konten berita
+            sources: List sumber berita (opsional, sejajar dengan texts)
+
+        Returns:
+            List HoaxPrediction dengan urutan sama seperti input
+        """
+        if sources is None:
+            sources = [""] * len(texts)
+        if len(sources) != len(texts):
+            raise ValueError("texts and sources must have the same length")
+
+        return [self.predict(text, source) for text, source in zip(texts, sources)]
+
+    def score_frame(
+        self,
+        df: pd.DataFrame,
+        text_col: str = "text",
+        source_col: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Scoring rule-based untuk satu DataFrame sekaligus (hasil identik dengan
+        predict per baris). Teks di-scan dengan loop Python per baris
+        (RuleMatcher.scan_frame); hanya score, probabilitas dan label yang
+        dihitung per kolom dengan NumPy, tanpa membuat HoaxPrediction.
+
+        Scan yang di-vectorize (semua baris digabung dengan pemisah NUL lalu
+        tiap keyword dicari sekali, atau Series.str.contains per keyword) sudah
+        diukur dan tidak lebih cepat: ~101k baris 2.32s dan 3.00s vs 2.31s untuk
+        loop per baris, karena pencarian substring tetap mendominasi. Versi
+        itu dibuang supaya hanya ada satu implementasi matching (scan()).
+
+        Args:
+            df: DataFrame berisi teks berita
+            text_col: Nama kolom teks
+            source_col: Nama kolom sumber (opsional)
+
+        Returns:
+            DataFrame (index sama dengan df) berisi lima score, hoax_probability,
+            label, dan confidence
+        """
+        rules = self.rules
+        matches = rules.matcher.scan_frame(df[text_col])
+        size = len(df)
+
+        scores = {
+            "keyword_score": np.minimum(matches["keyword_matches"] * 0.1, 1.0),
+            "pattern_score": np.minimum(matches["pattern_matches"] * 0.15, 1.0),
+            "source_score": np.zeros(size),
+        }
+
+        if source_col is not None:
+            sources = ["" if pd.isna(source) else str(source) for source in df[source_col]]
+            # Sources repeat a lot (one feed = one domain): score each distinct value once
+            unique_scores = {
+                source: self.source_score(source, rules) if source else 0.0
+                for source in set(sources)
+            }
+            scores["source_score"] = np.fromiter(
+                (unique_scores[source] for source in sources), dtype=np.float64, count=size
+            )
+
+        length = matches["length"]
+        caps_ratio = np.divide(
+            matches["upper_count"], length,
+            out=np.zeros(size), where=length > 0
+        )
+        scores["caps_score"] = np.where(caps_ratio > 0.3, np.minimum(caps_ratio, 1.0), 0.0)
+
+        exclamation_count = matches["exclamation_count"]
+        scores["punctuation_score"] = np.where(
+            exclamation_count > 3, np.minimum(exclamation_count * 0.1, 1.0), 0.0
         )
 
+        # Same summation order as hoax_probability() so floats match exactly
+        hoax_probability = np.zeros(size)
+        for key in rules.weights:
+            hoax_probability = hoax_probability + scores[key] * rules.weights[key]
+
+        is_hoax = hoax_probability > rules.threshold
+        confidence = np.where(
+            is_hoax,
+            np.minimum(hoax_probability, rules.max_confidence),
+            np.minimum(1.0 - hoax_probability, rules.max_confidence)
+        )
+
+        result = pd.DataFrame(scores, index=df.index)
+        result["hoax_probability"] = hoax_probability
+        result["label"] = np.where(is_hoax, "hoax", "non-hoax")
+        # Python round() (not np.round) to match HoaxPrediction.confidence
+        result["confidence"] = [round(float(c), 4) for c in confidence]
+        result["rule_pack_version"] = rules.version
+        return result
+
     def get_explanation(self, text: str, source: str = "") -> Dict:
         """
         Memberikan penjelasan detail kenapa dianggap hoax/non-hoax
         """
-        scores = self.analyze_text(text, source)
-        prediction = self.predict(text, source)
+        rules = self.rules
+        scores = self.analyze_text(text, source, rules)
+        prediction = self.predict_from_scores(scores, rules)
 
         return {
+            "rule_pack_version": rules.version,
             "prediction": prediction.label,
             "confidence": prediction.confidence,
             "detailed_scores": scores,
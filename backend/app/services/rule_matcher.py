@@ -0,0 +1,152 @@
+"""
+Rule Matcher - Compiled matching engine for the rule-based hoax detector
+
+All literal needles (hoax keywords plus the literals every hoax pattern
+needs to contain) are scanned in one table over the lowercased text. A
+regex only runs when one of its required literals is present, so clean
+articles never pay for the (slow, `\\b`-prefixed) pattern searches.
+Uppercase and `!` counts use C-level counting instead of a Python loop.
+
+Output is identical to the original per-keyword / per-pattern checks.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+_ASCII_UPPERCASE = bytes(range(ord("A"), ord("Z") + 1))
+
+# The only non-ASCII characters that re.IGNORECASE matches against ASCII
+# letters (İ, ı, ſ, Kelvin sign). Without them, lowercase substring checks
+# are exact prefilters for ASCII literals.
+_ASCII_CASE_FOLDS = ("\u0130", "\u0131", "\u017f", "\u212a")
+
+def _required_literals(items) -> Optional[FrozenSet[str]]:
+    """
+    Cari sekumpulan string yang minimal salah satunya pasti muncul di setiap
+    match dari sequence regex hasil sre_parse. None jika tidak bisa dipastikan.
+    """
+    candidates = []
+    run = []
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+
+        if run:
+            candidates.append(frozenset(["".join(run)]))
+            run = []
+
+        required = None
+        if op is sre_constants.SUBPATTERN:
+            required = _required_literals(av[-1])
+        elif op is sre_constants.BRANCH:
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                required = frozenset().union(*branches)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            required = _required_literals(av[2])
+
+        if required:
+            candidates.append(required)
+
+    if run:
+        candidates.append(frozenset(["".join(run)]))
+
+    if not candidates:
+        return None
+    # The most selective requirement: its shortest alternative is the longest
+    return max(candidates, key=lambda literals: min(len(s) for s in literals))
+
+
+def required_literals(pattern: str) -> Optional[FrozenSet[str]]:
+    """
+    Literal (lowercase) yang salah satunya wajib ada agar `pattern` bisa match
+    dengan re.IGNORECASE, atau None jika pattern tidak bisa di-prefilter.
+    """
+    try:
+        literals = _required_literals(sre_parse.parse(pattern, re.IGNORECASE))
+    except Exception:
+        return None
+
+    if not literals or not all(s.isascii() for s in literals):
+        # Non-ASCII literals can case-fold onto ASCII text; do not prefilter
+        return None
+    return frozenset(s.lower() for s in literals)
+
+
+class RuleMatcher:
+    def __init__(self, keywords: List[str], patterns: List[str]):
+        """
+        Args:
+            keywords: Keyword hoax (dicocokkan ke teks lowercase)
+            patterns: Regex hoax (dicocokkan dengan re.IGNORECASE)
+        """
+        # Duplicates in the source lists count once per occurrence, as before
+        self.keyword_counts = Counter(keywords)
+        self.patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        self.pattern_anchors = [required_literals(pattern) for pattern in patterns]
+
+        anchors = set().union(*(a for a in self.pattern_anchors if a))
+        self.needles = tuple(set(self.keyword_counts) | anchors)
+
+    def scan(self, text: str) -> Dict:
+        """
+        Returns:
+            Dict berisi keyword_matches, pattern_matches, upper_count, exclamation_count
+        """
+        text_lower = text.lower()
+        is_ascii = text.isascii()
+        can_prefilter = is_ascii or not any(c in text for c in _ASCII_CASE_FOLDS)
+
+        found = {needle for needle in self.needles if needle in text_lower}
+        keyword_matches = sum(self.keyword_counts[k] for k in found if k in self.keyword_counts)
+
+        pattern_matches = 0
+        for compiled, anchors in zip(self.patterns, self.pattern_anchors):
+            if anchors is not None and can_prefilter and found.isdisjoint(anchors):
+                continue
+            if compiled.search(text):
+                pattern_matches += 1
+
+        if is_ascii:
+            raw = text.encode("ascii")
+            upper_count = len(raw) - len(raw.translate(None, _ASCII_UPPERCASE))
+        else:
+            upper_count = sum(map(str.isupper, text))
+
+        return {
+            "keyword_matches": keyword_matches,
+            "pattern_matches": pattern_matches,
+            "upper_count": upper_count,
+            "exclamation_count": text.count("!"),
+        }
+
+    def scan_frame(self, texts: pd.Series) -> Dict[str, np.ndarray]:
+        """
+        scan() untuk satu kolom teks (nilai kosong/NaN dianggap "").
+
+        Returns:
+            Dict berisi array keyword_matches, pattern_matches, upper_count,
+            exclamation_count, dan length (satu elemen per baris)
+        """
+        values = ["" if pd.isna(t) else str(t) for t in texts]
+        results = [self.scan(text) for text in values]
+
+        frame = {
+            key: np.fromiter((result[key] for result in results), dtype=np.int64, count=len(values))
+            for key in ("keyword_matches", "pattern_matches", "upper_count", "exclamation_count")
+        }
+        frame["length"] = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+        return frame
@@ -0,0 +1,180 @@
+"""
+Rule Pack - Versioned, validated rule set for the rule-based detector
+
+A rule pack bundles keywords, trusted sources, regex patterns, weights and
+the decision threshold, and is compiled into a RuleMatcher when it is
+loaded. Packs are read from JSON (or YAML, if PyYAML is installed):
+
+    {
+        "version": "2025.01.1",
+        "hoax_keywords": ["wajib share", ...],
+        "trusted_sources": ["kompas.com", ...],
+        "domain_reputation": {"cekfakta.tempo.co": 1.0, "blogspot.com": 0.2},
+        "hoax_patterns": ["!!!+", ...],
+        "weights": {"keyword_score": 0.3, ...},
+        "threshold": 0.4,
+        "max_confidence": 0.95
+    }
+
+A domain_reputation entry also covers the subdomains of that domain. On
+blog hosts (blogspot.com, wordpress.com) every subdomain is its own site,
+so the host's entry is only the default for blogs without an entry of
+their own.
+
+A pack object is never modified after construction; the detector swaps
+the whole object, so a prediction always sees one consistent pack.
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.services.domain_index import DomainIndex
+from app.services.rule_matcher import RuleMatcher
+
+SCORE_KEYS = ["keyword_score", "pattern_score", "source_score", "caps_score", "punctuation_score"]
+
+
+class RulePack:
+    def __init__(
+        self,
+        version: str,
+        hoax_keywords: List[str],
+        trusted_sources: List[str],
+        hoax_patterns: List[str],
+        weights: Dict[str, float],
+        threshold: float = 0.4,
+        max_confidence: float = 0.95,
+        domain_reputation: Optional[Dict[str, float]] = None,
+        path: Optional[str] = None,
+    ):
+        """
+        Raises:
+            ValueError: Jika isi pack tidak valid (pesan menjelaskan field yang salah)
+        """
+        if not isinstance(version, str) or not version.strip():
+            raise ValueError("Rule pack 'version' must be a non-empty string")
+
+        for field, values in (
+            ("hoax_keywords", hoax_keywords),
+            ("trusted_sources", trusted_sources),
+            ("hoax_patterns", hoax_patterns),
+        ):
+            if not isinstance(values, list) or not all(isinstance(v, str) and v for v in values):
+                raise ValueError(f"Rule pack '{field}' must be a list of non-empty strings")
+
+        for pattern in hoax_patterns:
+            try:
+                re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid hoax pattern {pattern!r}: {e}")
+
+        domain_reputation = domain_reputation or {}
+        if not isinstance(domain_reputation, dict) or not all(
+            isinstance(domain, str) and isinstance(score, (int, float)) and 0.0 <= score <= 1.0
+            for domain, score in domain_reputation.items()
+        ):
+            raise ValueError("Rule pack 'domain_reputation' must map domains to scores between 0 and 1")
+
+        if not isinstance(weights, dict) or set(weights) != set(SCORE_KEYS):
+            raise ValueError(f"Rule pack 'weights' must have exactly the keys {SCORE_KEYS}")
+        if not all(isinstance(w, (int, float)) and w >= 0 for w in weights.values()):
+            raise ValueError("Rule pack weights must be non-negative numbers")
+
+        if not isinstance(threshold, (int, float)) or not 0.0 <= threshold <= 1.0:
+            raise ValueError("Rule pack 'threshold' must be between 0 and 1")
+        if not isinstance(max_confidence, (int, float)) or not 0.0 < max_confidence <= 1.0:
+            raise ValueError("Rule pack 'max_confidence' must be in (0, 1]")
+
+        self.version = version.strip()
+        self.hoax_keywords = list(hoax_keywords)
+        self.trusted_sources = [s.lower() for s in trusted_sources]
+        self.hoax_patterns = list(hoax_patterns)
+        # Summation order is part of the scoring contract (float results)
+        self.weights = {key: float(weights[key]) for key in SCORE_KEYS}
+        self.threshold = float(threshold)
+        self.max_confidence = float(max_confidence)
+        self.domain_reputation = dict(domain_reputation)
+        self.path = path
+        self.loaded_at = datetime.now().isoformat()
+
+        # Compiled here, never on the request path
+        self.matcher = RuleMatcher(self.hoax_keywords, self.hoax_patterns)
+        # trusted_sources are full-reputation entries; explicit scores override them
+        self.domain_index = DomainIndex({
+            **{domain: 1.0 for domain in self.trusted_sources},
+            **self.domain_reputation,
+        })
+
+    @classmethod
+    def from_dict(cls, data: Dict, path: Optional[str] = None) -> "RulePack":
+        if not isinstance(data, dict):
+            raise ValueError("Rule pack must be a mapping")
+
+        unknown = set(data) - {
+            "version", "hoax_keywords", "trusted_sources", "hoax_patterns",
+            "weights", "threshold", "max_confidence", "domain_reputation",
+        }
+        if unknown:
+            raise ValueError(f"Unknown rule pack fields: {sorted(unknown)}")
+
+        missing = {"version", "hoax_keywords", "trusted_sources", "hoax_patterns", "weights"} - set(data)
+        if missing:
+            raise ValueError(f"Missing rule pack fields: {sorted(missing)}")
+
+        return cls(path=path, **data)
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.version,
+            "hoax_keywords": self.hoax_keywords,
+            "trusted_sources": self.trusted_sources,
+            "hoax_patterns": self.hoax_patterns,
+            "weights": self.weights,
+            "threshold": self.threshold,
+            "max_confidence": self.max_confidence,
+            "domain_reputation": self.domain_reputation,
+        }
+
+    def describe(self) -> Dict:
+        return {
+            "version": self.version,
+            "path": self.path,
+            "loaded_at": self.loaded_at,
+            "hoax_keywords": len(self.hoax_keywords),
+            "trusted_sources": len(self.trusted_sources),
+            "indexed_domains": len(self.domain_index),
+            "hoax_patterns": len(self.hoax_patterns),
+            "weights": self.weights,
+            "threshold": self.threshold,
+        }
+
+
+def load_rule_pack(path: str) -> RulePack:
+    """
+    Baca dan validasi rule pack dari file JSON/YAML
+
+    Raises:
+        ValueError: Jika file tidak bisa di-parse atau isinya tidak valid
+    """
+    with open(path, encoding="utf-8") as f:
+        raw = f.read()
+
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("PyYAML is not installed; use a .json rule pack or pip install pyyaml")
+        try:
+            data = yaml.safe_load(raw)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML in {path}: {e}")
+    else:
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {path}: {e}")
+
+    return RulePack.from_dict(data, path=os.path.abspath(path))
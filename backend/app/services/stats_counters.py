@@ -0,0 +1,121 @@
+"""
+Stats Counters - Which counters exist and how documents contribute to them
+
+Counter values are maintained by the writers (NewsService, the bulk
+labeling route, TrainingService.mark_as_trained, user check saving): each
+write computes how the document's contribution changes between its old and
+new state and adds that delta to the same batch. Reading the stats is then
+a single multi-get of the counter shards.
+
+news:
+    news_total, news_labeled_by_{system,admin,user},
+    news_pending_training (can_use_for_training and not trained),
+    news_training_trained (can_use_for_training and trained),
+    news_trained (trained)
+user_checks:
+    user_checks_unique, user_checks_total (sum of check_count),
+    user_checks_hoax (check_count of hoax predictions)
+
+Repair drifted counters (e.g. after editing documents in the console):
+
+    python -m app.services.stats_counters --recount
+"""
+
+from typing import Dict, Optional
+
+from app.utils.counters import count_query, counter_delta, sharded_counters, sum_query
+from app.utils.firebase_config import get_db
+
+LABEL_SOURCES = ["system", "admin", "user"]
+
+NEWS_COUNTERS = (
+    ["news_total"]
+    + [f"news_labeled_by_{source}" for source in LABEL_SOURCES]
+    + ["news_pending_training", "news_training_trained", "news_trained"]
+)
+# Fields a news counter depends on (read before updating a news document)
+NEWS_COUNTED_FIELDS = ["labeled_by", "can_use_for_training", "trained"]
+
+USER_CHECK_COUNTERS = ["user_checks_unique", "user_checks_total", "user_checks_hoax"]
+USER_CHECK_COUNTED_FIELDS = ["prediction", "check_count"]
+
+
+def news_counter_values(doc: Dict) -> Dict[str, int]:
+    values = {"news_total": 1}
+    if doc.get("labeled_by") in LABEL_SOURCES:
+        values[f"news_labeled_by_{doc['labeled_by']}"] = 1
+    if doc.get("can_use_for_training"):
+        values["news_training_trained" if doc.get("trained") else "news_pending_training"] = 1
+    if doc.get("trained"):
+        values["news_trained"] = 1
+    return values
+
+
+def user_check_counter_values(doc: Dict) -> Dict[str, int]:
+    count = doc.get("check_count", 1)
+    values = {"user_checks_unique": 1, "user_checks_total": count}
+    if doc.get("prediction") == "hoax":
+        values["user_checks_hoax"] = count
+    return values
+
+
+class StatsCounters:
+    def news_delta(self, before: Optional[Dict], after: Optional[Dict]) -> Dict[str, int]:
+        """Perubahan counter news saat dokumen berubah (None = belum/tidak ada)"""
+        return counter_delta(news_counter_values, before, after)
+
+    def user_check_delta(self, before: Optional[Dict], after: Optional[Dict]) -> Dict[str, int]:
+        return counter_delta(user_check_counter_values, before, after)
+
+    def get_news_counts(self) -> Dict[str, int]:
+        return sharded_counters.read("news", NEWS_COUNTERS, self.recount_news)
+
+    def get_user_check_counts(self) -> Dict[str, int]:
+        return sharded_counters.read("user_checks", USER_CHECK_COUNTERS, self.recount_user_checks)
+
+    def recount_news(self) -> Dict[str, int]:
+        """Hitung ulang counter news dengan aggregation query"""
+        news = get_db().collection("news")
+        values = {"news_total": count_query(news)}
+        for source in LABEL_SOURCES:
+            values[f"news_labeled_by_{source}"] = count_query(news.where("labeled_by", "==", source))
+
+        training = news.where("can_use_for_training", "==", True)
+        values["news_pending_training"] = count_query(training.where("trained", "==", False))
+        values["news_training_trained"] = count_query(training.where("trained", "==", True))
+        values["news_trained"] = count_query(news.where("trained", "==", True))
+        return values
+
+    def recount_user_checks(self) -> Dict[str, int]:
+        """Hitung ulang counter user_checks dengan aggregation query"""
+        checks = get_db().collection("user_checks")
+        return {
+            "user_checks_unique": count_query(checks),
+            "user_checks_total": sum_query(checks, "check_count"),
+            "user_checks_hoax": sum_query(checks.where("prediction", "==", "hoax"), "check_count"),
+        }
+
+    def recount(self) -> Dict[str, int]:
+        """Set ulang semua counter dari database"""
+        values = sharded_counters.reset("news", self.recount_news())
+        values.update(sharded_counters.reset("user_checks", self.recount_user_checks()))
+        return values
+
+
+# Global instance
+stats_counters = StatsCounters()
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Show or repair the stats counters")
+    parser.add_argument("--recount", action="store_true", help="Recount all counters from the database")
+
+    args = parser.parse_args()
+
+    if args.recount:
+        print(json.dumps(stats_counters.recount(), indent=2))
+    else:
+        print(json.dumps({**stats_counters.get_news_counts(), **stats_counters.get_user_check_counts()}, indent=2))
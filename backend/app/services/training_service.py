@@ -9,10 +9,14 @@ Features:
 """
 
 import os
+import shutil
 import pandas as pd
 from datetime import datetime
 from typing import List, Optional, Dict
 from app.utils.firebase_config import get_db
+from app.utils.pagination import page_query, split_page
+from app.services.news_service import news_service
+from app.services.stats_counters import stats_counters
 from app.models import TrainingDataItem, TrainingQueueStatus, RetrainResponse
 
 
@@ -26,23 +30,10 @@ class TrainingService:
     def get_training_queue_status(self) -> TrainingQueueStatus:
         """Get current status of training queue"""
         try:
-            # Count pending (admin-labeled but not trained)
-            pending_query = (
-                self.db.collection("news")
-                .where("can_use_for_training", "==", True)
-                .where("trained", "==", False)
-            )
-            pending_docs = list(pending_query.stream())
-            total_pending = len(pending_docs)
-
-            # Count already trained
-            trained_query = (
-                self.db.collection("news")
-                .where("can_use_for_training", "==", True)
-                .where("trained", "==", True)
-            )
-            trained_docs = list(trained_query.stream())
-            total_trained = len(trained_docs)
+            # Counted as documents are saved, labeled and trained; no collection scan
+            counts = stats_counters.get_news_counts()
+            total_pending = counts["news_pending_training"]
+            total_trained = counts["news_training_trained"]
 
             return TrainingQueueStatus(
                 total_pending=total_pending,
@@ -71,25 +62,59 @@ class TrainingService:
 
             training_data = []
             for doc in docs:
-                data = doc.to_dict()
-                # Use manual_label if available, otherwise hoax_label
-                label = data.get("manual_label") or data.get("hoax_label")
-                if label:
-                    training_data.append({
-                        "id": doc.id,
-                        "text": f"{data.get('title', '')} {data.get('content', '')}".strip(),
-                        "label": 1 if label == "hoax" else 0,
-                        "source": data.get("source", "admin"),
-                        "url": data.get("link", ""),
-                        "labeled_by": data.get("labeled_by", "admin"),
-                        "labeled_at": data.get("labeled_at"),
-                    })
+                item = self._to_training_item(doc.id, doc.to_dict())
+                if item:
+                    training_data.append(item)
 
             return training_data
         except Exception as e:
             print(f"Error getting pending training data: {e}")
             return []
 
+    def get_pending_training_page(self, limit: int = 100, cursor: Optional[str] = None) -> Dict:
+        """
+        Satu halaman data training pending, terbaru dulu (untuk dashboard admin).
+
+        Raises:
+            InvalidCursorError: Jika cursor tidak valid
+        """
+        query = (
+            self.db.collection("news")
+            .where("can_use_for_training", "==", True)
+            .where("trained", "==", False)
+        )
+        query, page_size = page_query(query, "labeled_at", limit, cursor)
+
+        rows = []
+        for doc in query.stream():
+            data = doc.to_dict()
+            data["id"] = doc.id
+            rows.append(data)
+        rows, next_cursor = split_page(rows, page_size, "labeled_at")
+
+        items = [item for item in (self._to_training_item(row["id"], row) for row in rows) if item]
+        return {
+            "total": stats_counters.get_news_counts()["news_pending_training"],
+            "items": items,
+            "next_cursor": next_cursor,
+        }
+
+    def _to_training_item(self, news_id: str, data: Dict) -> Optional[Dict]:
+        # Use manual_label if available, otherwise hoax_label
+        label = data.get("manual_label") or data.get("hoax_label")
+        if not label:
+            return None
+
+        return {
+            "id": news_id,
+            "text": f"{data.get('title', '')} {data.get('content', '')}".strip(),
+            "label": 1 if label == "hoax" else 0,
+            "source": data.get("source", "admin"),
+            "url": data.get("link", ""),
+            "labeled_by": data.get("labeled_by", "admin"),
+            "labeled_at": data.get("labeled_at"),
+        }
+
     def export_training_dataset(self, include_old: bool = True) -> str:
         """
         Export training data to CSV for model training
@@ -148,14 +173,13 @@ class TrainingService:
     def mark_as_trained(self, news_ids: List[str]) -> int:
         """Mark news items as trained"""
         try:
-            count = 0
-            for news_id in news_ids:
-                self.db.collection("news").document(news_id).update({
-                    "trained": True,
-                    "trained_at": datetime.now().isoformat()
-                })
-                count += 1
-            return count
+            trained_at = datetime.now().isoformat()
+            updates = {
+                news_id: {"trained": True, "trained_at": trained_at}
+                for news_id in news_ids
+            }
+            # Batched, and moves the items from pending to trained in the stats counters
+            return len(news_service.update_news_many(updates).succeeded)
         except Exception as e:
             print(f"Error marking as trained: {e}")
             return 0
@@ -190,18 +214,56 @@ class TrainingService:
         """
         Run incremental training using previous model as base
         """
+        from app.services.model_registry import model_registry
+
+        # Register the shipped model as the first version, so the first
+        # retrain can be rolled back to it
+        if not model_registry.list_versions() and os.path.isdir(self.model_path):
+            model_registry.import_model(self.model_path)
+
+        # Train into a fresh registry version; the served model is untouched
+        # until the new one is complete and published
+        base_model_path = model_registry.current_path() or self.model_path
+        version, staging_path = model_registry.create_staging()
+
         try:
             from app.services.incremental_trainer import IncrementalTrainer
 
             trainer = IncrementalTrainer(
-                base_model_path=self.model_path,
+                base_model_path=base_model_path,
                 dataset_path=dataset_path,
-                output_path=self.model_path  # Overwrite existing model
+                output_path=staging_path
             )
 
             result = trainer.train()
 
             if result["success"]:
+                # Keep the served ONNX graph in sync with the new weights
+                if os.getenv("INFERENCE_BACKEND", "torch").lower() == "onnx":
+                    from app.services.onnx_exporter import export_onnx, verify_parity
+                    onnx_path = export_onnx(staging_path)
+                    verify_parity(staging_path, onnx_path)
+
+                # Re-quantize and re-run the accuracy gate on the validation split
+                # (the int8 artifact is only served by the torch backend)
+                if (
+                    os.getenv("MODEL_VARIANT", "fp32").lower() == "int8"
+                    and os.getenv("INFERENCE_BACKEND", "torch").lower() != "onnx"
+                ):
+                    from app.services.model_quantizer import ModelQuantizer
+                    quantizer = ModelQuantizer(
+                        staging_path,
+                        max_f1_drop=float(os.getenv("QUANTIZATION_MAX_F1_DROP", "0.01"))
+                    )
+                    quantizer.run(dataset_path, split="validation")
+
+                # Trainer checkpoints are not needed for serving
+                shutil.rmtree(os.path.join(staging_path, "checkpoints"), ignore_errors=True)
+
+                # Atomically make the new version current, then hot swap it in
+                model_registry.publish(version)
+                self._swap_served_model(version)
+
                 # Mark all pending data as trained
                 pending_data = self.get_pending_training_data()
                 news_ids = [d["id"] for d in pending_data]
@@ -212,9 +274,11 @@ class TrainingService:
                     message=f"Model retrained successfully with {result['samples']} samples",
                     samples_used=result["samples"],
                     accuracy=result.get("accuracy"),
-                    f1_score=result.get("f1_score")
+                    f1_score=result.get("f1_score"),
+                    model_version=version
                 )
             else:
+                model_registry.discard_staging(version)
                 return RetrainResponse(
                     success=False,
                     message=f"Training failed: {result.get('error', 'Unknown error')}",
@@ -223,12 +287,24 @@ class TrainingService:
 
         except Exception as e:
             print(f"Error during incremental training: {e}")
+            model_registry.discard_staging(version)
             return RetrainResponse(
                 success=False,
                 message=f"Training error: {str(e)}",
                 samples_used=0
             )
 
+    def _swap_served_model(self, version: str):
+        """Hot swap model di process ini (process lain mengikuti lewat model watcher)"""
+        from app.services.hoax_detector import hoax_detector
+
+        if hoax_detector.model is None:
+            return  # Not loaded yet; the next load picks up the new CURRENT
+        try:
+            hoax_detector.reload_model(version)
+        except Exception as e:
+            print(f"Error hot-swapping to model {version}: {e}. Still serving {hoax_detector.model_version}.")
+
     def get_training_history(self, limit: int = 10) -> List[Dict]:
         """Get history of training runs"""
         try:
@@ -248,6 +324,7 @@ class TrainingService:
                     "samples_used": data.get("samples_used"),
                     "accuracy": data.get("accuracy"),
                     "f1_score": data.get("f1_score"),
+                    "model_version": data.get("model_version"),
                     "status": data.get("status")
                 })
 
@@ -264,6 +341,7 @@ class TrainingService:
                 "samples_used": result.samples_used,
                 "accuracy": result.accuracy,
                 "f1_score": result.f1_score,
+                "model_version": result.model_version,
                 "status": "success" if result.success else "failed",
                 "message": result.message
             })
@@ -0,0 +1,160 @@
+"""
+Counters - Sharded counter documents and server-side count aggregation
+
+Stats used to be computed by streaming whole collections (every article
+body included) and counting in Python, which gets slower as the archive
+grows. Instead, each counter is a document in the `counters` collection
+with COUNTER_SHARDS shard subdocuments:
+
+    counters/{name}/shards/{0..N-1}  {"count": n}
+
+- writers add Increment(delta) to one random shard, in the same atomic
+  batch as the document write that caused the change (see BulkWriter),
+  so a counter never drifts from the data it counts; spreading over shards
+  avoids the per-document write rate limit
+- readers fetch every shard of every requested counter in one multi-get,
+  so reading stats costs the same no matter how many documents exist
+
+A counter group that was never initialized (or needs repair) is seeded
+from server-side aggregation queries (count()/sum()), which count in the
+backend without transferring documents.
+"""
+
+import os
+import random
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from google.cloud.firestore import Increment
+
+from app.utils.firebase_config import get_db
+
+COUNTERS_COLLECTION = "counters"
+
+
+class ShardedCounters:
+    def __init__(self, db=None, num_shards: Optional[int] = None, collection: str = COUNTERS_COLLECTION):
+        """
+        Args:
+            db: Firestore client (default: get_db() saat pertama dipakai)
+            num_shards: Jumlah shard per counter
+        """
+        self._db = db
+        self.num_shards = max(1, num_shards or int(os.getenv("COUNTER_SHARDS", "10")))
+        self.collection = collection
+
+    @property
+    def db(self):
+        return self._db or get_db()
+
+    def _shard_ref(self, db, name: str, shard: int):
+        return db.collection(self.collection).document(name).collection("shards").document(str(shard))
+
+    def _meta_ref(self, db, group: str):
+        return db.collection(self.collection).document(f"_{group}")
+
+    def add_to_batch(self, batch, increments: Dict[str, int], db=None):
+        """Tambahkan increment counter ke WriteBatch (satu write per counter)"""
+        db = db or self.db
+        for name, delta in increments.items():
+            if delta:
+                ref = self._shard_ref(db, name, random.randrange(self.num_shards))
+                batch.set(ref, {"count": Increment(delta)}, merge=True)
+
+    def increment(self, increments: Dict[str, int]):
+        batch = self.db.batch()
+        self.add_to_batch(batch, increments)
+        batch.commit()
+
+    def read(self, group: str, names: List[str], recount: Callable[[], Dict[str, int]]) -> Dict[str, int]:
+        """
+        Nilai counter `names`, dengan satu multi-get untuk semua shard.
+
+        Args:
+            group: Nama grup counter (penanda inisialisasi)
+            recount: Menghitung nilai awal dari database jika grup belum pernah diinisialisasi
+        """
+        db = self.db
+        meta_ref = self._meta_ref(db, group)
+        refs = {meta_ref.path: None}
+        for name in names:
+            for shard in range(self.num_shards):
+                refs[self._shard_ref(db, name, shard).path] = name
+
+        totals = {name: 0 for name in names}
+        initialized = False
+        snapshots = db.get_all([db.document(path) for path in refs])
+        for snapshot in snapshots:
+            name = refs.get(snapshot.reference.path)
+            if not snapshot.exists:
+                continue
+            if name is None:
+                initialized = True
+            else:
+                totals[name] += snapshot.to_dict().get("count", 0)
+
+        if not initialized:
+            print(f"Counters '{group}' not initialized, counting from database")
+            return self.reset(group, recount())
+        return totals
+
+    def reset(self, group: str, values: Dict[str, int]) -> Dict[str, int]:
+        """
+        Set nilai absolut counter (shard 0 = nilai, shard lain = 0).
+
+        Increment yang masuk bersamaan dengan reset bisa hilang, jadi ini
+        untuk inisialisasi dan perbaikan saja.
+        """
+        db = self.db
+        batch = db.batch()
+        for name, value in values.items():
+            for shard in range(self.num_shards):
+                batch.set(self._shard_ref(db, name, shard), {"count": value if shard == 0 else 0})
+        batch.set(self._meta_ref(db, group), {"counters": sorted(values), "recounted_at": datetime.now().isoformat()})
+        batch.commit()
+        return dict(values)
+
+
+def count_query(query) -> int:
+    """Jumlah dokumen hasil query, dihitung di server jika didukung"""
+    try:
+        return int(query.count().get()[0][0].value)
+    except Exception as e:
+        # Older backends/emulators without aggregation: stream IDs only
+        print(f"Count aggregation unavailable ({e}), counting document IDs")
+        return sum(1 for _ in query.select([]).stream())
+
+
+def sum_query(query, field: str) -> int:
+    """Jumlah nilai `field` pada hasil query, dihitung di server jika didukung"""
+    try:
+        return int(query.sum(field).get()[0][0].value or 0)
+    except Exception as e:
+        print(f"Sum aggregation unavailable ({e}), summing {field} client-side")
+        return int(sum((doc.to_dict() or {}).get(field) or 0 for doc in query.select([field]).stream()))
+
+
+def counter_delta(
+    counter_values: Callable[[Dict], Dict[str, int]],
+    before: Optional[Dict],
+    after: Optional[Dict],
+) -> Dict[str, int]:
+    """Perubahan counter saat dokumen berubah dari `before` ke `after` (None = tidak ada)"""
+    delta: Dict[str, int] = {}
+    for name, value in (counter_values(after) if after is not None else {}).items():
+        delta[name] = delta.get(name, 0) + value
+    for name, value in (counter_values(before) if before is not None else {}).items():
+        delta[name] = delta.get(name, 0) - value
+    return {name: value for name, value in delta.items() if value}
+
+
+def merge_increments(increments: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    for item in increments:
+        for name, value in item.items():
+            totals[name] = totals.get(name, 0) + value
+    return {name: value for name, value in totals.items() if value}
+
+
+# Global instance
+sharded_counters = ShardedCounters()
@@ -0,0 +1,110 @@
+"""
+Bounded executors for blocking work called from async routes
+
+- inference_executor: CPU-bound model prediction
+- io_executor: blocking I/O (article fetching, Firestore calls)
+
+Each executor has a fixed number of workers plus a bounded queue. When both
+are full, new work is rejected with HTTP 503 instead of piling up, so
+lightweight routes (/health, /api/news) keep answering while inference is
+saturated.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException
+
+
+class ServerBusyError(HTTPException):
+    """Raised when an executor's workers and queue are all taken"""
+
+    def __init__(self, name: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy ({name} queue full), please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """
+        Args:
+            name: Nama executor (prefix nama thread)
+            max_workers: Jumlah worker thread
+            max_queue: Jumlah task yang boleh menunggu di antrian
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ServerBusyError(self.name)
+
+        with self._lock:
+            self.in_flight += 1
+
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Jalankan fn di executor dan await hasilnya tanpa memblokir event loop"""
+        future = self.submit(functools.partial(fn, *args, **kwargs))
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self.max_queue,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+            }
+
+
+# Inference workers mostly wait on the micro-batcher, so keep at least
+# BATCH_MAX_SIZE of them or batches can never fill up
+inference_executor = BoundedExecutor(
+    "inference",
+    max_workers=int(os.getenv("INFERENCE_WORKERS", os.getenv("BATCH_MAX_SIZE", "16"))),
+    max_queue=int(os.getenv("INFERENCE_QUEUE_DEPTH", "64")),
+)
+
+io_executor = BoundedExecutor(
+    "io",
+    max_workers=int(os.getenv("IO_WORKERS", "16")),
+    max_queue=int(os.getenv("IO_QUEUE_DEPTH", "256")),
+)
+
+
+async def run_inference(fn: Callable, *args, **kwargs) -> Any:
+    return await inference_executor.run(fn, *args, **kwargs)
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    return await io_executor.run(fn, *args, **kwargs)
@@ -0,0 +1,106 @@
+"""
+Pagination - Opaque cursors for listing endpoints
+
+List endpoints used to accept only `limit`, so going deeper meant asking
+for ever-larger pages. Instead every page is ordered by a timestamp field
+plus the document ID (a unique tie-breaker) and continues with
+start_after from the last document of the previous page:
+
+    query, page_size = page_query(query, "created_at", limit, cursor)
+    rows, next_cursor = split_page(stream(query), page_size, "created_at")
+
+The cursor is the (field, value, document ID) of that last document,
+base64-encoded; clients pass it back unchanged. Each page reads at most
+page_size + 1 documents (the extra one only tells whether there is a next
+page), however deep the client goes. next_cursor is None on the last page.
+
+Ordering by one field (plus __name__) without filters uses Firestore's
+automatic single-field indexes. Equality filters combined with the order
+field need a composite index; these are in firestore.indexes.json at the
+repository root (deploy with `firebase deploy --only firestore:indexes`):
+
+    news  labeled_by ==                         order by created_at  (admin /unlabeled)
+    news  labeled_by ==                         order by labeled_at  (admin /labeled)
+    news  labeled_by ==, trained ==             order by labeled_at  (admin /labeled?trained=)
+    news  can_use_for_training ==, trained ==   order by labeled_at  (admin /pending-training)
+
+A new listing with filters needs its index added there as well.
+"""
+
+import base64
+import binascii
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+PAGE_MAX_SIZE = int(os.getenv("PAGE_MAX_SIZE", "100"))
+
+
+class InvalidCursorError(ValueError):
+    """Cursor rusak atau berasal dari listing lain"""
+
+
+def encode_cursor(order_field: str, value, doc_id: str) -> str:
+    raw = json.dumps([order_field, value, doc_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_field: str) -> Tuple[object, str]:
+    """
+    Returns:
+        (nilai order_field, ID dokumen) dari dokumen terakhir halaman sebelumnya
+
+    Raises:
+        InvalidCursorError: Jika cursor tidak valid untuk listing ini
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        field, value, doc_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+
+    if field != order_field or not isinstance(doc_id, str):
+        raise InvalidCursorError("Cursor does not belong to this listing")
+    return value, doc_id
+
+
+def page_query(
+    query,
+    order_field: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    direction: str = "DESCENDING",
+):
+    """
+    Urutkan query berdasarkan order_field lalu ID dokumen, dan mulai setelah cursor.
+
+    Returns:
+        (query, page_size); query membaca page_size + 1 dokumen
+
+    Raises:
+        InvalidCursorError: Jika cursor tidak valid untuk listing ini
+    """
+    page_size = max(1, min(limit, PAGE_MAX_SIZE))
+    query = query.order_by(order_field, direction=direction).order_by("__name__", direction=direction)
+
+    if cursor:
+        value, doc_id = decode_cursor(cursor, order_field)
+        query = query.start_after({order_field: value, "__name__": doc_id})
+
+    return query.limit(page_size + 1), page_size
+
+
+def split_page(rows: List[Dict], page_size: int, order_field: str) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Args:
+        rows: Hasil query dari page_query (dict dengan "id" dan order_field)
+
+    Returns:
+        (baris halaman ini, cursor halaman berikutnya atau None)
+    """
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(order_field, last.get(order_field), last["id"])
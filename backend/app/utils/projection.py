@@ -0,0 +1,69 @@
+"""
+Projection - Read only the fields a list endpoint returns
+
+List endpoints used to stream complete documents (including `content`,
+up to 5000 chars per article) and then cut the text down to a preview in
+Python. Instead, a summary model names the fields an endpoint returns and
+the query selects exactly those, so Firestore only sends them:
+
+    rows = stream_projected(query, summary_fields(NewsSummary))
+
+The preview text itself is stored at write time (`preview` field).
+Documents written before that have no preview; ensure_previews reads
+`content` for just those documents, once, and stores their preview so
+later listings stay projected.
+"""
+
+from typing import Dict, Iterable, List, Type
+
+from pydantic import BaseModel
+
+from app.utils.bulk_writer import BulkWriter
+
+
+def summary_fields(model: Type[BaseModel], exclude: Iterable[str] = ("id",)) -> List[str]:
+    """Nama field dokumen yang dibutuhkan model ringkasan (id bukan field dokumen)"""
+    return [name for name in model.model_fields if name not in exclude]
+
+
+def stream_projected(query, fields: List[str]) -> List[Dict]:
+    """Hasil query dengan hanya `fields` (plus "id")"""
+    rows = []
+    for doc in query.select(fields).stream():
+        data = doc.to_dict() or {}
+        data["id"] = doc.id
+        rows.append(data)
+    return rows
+
+
+def ensure_previews(
+    db,
+    collection: str,
+    rows: List[Dict],
+    chars: int,
+    source: str = "content",
+    target: str = "preview",
+) -> List[Dict]:
+    """
+    Lengkapi `target` untuk dokumen lama yang belum punya preview.
+
+    Field `source` hanya dibaca untuk dokumen tersebut (satu multi-get),
+    lalu preview-nya disimpan agar tidak perlu dibaca lagi.
+    """
+    missing = {row["id"]: row for row in rows if row.get(target) is None}
+    if not missing:
+        return rows
+
+    refs = [db.collection(collection).document(doc_id) for doc_id in missing]
+    writer = BulkWriter(db)
+    for doc in db.get_all(refs, field_paths=[source]):
+        if not doc.exists:
+            continue
+        preview = ((doc.to_dict() or {}).get(source) or "")[:chars]
+        missing[doc.id][target] = preview
+        writer.update(collection, doc.id, {target: preview})
+
+    result = writer.commit()
+    if result.succeeded:
+        print(f"Stored previews for {len(result.succeeded)} {collection} documents")
+    return rows
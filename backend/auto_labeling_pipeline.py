@@ -11,13 +11,13 @@ Ini adalah "weak supervision" approach - rule-based mengajari ML model
 """
 
 import feedparser
-import requests
-from bs4 import BeautifulSoup
 import csv
 import time
 from datetime import datetime
 import os
 from app.services.rule_based_detector import rule_based_detector
+from app.services.article_extractor import article_extractor
+from app.services.rss_fetcher import rss_fetcher
 from tqdm import tqdm
 
 
@@ -50,39 +50,10 @@ class AutoLabelingPipeline:
     def extract_content(self, url: str) -> str:
         """Extract content dari URL"""
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "lxml")
-
-            # Remove unwanted elements
-            for tag in soup(["script", "style", "nav", "footer", "header", "aside", "iframe"]):
-                tag.decompose()
-
-            # Find article content
-            content_selectors = [
-                "article", ".article-content", ".post-content",
-                ".entry-content", ".content", "main", ".detail-text"
-            ]
-
-            article_content = ""
-            for selector in content_selectors:
-                content_div = soup.select_one(selector)
-                if content_div:
-                    paragraphs = content_div.find_all("p")
-                    article_content = " ".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
-                    if article_content and len(article_content) > 100:
-                        break
+            # Cached pages are reused across runs (see app/services/page_cache.py)
+            html = rss_fetcher.fetch_html(url, timeout=15)
 
-            # Fallback: get all paragraphs
-            if not article_content or len(article_content) < 100:
-                paragraphs = soup.find_all("p")
-                article_content = " ".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
-
-            return article_content[:3000]  # Limit to 3000 characters
+            return article_extractor.extract(html, url, max_chars=3000, min_length=100)
 
         except Exception as e:
             return ""
@@ -93,7 +64,7 @@ class AutoLabelingPipeline:
             print(f"\n📰 Fetching: {source_name}")
             feed = feedparser.parse(feed_url)
 
-            collected = []
+            candidates = []
             for entry in feed.entries[:max_articles]:
                 title = entry.get("title", "")
                 link = entry.get("link", "")
@@ -108,24 +79,29 @@ class AutoLabelingPipeline:
 
                 if content and len(content) > 50:
                     # Combine title and content
-                    full_text = f"{title}. {content}"
-
-                    # Auto-label using rule-based detector
-                    prediction = rule_based_detector.predict(full_text, source=link)
-
-                    # Only include if confidence is above threshold
-                    if prediction.confidence >= self.confidence_threshold:
-                        collected.append({
-                            "text": full_text,
-                            "label": 1 if prediction.label == "hoax" else 0,
-                            "confidence": prediction.confidence,
-                            "source": source_name,
-                            "url": link,
-                            "collected_at": datetime.now().isoformat()
-                        })
+                    candidates.append({"text": f"{title}. {content}", "url": link})
 
                 time.sleep(0.5)  # Rate limiting
 
+            # Auto-label all candidates of this feed in one batch
+            predictions = rule_based_detector.predict_batch(
+                [c["text"] for c in candidates],
+                sources=[c["url"] for c in candidates]
+            )
+
+            collected = []
+            for candidate, prediction in zip(candidates, predictions):
+                # Only include if confidence is above threshold
+                if prediction.confidence >= self.confidence_threshold:
+                    collected.append({
+                        "text": candidate["text"],
+                        "label": 1 if prediction.label == "hoax" else 0,
+                        "confidence": prediction.confidence,
+                        "source": source_name,
+                        "url": candidate["url"],
+                        "collected_at": datetime.now().isoformat()
+                    })
+
             print(f"   ✅ Collected: {len(collected)} articles (confidence >= {self.confidence_threshold})")
             return collected
 
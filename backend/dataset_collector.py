@@ -9,12 +9,12 @@ Output: CSV file untuk training
 """
 
 import feedparser
-import requests
-from bs4 import BeautifulSoup
 import csv
 import time
 from datetime import datetime
 import os
+from app.services.article_extractor import article_extractor
+from app.services.rss_fetcher import rss_fetcher
 
 
 class DatasetCollector:
@@ -39,35 +39,10 @@ class DatasetCollector:
         """Extract content dari URL"""
         try:
             print(f"Fetching: {url}")
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "lxml")
-
-            # Remove unwanted elements
-            for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                tag.decompose()
-
-            # Find article content
-            content_selectors = ["article", ".article-content", ".post-content", "main"]
-            article_content = ""
-
-            for selector in content_selectors:
-                content_div = soup.select_one(selector)
-                if content_div:
-                    paragraphs = content_div.find_all("p")
-                    article_content = " ".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
-                    if article_content:
-                        break
-
-            if not article_content:
-                paragraphs = soup.find_all("p")
-                article_content = " ".join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+            # Cached pages are reused across runs (see app/services/page_cache.py)
+            html = rss_fetcher.fetch_html(url, timeout=15)
 
-            return article_content[:2000]  # Limit to 2000 characters
+            return article_extractor.extract(html, url, max_chars=2000)
 
         except Exception as e:
             print(f"Error extracting {url}: {e}")
@@ -30,12 +30,13 @@ def main():
         initialize_firebase()
 
         # Fetch and process RSS
-        print("Fetching RSS feed...")
+        print("Fetching RSS feeds...")
         result = news_service.fetch_and_process_rss()
 
         print("\n=== Results ===")
         print(f"Status: {result['status']}")
         print(f"Message: {result['message']}")
+        print(f"Feeds: {result.get('feeds', 0)}")
         print(f"Total articles found: {result.get('total', 0)}")
         print(f"Processed: {result.get('processed', 0)}")
         print(f"Skipped (already exists): {result.get('skipped', 0)}")
@@ -0,0 +1,38 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+WORDS = [
+    "pemerintah", "mengumumkan", "kebijakan", "baru", "subsidi", "energi", "presiden",
+    "meresmikan", "jalan", "tol", "wajib", "share", "minum", "air", "hangat", "lemon",
+    "terbukti", "ampuh", "penyakit", "vaksin", "chip", "pelacak", "fakta", "media",
+]
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """Tiny random BERT classifier saved like a fine-tuned checkpoint"""
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    model_dir = tmp_path_factory.mktemp("tiny_model")
+    vocab_path = model_dir / "vocab.txt"
+    vocab_path.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS, "!", ".", ","]) + "\n")
+    tokenizer = BertTokenizerFast(vocab_file=str(vocab_path))
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=512,
+        num_labels=2,
+    )
+    model = BertForSequenceClassification(config)
+    model.eval()
+
+    model.save_pretrained(model_dir)
+    tokenizer.save_pretrained(model_dir)
+    return str(model_dir)
@@ -0,0 +1,22 @@
+import pytest
+
+from app.services.domain_index import DomainIndex, registrable_domain
+
+
+@pytest.mark.parametrize("host, expected", [
+    ("news.kompas.com", "kompas.com"),
+    ("a.detik.co.id", "detik.co.id"),
+    ("blogberita.blogspot.com", "blogberita.blogspot.com"),
+    ("www.situs.wordpress.com", "situs.wordpress.com"),
+])
+def test_registrable_domain(host, expected):
+    assert registrable_domain(host) == expected
+
+
+def test_blog_host_entry_is_default_for_its_blogs():
+    index = DomainIndex({"blogspot.com": 0.2, "cekfakta.blogspot.com": 0.9, "kompas.com": 1.0})
+
+    assert index.reputation("https://hoaks.blogspot.com/2024/01/a.html") == 0.2
+    assert index.reputation("cekfakta.blogspot.com") == 0.9
+    assert index.reputation("news.kompas.com") == 1.0
+    assert index.reputation("kompas.com.evil.net") is None
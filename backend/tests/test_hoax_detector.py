@@ -0,0 +1,38 @@
+import shutil
+
+from app.services.hoax_detector import HoaxDetector
+from app.services.model_quantizer import ModelQuantizer
+
+
+def _detector(monkeypatch, variant, backend="torch"):
+    monkeypatch.setenv("MODEL_VARIANT", variant)
+    monkeypatch.setenv("INFERENCE_BACKEND", backend)
+    monkeypatch.setenv("USE_ML_MODEL", "true")
+    return HoaxDetector()
+
+
+def test_int8_fallback_reports_fp32(tiny_model_dir, monkeypatch):
+    # No quantized artifact next to the model: int8 falls back to fp32
+    detector = _detector(monkeypatch, "int8")
+    detector._bundle = detector._load_bundle(tiny_model_dir, "v1")
+
+    assert detector.loaded_variant == "fp32"
+    assert "/fp32/" in detector.get_model_version()
+
+
+def test_int8_loaded_reports_int8(tiny_model_dir, tmp_path, monkeypatch):
+    from app.services.model_quantizer import default_quantized_path
+
+    # Own copy, the quantized artifact is written next to the model
+    model_dir = str(tmp_path / "model")
+    shutil.copytree(tiny_model_dir, model_dir)
+    monkeypatch.setattr(ModelQuantizer, "_evaluate", lambda self, model, tokenizer, df: (0.9, 0.9, 1.0))
+    csv_path = tmp_path / "eval.csv"
+    csv_path.write_text("text,label\npemerintah mengumumkan kebijakan baru,0\nvaksin chip pelacak,1\n")
+    ModelQuantizer(model_dir, default_quantized_path(model_dir)).run(str(csv_path), split="full")
+
+    detector = _detector(monkeypatch, "int8")
+    detector._bundle = detector._load_bundle(model_dir, "v1")
+
+    assert detector.loaded_variant == "int8"
+    assert "/int8/" in detector.get_model_version()
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from app.services.model_quantizer import (
+    ModelQuantizer,
+    load_quantized_model,
+    read_quantization_metadata,
+)
+
+
+@pytest.fixture
+def eval_csv(tmp_path):
+    path = tmp_path / "eval.csv"
+    pd.DataFrame({
+        "text": [
+            "pemerintah mengumumkan kebijakan baru",
+            "presiden meresmikan jalan tol baru",
+            "wajib share! minum air hangat lemon terbukti ampuh",
+            "vaksin chip pelacak fakta media",
+        ],
+        "label": [0, 0, 1, 1],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def _with_f1(monkeypatch, f1_fp32, f1_int8):
+    """Evaluate fp32 then int8 with fixed F1 scores, to drive the gate"""
+    scores = iter([(f1_fp32, 0.9, 1.0), (f1_int8, 0.9, 0.5)])
+    monkeypatch.setattr(ModelQuantizer, "_evaluate", lambda self, model, tokenizer, df: next(scores))
+
+
+def test_gate_accepts_small_f1_drop(tiny_model_dir, eval_csv, tmp_path, monkeypatch):
+    _with_f1(monkeypatch, 0.90, 0.895)
+    output = str(tmp_path / "int8")
+
+    metadata = ModelQuantizer(tiny_model_dir, output, max_f1_drop=0.01).run(eval_csv, split="full")
+
+    assert metadata["servable"] is True
+    assert metadata["f1_drop"] == pytest.approx(0.005)
+    assert read_quantization_metadata(output)["servable"] is True
+    assert load_quantized_model(output) is not None
+
+
+def test_gate_rejects_large_f1_drop(tiny_model_dir, eval_csv, tmp_path, monkeypatch):
+    _with_f1(monkeypatch, 0.90, 0.85)
+    output = str(tmp_path / "int8")
+
+    metadata = ModelQuantizer(tiny_model_dir, output, max_f1_drop=0.01).run(eval_csv, split="full")
+
+    assert metadata["servable"] is False
+    assert read_quantization_metadata(output)["servable"] is False
+    with pytest.raises(ValueError, match="did not pass the accuracy gate"):
+        load_quantized_model(output)
+    # The artifact is still kept for inspection
+    assert load_quantized_model(output, require_servable=False) is not None
+
+
+def test_quantized_model_evaluates_on_real_data(tiny_model_dir, eval_csv, tmp_path):
+    metadata = ModelQuantizer(tiny_model_dir, str(tmp_path / "int8"), max_f1_drop=1.0).run(eval_csv, split="full")
+
+    assert metadata["eval_samples"] == 4
+    assert 0.0 <= metadata["f1_int8"] <= 1.0
+    assert metadata["servable"] is True
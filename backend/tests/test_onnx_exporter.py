@@ -0,0 +1,32 @@
+import shutil
+
+import pytest
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from app.services.onnx_exporter import export_onnx, verify_parity
+
+
+def test_exported_model_matches_pytorch(tiny_model_dir, tmp_path):
+    onnx_path = export_onnx(tiny_model_dir, str(tmp_path / "model.onnx"))
+
+    assert verify_parity(tiny_model_dir, onnx_path) <= 1e-3
+
+
+def test_parity_check_rejects_stale_export(tiny_model_dir, tmp_path):
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    onnx_path = export_onnx(tiny_model_dir, str(tmp_path / "model.onnx"))
+
+    # New weights without a new export, as after a retrain that skipped export
+    retrained_dir = tmp_path / "retrained"
+    shutil.copytree(tiny_model_dir, retrained_dir)
+    model = AutoModelForSequenceClassification.from_pretrained(retrained_dir)
+    with torch.no_grad():
+        model.classifier.bias.add_(1.0)
+    model.save_pretrained(retrained_dir)
+
+    with pytest.raises(ValueError, match="ONNX logits differ"):
+        verify_parity(str(retrained_dir), onnx_path)
@@ -0,0 +1,71 @@
+import re
+
+import pandas as pd
+import pytest
+
+from app.services.rule_based_detector import RuleBasedHoaxDetector
+
+TEXTS = [
+    "",
+    "Pemerintah mengumumkan kebijakan subsidi energi baru untuk tahun depan.",
+    "WAJIB SHARE!!! Minum air hangat lemon terbukti ampuh sembuhkan penyakit!!!!",
+    "Segera sebarkan sebelum dihapus, media tidak akan memberitakan ini!",
+    "Vaksin mengandung chip pelacak, kata sumber terpercaya. Fakta yang disembunyikan",
+    "BERITA HEBOH: Presiden meresmikan jalan tol, tanpa efek samping!!!!",
+    "Harus dibagikan ke semua grup WA!! 100% terbukti",
+    "Kelvin K, dotted İstanbul, long ſ and dotless ı: WAJIB share",
+    "Teks astral \U0001F600 dengan NUL \x00 di tengah, hoaks atau bukan?",
+    "ÉNORME ÀÇÛ!!!! ß straße",
+    "WAJIB SHARE!!!! SEBARKAN SEBELUM DIHAPUS!!!! MEDIA TIDAK AKAN MEMBERITAKAN, "
+    "TERBUKTI AMPUH, RAHASIA YANG DISEMBUNYIKAN, VIRAL!!!!",
+]
+
+
+def _baseline_scores(detector, text):
+    """analyze_text sebelum RuleMatcher: satu `in` per keyword, satu re.search per pattern"""
+    rules = detector.rules
+    text_lower = text.lower()
+    scores = {
+        "keyword_score": 0.0,
+        "pattern_score": 0.0,
+        "source_score": 0.0,
+        "caps_score": 0.0,
+        "punctuation_score": 0.0
+    }
+
+    keyword_matches = sum(1 for keyword in rules.hoax_keywords if keyword in text_lower)
+    scores["keyword_score"] = min(keyword_matches * 0.1, 1.0)
+
+    pattern_matches = sum(1 for pattern in rules.hoax_patterns if re.search(pattern, text, re.IGNORECASE))
+    scores["pattern_score"] = min(pattern_matches * 0.15, 1.0)
+
+    if len(text) > 0:
+        caps_ratio = sum(1 for c in text if c.isupper()) / len(text)
+        if caps_ratio > 0.3:
+            scores["caps_score"] = min(caps_ratio, 1.0)
+
+    exclamation_count = text.count('!')
+    if exclamation_count > 3:
+        scores["punctuation_score"] = min(exclamation_count * 0.1, 1.0)
+
+    return scores
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return RuleBasedHoaxDetector()
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_analyze_text_matches_baseline(detector, text):
+    assert detector.analyze_text(text) == _baseline_scores(detector, text)
+
+
+def test_score_frame_matches_predict(detector):
+    frame = detector.score_frame(pd.DataFrame({"text": TEXTS}))
+
+    assert set(frame["label"]) == {"hoax", "non-hoax"}
+    for text, (_, row) in zip(TEXTS, frame.iterrows()):
+        prediction = detector.predict(text)
+        assert row["label"] == prediction.label
+        assert row["confidence"] == prediction.confidence
@@ -7,6 +7,8 @@ function App() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [fetching, setFetching] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const loadNews = async () => {
     try {
@@ -14,6 +16,7 @@ function App() {
       setError(null);
       const data = await newsAPI.getAllNews();
       setNews(data.news || []);
+      setNextCursor(data.next_cursor || null);
     } catch (err) {
       setError('Gagal memuat berita. Pastikan server backend berjalan.');
       console.error('Error loading news:', err);
@@ -22,6 +25,21 @@ function App() {
     }
   };
 
+  const loadMoreNews = async () => {
+    try {
+      setLoadingMore(true);
+      setError(null);
+      const data = await newsAPI.getAllNews(50, nextCursor);
+      setNews((current) => [...current, ...(data.news || [])]);
+      setNextCursor(data.next_cursor || null);
+    } catch (err) {
+      setError('Gagal memuat berita berikutnya.');
+      console.error('Error loading more news:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchNewNews = async () => {
     try {
       setFetching(true);
@@ -58,6 +76,16 @@ function App() {
         </button>
 
         <NewsList news={news} loading={loading} error={error} />
+
+        {!loading && nextCursor && (
+          <button
+            className="refresh-button"
+            onClick={loadMoreNews}
+            disabled={loadingMore}
+          >
+            {loadingMore ? 'Memuat...' : 'Muat Berita Lainnya'}
+          </button>
+        )}
       </div>
     </div>
   );
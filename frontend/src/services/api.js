@@ -10,8 +10,11 @@ const api = axios.create({
 });
 
 export const newsAPI = {
-  getAllNews: async (limit = 50) => {
-    const response = await api.get(`/news/?limit=${limit}`);
+  // Returns { total, news, next_cursor }; pass next_cursor to get the next page
+  getAllNews: async (limit = 50, cursor = null) => {
+    const params = { limit };
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/news/', { params });
     return response.data;
   },
 